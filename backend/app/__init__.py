@@ -5,7 +5,7 @@ from flask_migrate import Migrate
 from flask_jwt_extended import JWTManager
 from flask_cors import CORS
 from config import config
-from app.database import db
+from app.database import configure_engine, db, engine_options
 from app.routes.shifts import shifts_bp
 from dotenv import load_dotenv
 
@@ -39,15 +39,28 @@ def create_app(config_name=None):
             r"/*": {
                 "origins": ["http://localhost:5173"],
                 "methods": ["GET", "POST", "PUT", "DELETE", "OPTIONS"],
-                "allow_headers": ["Content-Type", "Authorization"],
+                "allow_headers": [
+                    "Content-Type",
+                    "Authorization",
+                    "X-Read-Primary-Until",
+                ],
                 "supports_credentials": True,
-                "expose_headers": ["Content-Range", "X-Content-Range"],
+                "expose_headers": [
+                    "Content-Range",
+                    "X-Content-Range",
+                    "X-Read-Primary-Until",
+                ],
             }
         },
     )
 
+    # Pool and connection settings from the DB_* config
+    app.config.setdefault("SQLALCHEMY_ENGINE_OPTIONS", engine_options(app.config))
+
     # Initialize extensions
     db.init_app(app)
+    with app.app_context():
+        configure_engine(db.engine, app.config)
     migrate.init_app(app, db)
     jwt.init_app(app)
 
@@ -56,18 +69,79 @@ def create_app(config_name=None):
     app.config["JWT_HEADER_TYPE"] = "Bearer"
     app.config["JWT_TOKEN_LOCATION"] = ["headers"]
 
+    # Send read-only requests to replicas when any are configured
+    if app.config.get("DB_REPLICA_URIS"):
+        from app.replicas import init_replicas
+
+        init_replicas(app)
+
+    # Cache shift listings per range, invalidated by roster writes
+    from app.services.shift_cache import init_shift_cache
+
+    init_shift_cache(app)
+
+    # Recompute per-day coverage in the transactions that change the roster
+    from app.services.coverage import init_coverage
+
+    init_coverage(app)
+
+    # Hash passwords on a process pool, off the request threads
+    from app.services.passwords import init_password_hasher
+
+    init_password_hasher(app)
+
+    # Cache the users behind JWTs, invalidated when they change
+    from app.services.user_cache import init_user_cache
+
+    init_user_cache(app)
+
+    # Keep each user's rendered calendar feed until their shifts change
+    from app.services.calendar_feed import init_calendar_cache
+
+    init_calendar_cache(app)
+
+    # Publish roster changes to Server-Sent Events subscribers
+    from app.services.roster_events import init_roster_events
+
+    init_roster_events(app)
+
+    # Request counters, latency histograms and pool gauges at /metrics
+    if app.config.get("METRICS_ENABLED"):
+        from app.metrics import init_metrics
+
+        init_metrics(app)
+
+    # Time requests and their SQL when enabled
+    if app.config.get("INSTRUMENTATION_ENABLED"):
+        from app.instrumentation import init_instrumentation
+
+        init_instrumentation(app)
+
     # Register blueprints
     from app.routes.auth import auth_bp
     from app.routes.users import users_bp
+    from app.routes.availability import availability_bp
+    from app.routes.templates import templates_bp
+    from app.routes.calendar import calendar_bp
 
     app.register_blueprint(auth_bp, url_prefix="/api/auth")
     app.register_blueprint(users_bp, url_prefix="/api/users")
     app.register_blueprint(shifts_bp, url_prefix="/api/shifts")  # Add this line
+    app.register_blueprint(availability_bp, url_prefix="/api/availability")
+    app.register_blueprint(templates_bp, url_prefix="/api/templates")
+    app.register_blueprint(calendar_bp, url_prefix="/api/calendar")
 
     # Register CLI commands
-    from commands import create_tables, seed_db
+    from commands import (
+        create_tables,
+        export_payroll_command,
+        rebuild_coverage_command,
+        seed_db,
+    )
 
     app.cli.add_command(create_tables)
     app.cli.add_command(seed_db)
+    app.cli.add_command(export_payroll_command)
+    app.cli.add_command(rebuild_coverage_command)
 
     return app
@@ -1,3 +1,67 @@
+from flask import g, has_request_context
 from flask_sqlalchemy import SQLAlchemy
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event
 
-db = SQLAlchemy()
+
+class RoutingSession(Session):
+    """Sends reads to the replica chosen for the request, if any.
+
+    ``app.replicas`` picks the replica (or none) per request; flushes and
+    DML statements always go to the primary.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if (
+            bind is None
+            and not self._flushing
+            and not getattr(clause, "is_dml", False)
+            and has_request_context()
+        ):
+            replica = g.get("db_replica")
+            if replica is not None:
+                return replica
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+db = SQLAlchemy(session_options={"class_": RoutingSession})
+
+
+def engine_options(config):
+    """SQLAlchemy engine options from the ``DB_*`` settings in ``config``."""
+    connect_args = {}
+    if config.get("DB_APPLICATION_NAME"):
+        connect_args["application_name"] = config["DB_APPLICATION_NAME"]
+    # PgBouncer rejects the "options" startup parameter, so in that mode the
+    # timeout is set per transaction instead (see configure_engine)
+    timeout = config.get("DB_STATEMENT_TIMEOUT_MS")
+    if timeout and not config.get("PGBOUNCER_MODE"):
+        connect_args["options"] = f"-c statement_timeout={int(timeout)}"
+
+    return {
+        "pool_size": config.get("DB_POOL_SIZE", 5),
+        "max_overflow": config.get("DB_MAX_OVERFLOW", 10),
+        "pool_timeout": config.get("DB_POOL_TIMEOUT", 30),
+        "pool_recycle": config.get("DB_POOL_RECYCLE", -1),
+        "pool_pre_ping": config.get("DB_POOL_PRE_PING", False),
+        "connect_args": connect_args,
+    }
+
+
+def configure_engine(engine, config):
+    """Engine hooks for settings that can't be passed when connecting.
+
+    Behind PgBouncer in transaction pooling mode, consecutive transactions
+    may run on different server connections, so session state can't be
+    relied on; the statement timeout is set with ``SET LOCAL`` at the start
+    of every transaction instead. psycopg2 never uses server-side prepared
+    statements, so nothing else has to change for transaction pooling.
+    """
+    timeout = config.get("DB_STATEMENT_TIMEOUT_MS")
+    if not (config.get("PGBOUNCER_MODE") and timeout):
+        return
+
+    @event.listens_for(engine, "begin")
+    def set_statement_timeout(conn):
+        if conn.get_execution_options().get("isolation_level") != "AUTOCOMMIT":
+            conn.exec_driver_sql(f"SET LOCAL statement_timeout = {int(timeout)}")
@@ -0,0 +1,232 @@
+# backend/app/instrumentation.py
+import cProfile
+import heapq
+import io
+import itertools
+import pstats
+import threading
+import time
+from collections import defaultdict, deque
+from flask import Blueprint, current_app, g, has_request_context, jsonify, request
+from flask_jwt_extended import get_jwt, jwt_required
+from sqlalchemy import event
+
+instrumentation_bp = Blueprint("instrumentation", __name__)
+
+
+class RequestStats:
+    """Wall time and SQL statements of the request being served."""
+
+    def __init__(self, top_statements):
+        self.started = time.perf_counter()
+        self.statements = 0
+        self.sql_time = 0.0
+        self.top_statements = top_statements
+        self._slowest = []
+
+    def add_statement(self, statement, elapsed):
+        self.statements += 1
+        self.sql_time += elapsed
+        entry = (elapsed, self.statements, statement)
+        if len(self._slowest) < self.top_statements:
+            heapq.heappush(self._slowest, entry)
+        else:
+            heapq.heappushpop(self._slowest, entry)
+
+    def slowest(self):
+        """The slowest statements as ``(ms, sql)``, slowest first."""
+        return [
+            (round(elapsed * 1000, 2), statement)
+            for elapsed, _, statement in sorted(self._slowest, reverse=True)
+        ]
+
+
+class EndpointTimings:
+    """Per-endpoint totals, plus a window of recent durations for percentiles."""
+
+    def __init__(self, window=1000, profiles=20):
+        self._lock = threading.Lock()
+        self._window = window
+        self._endpoints = defaultdict(self._new_entry)
+        self.profiles = deque(maxlen=profiles)
+
+    def _new_entry(self):
+        return {
+            "count": 0,
+            "wall": 0.0,
+            "max": 0.0,
+            "statements": 0,
+            "sql": 0.0,
+            "recent": deque(maxlen=self._window),
+        }
+
+    def record(self, key, wall, stats):
+        with self._lock:
+            entry = self._endpoints[key]
+            entry["count"] += 1
+            entry["wall"] += wall
+            entry["max"] = max(entry["max"], wall)
+            entry["statements"] += stats.statements
+            entry["sql"] += stats.sql_time
+            entry["recent"].append(wall)
+
+    def snapshot(self):
+        with self._lock:
+            items = [(key, dict(entry)) for key, entry in self._endpoints.items()]
+            items = [(key, entry, sorted(entry["recent"])) for key, entry in items]
+
+        def ms(seconds):
+            return round(seconds * 1000, 2)
+
+        return [
+            {
+                "method": method,
+                "endpoint": rule,
+                "count": entry["count"],
+                "avg_ms": ms(entry["wall"] / entry["count"]),
+                "p95_ms": ms(recent[min(len(recent) - 1, int(len(recent) * 0.95))]),
+                "max_ms": ms(entry["max"]),
+                "avg_sql_statements": round(entry["statements"] / entry["count"], 1),
+                "avg_sql_ms": ms(entry["sql"] / entry["count"]),
+            }
+            for (method, rule), entry, recent in sorted(items)
+        ]
+
+    def reset(self):
+        with self._lock:
+            self._endpoints.clear()
+            self.profiles.clear()
+
+
+def _endpoint_key():
+    rule = request.url_rule.rule if request.url_rule else "<unmatched>"
+    return request.method, rule
+
+
+def init_instrumentation(app):
+    """Time every request and its SQL; see the INSTRUMENTATION_* settings."""
+    from app.database import db
+
+    timings = EndpointTimings()
+    app.extensions["instrumentation"] = timings
+    slow_ms = app.config.get("SLOW_REQUEST_MS", 500)
+    sample_rate = app.config.get("PROFILE_SAMPLE_RATE", 0)
+    server_timing = app.config.get("SERVER_TIMING_HEADER", False)
+    top_statements = app.config.get("INSTRUMENTATION_TOP_STATEMENTS", 3)
+    request_counter = itertools.count(1)
+
+    def start_statement(conn, cursor, statement, parameters, context, executemany):
+        if context is not None:
+            context._instrumentation_started = time.perf_counter()
+
+    def end_statement(conn, cursor, statement, parameters, context, executemany):
+        started = getattr(context, "_instrumentation_started", None)
+        if started is None or not has_request_context():
+            return
+        stats = g.get("request_stats")
+        if stats is not None:
+            stats.add_statement(statement, time.perf_counter() - started)
+
+    # Every bind, and the replicas reads are routed to, so no query is missed
+    with app.app_context():
+        engines = list(db.engines.values())
+    replicas = app.extensions.get("db_replicas")
+    if replicas is not None:
+        engines += replicas.engines
+    for engine in {id(engine): engine for engine in engines}.values():
+        event.listen(engine, "before_cursor_execute", start_statement)
+        event.listen(engine, "after_cursor_execute", end_statement)
+
+    @app.before_request
+    def start_request():
+        g.request_stats = RequestStats(top_statements)
+        if sample_rate and next(request_counter) % sample_rate == 0:
+            profiler = cProfile.Profile()
+            try:
+                profiler.enable()
+            except ValueError:
+                return  # another profiler is already running in this thread
+            g.profiler = profiler
+
+    @app.after_request
+    def finish_request(response):
+        stats = g.pop("request_stats", None)
+        if stats is None:
+            return response
+        wall = time.perf_counter() - stats.started
+        key = _endpoint_key()
+        timings.record(key, wall, stats)
+
+        if "profiler" in g:
+            g.profiled_wall = wall
+
+        if wall * 1000 >= slow_ms:
+            app.logger.warning(
+                "Slow request %s %s: %.1f ms, %d SQL statements in %.1f ms; "
+                "slowest: %s",
+                request.method,
+                request.full_path.rstrip("?"),
+                wall * 1000,
+                stats.statements,
+                stats.sql_time * 1000,
+                stats.slowest(),
+            )
+
+        if server_timing:
+            response.headers["Server-Timing"] = (
+                f"app;dur={wall * 1000:.1f}, "
+                f'db;dur={stats.sql_time * 1000:.1f};desc="{stats.statements} queries"'
+            )
+        return response
+
+    @app.teardown_request
+    def finish_profile(exc):
+        # Teardown runs even when a later hook raises, so the profiler is
+        # always switched off before the thread serves another request
+        profiler = g.pop("profiler", None)
+        if profiler is None:
+            return
+        profiler.disable()
+        wall = g.pop("profiled_wall", None)
+        if wall is None:
+            return  # the request failed before it was timed
+
+        output = io.StringIO()
+        report = pstats.Stats(profiler, stream=output)
+        report.sort_stats("cumulative").print_stats(25)
+        method, endpoint = _endpoint_key()
+        timings.profiles.append(
+            {
+                "method": method,
+                "endpoint": endpoint,
+                "path": request.full_path.rstrip("?"),
+                "wall_ms": round(wall * 1000, 2),
+                "profile": output.getvalue(),
+            }
+        )
+
+    app.register_blueprint(instrumentation_bp, url_prefix="/api/instrumentation")
+    return timings
+
+
+@instrumentation_bp.route("", methods=["GET"])
+@jwt_required()
+def get_timings():
+    """Aggregated timings per endpoint and the latest sampled profiles."""
+    if get_jwt().get("role") not in ["admin", "manager"]:
+        return jsonify({"message": "Only managers can view timings"}), 403
+
+    timings = current_app.extensions["instrumentation"]
+    return jsonify(
+        {"endpoints": timings.snapshot(), "profiles": list(timings.profiles)}
+    )
+
+
+@instrumentation_bp.route("", methods=["DELETE"])
+@jwt_required()
+def reset_timings():
+    if get_jwt().get("role") not in ["admin", "manager"]:
+        return jsonify({"message": "Only managers can reset timings"}), 403
+
+    current_app.extensions["instrumentation"].reset()
+    return jsonify({"message": "Timings reset"})
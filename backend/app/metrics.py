@@ -0,0 +1,231 @@
+# backend/app/metrics.py
+import threading
+import time
+from bisect import bisect_left
+from flask import Response, current_app, request
+
+# Latency histogram bucket bounds in seconds (Prometheus client defaults)
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class _Shard:
+    """One thread's counters; only that thread ever writes to it."""
+
+    def __init__(self, thread):
+        self.thread = thread
+        self.in_flight = 0
+        # (blueprint, route, method) -> [count, sum, *bucket counts]
+        self.durations = {}
+        # (blueprint, route, method, status) -> count
+        self.requests = {}
+
+
+class RequestMetrics:
+    """Request counters and latency histograms, sharded per thread.
+
+    Recording touches only the calling thread's shard, so the request
+    path never takes a lock; the registry lock is only held when a thread
+    records for the first time and while a scrape merges the shards.
+    Shards of threads that have exited are folded into a retired total.
+    Each worker process keeps its own numbers, so scrape every worker.
+    """
+
+    def __init__(self, buckets=BUCKETS):
+        self.buckets = buckets
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._shards = []
+        self._retired = _Shard(None)
+
+    def _shard(self):
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = self._local.shard = _Shard(threading.current_thread())
+            with self._lock:
+                self._shards.append(shard)
+        return shard
+
+    def start(self):
+        self._shard().in_flight += 1
+
+    def finish(self, blueprint, route, method, status, elapsed):
+        shard = self._shard()
+        shard.in_flight -= 1
+
+        key = (blueprint, route, method)
+        values = shard.durations.get(key)
+        if values is None:
+            values = shard.durations[key] = [0, 0.0] + [0] * len(self.buckets)
+        values[0] += 1
+        values[1] += elapsed
+        bucket = bisect_left(self.buckets, elapsed)
+        if bucket < len(self.buckets):
+            values[2 + bucket] += 1
+
+        key = (blueprint, route, method, status)
+        shard.requests[key] = shard.requests.get(key, 0) + 1
+
+    @staticmethod
+    def _merge(into, shard):
+        into.in_flight += shard.in_flight
+        for key, values in list(shard.durations.items()):
+            total = into.durations.setdefault(key, [0] * len(values))
+            for i, value in enumerate(list(values)):
+                total[i] += value
+        for key, count in list(shard.requests.items()):
+            into.requests[key] = into.requests.get(key, 0) + count
+
+    def collect(self):
+        """Merge every shard into one snapshot."""
+        with self._lock:
+            live = []
+            for shard in self._shards:
+                if shard.thread.is_alive():
+                    live.append(shard)
+                else:
+                    self._merge(self._retired, shard)
+            self._shards = live
+
+            snapshot = _Shard(None)
+            self._merge(snapshot, self._retired)
+            for shard in live:
+                self._merge(snapshot, shard)
+        return snapshot
+
+
+def _labels(**labels):
+    def escape(value):
+        return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+    return ",".join(f'{name}="{escape(value)}"' for name, value in labels.items())
+
+
+def _format_number(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def render_metrics(metrics, engine, extra_gauges=(), extra_counters=()):
+    """Prometheus text exposition format (version 0.0.4)."""
+    snapshot = metrics.collect()
+    lines = []
+
+    def family(name, kind, help_text):
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+
+    family("http_requests_total", "counter", "Requests served by route and status.")
+    for (blueprint, route, method, status), count in sorted(snapshot.requests.items()):
+        labels = _labels(blueprint=blueprint, route=route, method=method, status=status)
+        lines.append(f"http_requests_total{{{labels}}} {count}")
+
+    family("http_request_duration_seconds", "histogram", "Request latency by route.")
+    for (blueprint, route, method), values in sorted(snapshot.durations.items()):
+        labels = _labels(blueprint=blueprint, route=route, method=method)
+        cumulative = 0
+        for bound, count in zip(metrics.buckets, values[2:]):
+            cumulative += count
+            lines.append(
+                f'http_request_duration_seconds_bucket{{{labels},le="{bound}"}} '
+                f"{cumulative}"
+            )
+        lines.append(
+            f'http_request_duration_seconds_bucket{{{labels},le="+Inf"}} {values[0]}'
+        )
+        lines.append(
+            f"http_request_duration_seconds_sum{{{labels}}} {_format_number(values[1])}"
+        )
+        lines.append(f"http_request_duration_seconds_count{{{labels}}} {values[0]}")
+
+    family("http_requests_in_flight", "gauge", "Requests currently being served.")
+    lines.append(f"http_requests_in_flight {snapshot.in_flight}")
+
+    pool = engine.pool
+    gauges = [
+        ("db_pool_size", "Connections the pool keeps open.", pool.size()),
+        (
+            "db_pool_checked_out",
+            "Connections currently checked out of the pool.",
+            pool.checkedout(),
+        ),
+        ("db_pool_checked_in", "Idle connections in the pool.", pool.checkedin()),
+        (
+            "db_pool_overflow",
+            "Connections open beyond the pool size.",
+            max(0, pool.overflow()),
+        ),
+        *extra_gauges,
+    ]
+    for name, help_text, value in gauges:
+        family(name, "gauge", help_text)
+        lines.append(f"{name} {_format_number(value)}")
+    for name, help_text, value in extra_counters:
+        family(name, "counter", help_text)
+        lines.append(f"{name} {_format_number(value)}")
+
+    return "\n".join(lines) + "\n"
+
+
+def init_metrics(app):
+    """Count and time every request and serve the totals at ``/metrics``."""
+    from app.database import db
+
+    metrics = RequestMetrics()
+    app.extensions["metrics"] = metrics
+
+    @app.before_request
+    def start_metrics():
+        if request.endpoint == "metrics":
+            return
+        request.environ["metrics.started"] = time.perf_counter()
+        metrics.start()
+
+    @app.after_request
+    def record_status(response):
+        request.environ["metrics.status"] = response.status_code
+        return response
+
+    # Teardown also runs when a view raised, so in-flight never leaks. It
+    # can run after the app context is gone, so state lives in the environ.
+    @app.teardown_request
+    def finish_metrics(exc):
+        started = request.environ.pop("metrics.started", None)
+        if started is None:
+            return
+        metrics.finish(
+            request.blueprint or "",
+            request.url_rule.rule if request.url_rule else "<unmatched>",
+            request.method,
+            request.environ.pop("metrics.status", 500),
+            time.perf_counter() - started,
+        )
+
+    @app.route("/metrics", endpoint="metrics")
+    def metrics_view():
+        token = current_app.config.get("METRICS_TOKEN")
+        if token and request.headers.get("Authorization") != f"Bearer {token}":
+            return Response("Unauthorized\n", status=401, mimetype="text/plain")
+
+        broker = current_app.extensions.get("roster_events")
+        gauges, counters = [], []
+        if broker is not None:
+            gauges = [
+                (
+                    "roster_event_subscribers",
+                    "Connected live roster event streams.",
+                    broker.subscriber_count(),
+                )
+            ]
+            counters = [
+                (
+                    "roster_event_subscribers_dropped_total",
+                    "Event streams dropped for falling behind since start.",
+                    broker.dropped,
+                )
+            ]
+        return Response(
+            render_metrics(metrics, db.engine, gauges, counters),
+            mimetype="text/plain",
+            content_type="text/plain; version=0.0.4; charset=utf-8",
+        )
+
+    return metrics
@@ -2,9 +2,23 @@ from app.database import db
 
 # Import models in dependency order
 from app.models.user import User
+from app.models.shift_template import ShiftTemplate
+from app.models.template_exclusion import TemplateExclusion
 from app.models.shift import Shift
 from app.models.shift_staff import ShiftStaff
-from app.models.availability import Availability
+from app.models.availability import Availability, AvailabilityGeneration
+from app.models.tombstone import Tombstone
+from app.models.shift_coverage import ShiftCoverage
 
 # Make models available at package level
-__all__ = ["User", "Shift", "ShiftStaff", "Availability"]
+__all__ = [
+    "User",
+    "ShiftTemplate",
+    "TemplateExclusion",
+    "Shift",
+    "ShiftStaff",
+    "Availability",
+    "AvailabilityGeneration",
+    "Tombstone",
+    "ShiftCoverage",
+]
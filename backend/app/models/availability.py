@@ -1,15 +1,20 @@
 from app.database import db
 from datetime import datetime
+from sqlalchemy import DDL, event
 
 
 class Availability(db.Model):
     __tablename__ = "availabilities"
+    __table_args__ = (
+        db.Index("ix_availabilities_user_id_day_of_week", "user_id", "day_of_week"),
+        db.Index("ix_availabilities_day_of_week", "day_of_week"),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False)
     day_of_week = db.Column(db.Integer, nullable=False)  # 0=Monday, 6=Sunday
-    start_time = db.Column(db.String(8), nullable=False)  # HH:MM:SS format
-    end_time = db.Column(db.String(8), nullable=False)  # HH:MM:SS format
+    start_time = db.Column(db.Time, nullable=False)
+    end_time = db.Column(db.Time, nullable=False)
     is_recurring = db.Column(db.Boolean, default=True)
     start_date = db.Column(db.Date, nullable=True)  # For non-recurring availability
     end_date = db.Column(db.Date, nullable=True)  # For non-recurring availability
@@ -21,3 +26,36 @@ class Availability(db.Model):
 
     # Relationship
     user = db.relationship("User", backref=db.backref("availabilities", lazy=True))
+
+
+class AvailabilityGeneration(db.Model):
+    """A counter bumped by every statement that writes ``availabilities``.
+
+    A trigger keeps it, so writes from any worker or tool count. Caches of
+    the table compare one row instead of reading the table.
+    """
+
+    __tablename__ = "availability_generation"
+
+    id = db.Column(db.Integer, primary_key=True)
+    value = db.Column(db.BigInteger, nullable=False, default=0)
+
+
+# The counter's single row and the trigger, for databases made with
+# create_all; the migration sets up the same
+AVAILABILITY_GENERATION_DDL = """
+INSERT INTO availability_generation (id, value) VALUES (1, 0)
+    ON CONFLICT (id) DO NOTHING;
+CREATE OR REPLACE FUNCTION bump_availability_generation() RETURNS trigger AS $$
+BEGIN
+    UPDATE availability_generation SET value = value + 1 WHERE id = 1;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+DROP TRIGGER IF EXISTS availabilities_bump_generation ON availabilities;
+CREATE TRIGGER availabilities_bump_generation
+    AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON availabilities
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_availability_generation();
+"""
+
+event.listen(db.metadata, "after_create", DDL(AVAILABILITY_GENERATION_DDL))
@@ -1,35 +1,78 @@
 from app.database import db
-from datetime import datetime
+from datetime import datetime, timedelta
+from sqlalchemy.ext.hybrid import hybrid_property
+from app.utils.helpers import shift_bounds
 
 
 class Shift(db.Model):
     __tablename__ = "shifts"
+    __table_args__ = (
+        db.Index("ix_shifts_date_start_time", "date", "start_time"),
+        db.Index("ix_shifts_employee_id", "employee_id"),
+        db.Index("ix_shifts_updated_at", "updated_at"),
+        # Expanding a template twice for the same day must not duplicate it
+        db.UniqueConstraint("template_id", "date", name="uq_shifts_template_id_date"),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     date = db.Column(db.Date, nullable=False)
-    start_time = db.Column(db.String(8), nullable=False)  # HH:MM:SS format
-    end_time = db.Column(db.String(8), nullable=False)  # HH:MM:SS format
+    start_time = db.Column(db.Time, nullable=False)
+    end_time = db.Column(db.Time, nullable=False)
     required_staff = db.Column(db.Integer, nullable=False, default=1)
+    # Kept in step with staff_assignments by app.services.coverage when the
+    # transaction commits; `flask rebuild-coverage` recounts it in bulk
+    confirmed_staff_count = db.Column(
+        db.Integer, nullable=False, default=0, server_default="0"
+    )
     status = db.Column(db.String(50), nullable=False, default="draft")
     # Status options: draft, published, completed, cancelled
     employee_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False)
+    template_id = db.Column(
+        db.Integer, db.ForeignKey("shift_templates.id"), nullable=True
+    )
 
     # Relationships
     employee = db.relationship("User", backref=db.backref("shifts", lazy=True))
+    template = db.relationship("ShiftTemplate", backref=db.backref("shifts", lazy=True))
 
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(
         db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow
     )
 
+    @hybrid_property
+    def starts_at(self):
+        return shift_bounds(self.date, self.start_time, self.end_time)[0]
+
+    @starts_at.expression
+    def starts_at(cls):
+        return cls.date + cls.start_time
+
+    @hybrid_property
+    def ends_at(self):
+        """End timestamp; shifts ending at or before their start run overnight."""
+        return shift_bounds(self.date, self.start_time, self.end_time)[1]
+
+    @ends_at.expression
+    def ends_at(cls):
+        return (
+            cls.date
+            + cls.end_time
+            + db.case(
+                (cls.end_time <= cls.start_time, timedelta(days=1)),
+                else_=timedelta(0),
+            )
+        )
+
     @property
     def assigned_staff(self):
         return [assignment.staff for assignment in self.staff_assignments]
 
-    @property
-    def confirmed_staff_count(self):
-        return sum(
-            1
-            for assignment in self.staff_assignments
-            if assignment.status == "confirmed"
-        )
+    @hybrid_property
+    def open_slots(self):
+        """Places still to fill; overstaffing doesn't go negative."""
+        return max(self.required_staff - self.confirmed_staff_count, 0)
+
+    @open_slots.expression
+    def open_slots(cls):
+        return db.func.greatest(cls.required_staff - cls.confirmed_staff_count, 0)
@@ -0,0 +1,22 @@
+from app.database import db
+from datetime import datetime
+
+
+class ShiftCoverage(db.Model):
+    """Per-day staffing totals over the day's shifts, excluding cancelled ones.
+
+    Maintained by ``app.services.coverage`` in the same transaction as the
+    shift and assignment writes; days without shifts have no row.
+    """
+
+    __tablename__ = "shift_coverage"
+
+    date = db.Column(db.Date, primary_key=True)
+    shift_count = db.Column(db.Integer, nullable=False)
+    required_staff = db.Column(db.Integer, nullable=False)
+    confirmed_staff = db.Column(db.Integer, nullable=False)
+    # Unfilled places, not counting extra confirmations on overstaffed shifts
+    open_slots = db.Column(db.Integer, nullable=False)
+    understaffed_shifts = db.Column(db.Integer, nullable=False)
+
+    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
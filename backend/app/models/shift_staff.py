@@ -6,6 +6,13 @@ from app.models.shift import Shift  # Add this import
 
 class ShiftStaff(db.Model):
     __tablename__ = "shift_staff"
+    __table_args__ = (
+        db.UniqueConstraint(
+            "shift_id", "staff_id", name="uq_shift_staff_shift_id_staff_id"
+        ),
+        db.Index("ix_shift_staff_staff_id_status", "staff_id", "status"),
+        db.Index("ix_shift_staff_updated_at", "updated_at"),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     shift_id = db.Column(db.Integer, db.ForeignKey("shifts.id"), nullable=False)
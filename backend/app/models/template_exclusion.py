@@ -0,0 +1,21 @@
+from app.database import db
+from datetime import datetime
+
+
+class TemplateExclusion(db.Model):
+    """A date a template must not generate a shift for again.
+
+    Recorded when a manager deletes a generated shift or moves it to
+    another day, so expanding the template later doesn't bring it back.
+    """
+
+    __tablename__ = "template_exclusions"
+
+    template_id = db.Column(
+        db.Integer,
+        db.ForeignKey("shift_templates.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    date = db.Column(db.Date, primary_key=True)
+
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
@@ -0,0 +1,24 @@
+from app.database import db
+from datetime import datetime
+
+
+class Tombstone(db.Model):
+    """Record of a hard-deleted shift or assignment, for delta sync clients.
+
+    A shift moved to another date also leaves a ``shift`` tombstone for the
+    date it left, so ranges that held it drop it.
+    """
+
+    __tablename__ = "tombstones"
+    __table_args__ = (db.Index("ix_tombstones_deleted_at", "deleted_at"),)
+
+    id = db.Column(db.Integer, primary_key=True)
+    entity = db.Column(db.String(50), nullable=False)
+    # Entity options: shift, shift_staff
+    entity_id = db.Column(db.Integer, nullable=False)
+    # The shift a deleted assignment belonged to, and that shift's date, so
+    # deletions can be filtered by calendar range like live rows
+    shift_id = db.Column(db.Integer, nullable=False)
+    shift_date = db.Column(db.Date, nullable=False)
+
+    deleted_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
@@ -1,10 +1,29 @@
 # backend/app/models/user.py
 from app.database import db
-from werkzeug.security import generate_password_hash, check_password_hash
+from app.services.passwords import (
+    get_password_hasher,
+    hash_password,
+    verify_password,
+)
 
 
 class User(db.Model):
     __tablename__ = "users"
+    # The directory pages through users by case-folded username. In the "C"
+    # collation one btree serves that order, the keyset comparison and
+    # LIKE 'prefix%' searches alike.
+    __table_args__ = (
+        db.Index(
+            "ix_users_username_lower", db.text('lower(username) COLLATE "C"'), "id"
+        ),
+        db.Index(
+            "ix_users_role_username_lower",
+            "role",
+            db.text('lower(username) COLLATE "C"'),
+            "id",
+        ),
+        db.Index("ix_users_email_lower", db.text('lower(email) COLLATE "C"')),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     username = db.Column(db.String(80), unique=True, nullable=False)
@@ -13,9 +32,16 @@ class User(db.Model):
     role = db.Column(
         db.String(20), nullable=False, default="baker"
     )  # admin, manager, baker
+    # SHA-256 of the token in the user's calendar feed URL, if they have one
+    calendar_token_hash = db.Column(db.String(64), unique=True)
 
     def set_password(self, password):
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = hash_password(password)
 
     def check_password(self, password):
-        return check_password_hash(self.password_hash, password)
+        return verify_password(self.password_hash, password)
+
+    def password_needs_rehash(self):
+        """Whether the hash predates the configured PASSWORD_HASH_METHOD."""
+        hasher = get_password_hasher()
+        return hasher is not None and hasher.needs_rehash(self.password_hash)
@@ -0,0 +1,142 @@
+# backend/app/replicas.py
+import itertools
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from flask import current_app, g, has_request_context, request
+from flask_jwt_extended import get_jwt_identity, verify_jwt_in_request
+from sqlalchemy import create_engine, func, select
+
+# Response header carrying the end of the caller's sticky window (epoch
+# seconds); clients send it back so other workers honour the window too
+STICKY_HEADER = "X-Read-Primary-Until"
+READ_METHODS = {"GET", "HEAD"}
+
+
+class ReplicaRouter:
+    """Chooses between the primary and read replicas per request.
+
+    Reads go to the replicas in turn. After a user writes, their requests
+    stick to the primary for ``sticky_seconds`` so they read their own
+    writes while the replicas catch up.
+    """
+
+    def __init__(self, engines, sticky_seconds=5):
+        self.engines = engines
+        self.sticky_seconds = sticky_seconds
+        self._next = itertools.cycle(engines)
+        self._sticky = {}
+        self._lock = threading.Lock()
+
+    def mark_write(self, user_id):
+        """Start ``user_id``'s sticky window; returns when it ends."""
+        until = time.time() + self.sticky_seconds
+        with self._lock:
+            self._sticky[user_id] = until
+            if len(self._sticky) > 10000:
+                now = time.time()
+                self._sticky = {u: t for u, t in self._sticky.items() if t > now}
+        return until
+
+    def is_sticky(self, user_id, claimed_until=None):
+        now = time.time()
+        # Never honour more than one window, whatever the client sends
+        if (
+            claimed_until is not None
+            and now < claimed_until <= now + self.sticky_seconds
+        ):
+            return True
+        return self._sticky.get(user_id, 0) > now
+
+    def choose(self):
+        return next(self._next)
+
+    def dispose(self):
+        for engine in self.engines:
+            engine.dispose()
+
+
+def on_replica():
+    return has_request_context() and g.get("db_replica") is not None
+
+
+@contextmanager
+def use_primary(enabled=True):
+    """Route the block's reads to the primary."""
+    if not (enabled and has_request_context()):
+        yield
+        return
+    replica = g.pop("db_replica", None)
+    try:
+        yield
+    finally:
+        g.db_replica = replica
+
+
+def recently_written(since_monotonic):
+    """Whether a write at ``since_monotonic`` may not be on the replicas yet."""
+    router = current_app.extensions.get("db_replicas")
+    if router is None or since_monotonic is None:
+        return False
+    return time.monotonic() - since_monotonic < router.sticky_seconds
+
+
+def read_timestamp():
+    """UTC time the data being read is known to be current as of.
+
+    On a replica that is the commit time of the last transaction it has
+    replayed, so sync cursors never skip changes that haven't arrived yet.
+    """
+    from app.database import db
+
+    now = datetime.utcnow()
+    if not on_replica():
+        return now
+    replayed = db.session.scalar(
+        select(func.timezone("UTC", func.pg_last_xact_replay_timestamp()))
+    )
+    return min(now, replayed) if replayed is not None else now
+
+
+def _request_user():
+    try:
+        verify_jwt_in_request(optional=True)
+        return get_jwt_identity()
+    except Exception:
+        return None
+
+
+def init_replicas(app):
+    """Route read-only requests to ``DB_REPLICA_URIS``."""
+    from app.database import configure_engine, engine_options
+
+    engines = []
+    for uri in app.config["DB_REPLICA_URIS"]:
+        engine = create_engine(uri, **engine_options(app.config))
+        configure_engine(engine, app.config)
+        engines.append(engine)
+    router = ReplicaRouter(engines, app.config.get("REPLICA_STICKY_SECONDS", 5))
+    app.extensions["db_replicas"] = router
+
+    @app.before_request
+    def route_reads():
+        if request.method not in READ_METHODS:
+            return
+        try:
+            claimed = float(request.headers.get(STICKY_HEADER, ""))
+        except ValueError:
+            claimed = None
+        if not router.is_sticky(_request_user(), claimed):
+            g.db_replica = router.choose()
+
+    @app.after_request
+    def stick_after_write(response):
+        if request.method in READ_METHODS or response.status_code >= 400:
+            return response
+        user_id = _request_user()
+        if user_id is not None:
+            response.headers[STICKY_HEADER] = f"{router.mark_write(user_id):.3f}"
+        return response
+
+    return router
@@ -1,8 +1,10 @@
 # backend/app/routes/auth.py
 from flask import Blueprint, request, jsonify, make_response
-from flask_jwt_extended import create_access_token, get_jwt_identity, jwt_required
+from flask_jwt_extended import create_access_token, jwt_required
 from app.models.user import User
 from app.database import db
+from app.services.passwords import HasherBusy
+from app.services.user_cache import current_user
 
 auth_bp = Blueprint("auth", __name__)
 
@@ -17,6 +19,14 @@ def login():
     user = User.query.filter_by(username=data["username"]).first()
 
     if user and user.check_password(data["password"]):
+        # Upgrade hashes made with older cost parameters while we have the
+        # plain password; if the hashers are busy, the next login will
+        if user.password_needs_rehash():
+            try:
+                user.set_password(data["password"])
+                db.session.commit()
+            except HasherBusy:
+                pass
         access_token = create_access_token(
             identity=user.id, additional_claims={"role": user.role}
         )
@@ -30,8 +40,7 @@ def login():
 @auth_bp.route("/me", methods=["GET"])
 @jwt_required()
 def get_current_user():
-    current_user_id = get_jwt_identity()
-    user = User.query.get(current_user_id)
+    user = current_user()
 
     if not user:
         return jsonify({"message": "User not found"}), 404
@@ -0,0 +1,276 @@
+# backend/app/routes/availability.py
+from flask import Blueprint, current_app, jsonify, request
+from flask_jwt_extended import jwt_required, get_jwt, get_jwt_identity
+from datetime import date, timedelta
+from app.models import Availability, User
+from app.database import db
+from app.services.availability_index import (
+    AvailabilityIndex,
+    get_availability_index,
+    update_availability_index,
+)
+from app.services.scheduler import repair_for_availability
+from app.utils.helpers import bakery_now, parse_time
+
+availability_bp = Blueprint("availability", __name__)
+
+# Request keys and the model fields they set
+AVAILABILITY_FIELDS = {
+    "dayOfWeek": "day_of_week",
+    "startTime": "start_time",
+    "endTime": "end_time",
+    "isRecurring": "is_recurring",
+    "startDate": "start_date",
+    "endDate": "end_date",
+}
+
+
+def availability_to_dict(availability):
+    return {
+        "id": availability.id,
+        "user_id": availability.user_id,
+        "day_of_week": availability.day_of_week,
+        "start_time": availability.start_time.isoformat(),
+        "end_time": availability.end_time.isoformat(),
+        "is_recurring": availability.is_recurring,
+        "start_date": (
+            availability.start_date.isoformat() if availability.start_date else None
+        ),
+        "end_date": (
+            availability.end_date.isoformat() if availability.end_date else None
+        ),
+    }
+
+
+def _can_edit(user_id):
+    return (
+        get_jwt().get("role") in ["admin", "manager"] or user_id == get_jwt_identity()
+    )
+
+
+def _apply_fields(availability, data):
+    """Copy request fields onto ``availability``; raises ValueError if invalid."""
+    for key, field in AVAILABILITY_FIELDS.items():
+        if key not in data:
+            continue
+        value = data[key]
+        if field == "day_of_week" and value not in range(7):
+            raise ValueError("dayOfWeek must be 0 (Monday) to 6 (Sunday)")
+        if field in ("start_time", "end_time"):
+            value = parse_time(value)
+        if field in ("start_date", "end_date"):
+            value = date.fromisoformat(value) if value else None
+        setattr(availability, field, value)
+
+    if availability.day_of_week is None or not (
+        availability.start_time and availability.end_time
+    ):
+        raise ValueError("Missing dayOfWeek, startTime or endTime")
+    if (
+        availability.start_date
+        and availability.end_date
+        and availability.start_date > availability.end_date
+    ):
+        raise ValueError("startDate must be on or before endDate")
+
+
+def _refill_requested():
+    """Whether the request asks for a roster-wide refill (managers only)."""
+    return request.args.get("refill", "").lower() == "true"
+
+
+def _refill_forbidden():
+    if _refill_requested() and get_jwt().get("role") not in ["admin", "manager"]:
+        return jsonify({"message": "Only managers can refill the roster"}), 403
+    return None
+
+
+def _previous_windows(user_id):
+    return AvailabilityIndex.from_query(Availability.query.filter_by(user_id=user_id))
+
+
+def _repair_roster(user_id, previous):
+    """Repair the user's upcoming shifts after their availability changed.
+
+    Assignments the new availability no longer covers are cancelled and
+    those shifts refilled, and the user is offered the understaffed shifts
+    they newly cover. ``?refill=true`` (managers only) also refills every
+    understaffed shift on their available days from all bakers. The change is
+    already committed, so a failed repair is logged and reported rather
+    than failing the request; ``None`` when the repair is disabled.
+    """
+    days = current_app.config.get("AVAILABILITY_REPAIR_DAYS", 28)
+    if not days:
+        return None
+    start = bakery_now().date()
+    try:
+        return repair_for_availability(
+            user_id,
+            start,
+            start + timedelta(days=days - 1),
+            previous=previous,
+            refill=_refill_requested(),
+        )
+    except Exception:
+        db.session.rollback()
+        current_app.logger.exception(
+            "Roster repair after availability change failed for user %s", user_id
+        )
+        return {"message": "Roster repair failed"}
+
+
+@availability_bp.route("", methods=["GET"])
+@jwt_required()
+def get_availabilities():
+    query = Availability.query
+    if get_jwt().get("role") in ["admin", "manager"]:
+        if request.args.get("userId"):
+            query = query.filter_by(user_id=int(request.args["userId"]))
+    else:
+        query = query.filter_by(user_id=get_jwt_identity())
+
+    availabilities = query.order_by(
+        Availability.user_id, Availability.day_of_week, Availability.start_time
+    ).all()
+    return jsonify(
+        {"availabilities": [availability_to_dict(a) for a in availabilities]}
+    )
+
+
+@availability_bp.route("", methods=["POST"])
+@jwt_required()
+def create_availability():
+    data = request.get_json() or {}
+    user_id = data.get("userId", get_jwt_identity())
+    if not _can_edit(user_id):
+        return jsonify({"message": "Cannot edit another user's availability"}), 403
+    if not db.session.get(User, user_id):
+        return jsonify({"message": "User not found"}), 404
+    forbidden = _refill_forbidden()
+    if forbidden:
+        return forbidden
+
+    previous = _previous_windows(user_id)
+    availability = Availability(user_id=user_id, is_recurring=True)
+    try:
+        _apply_fields(availability, data)
+    except ValueError as e:
+        return jsonify({"message": str(e)}), 400
+
+    db.session.add(availability)
+    db.session.commit()
+    update_availability_index(availability)
+    repair = _repair_roster(user_id, previous)
+    return jsonify({**availability_to_dict(availability), "repair": repair}), 201
+
+
+@availability_bp.route("/<int:availability_id>", methods=["PUT"])
+@jwt_required()
+def update_availability(availability_id):
+    availability = Availability.query.get_or_404(availability_id)
+    if not _can_edit(availability.user_id):
+        return jsonify({"message": "Cannot edit another user's availability"}), 403
+    forbidden = _refill_forbidden()
+    if forbidden:
+        return forbidden
+
+    previous = _previous_windows(availability.user_id)
+    try:
+        _apply_fields(availability, request.get_json() or {})
+    except ValueError as e:
+        db.session.rollback()
+        return jsonify({"message": str(e)}), 400
+
+    db.session.commit()
+    update_availability_index(availability)
+    repair = _repair_roster(availability.user_id, previous)
+    return jsonify({**availability_to_dict(availability), "repair": repair})
+
+
+@availability_bp.route("/<int:availability_id>", methods=["DELETE"])
+@jwt_required()
+def delete_availability(availability_id):
+    availability = Availability.query.get_or_404(availability_id)
+    if not _can_edit(availability.user_id):
+        return jsonify({"message": "Cannot edit another user's availability"}), 403
+
+    forbidden = _refill_forbidden()
+    if forbidden:
+        return forbidden
+
+    user_id = availability.user_id
+    previous = _previous_windows(user_id)
+    db.session.delete(availability)
+    db.session.commit()
+    update_availability_index(deleted_id=availability_id)
+    return jsonify(
+        {
+            "message": "Availability deleted successfully",
+            "repair": _repair_roster(user_id, previous),
+        }
+    )
+
+
+def _lookup(windows):
+    """Resolve ``(date, start, end)`` windows against the shared index."""
+    index = get_availability_index()
+    results, user_ids = [], set()
+    for day, start_time, end_time in windows:
+        available = index.available(day, start_time, end_time)
+        user_ids |= available
+        results.append((day, start_time, end_time, sorted(available)))
+
+    usernames = {}
+    if user_ids:
+        usernames = dict(
+            db.session.query(User.id, User.username).filter(User.id.in_(user_ids))
+        )
+
+    return [
+        {
+            "date": day.isoformat(),
+            "start_time": start_time.isoformat(),
+            "end_time": end_time.isoformat(),
+            "available": [
+                {"id": user_id, "username": usernames[user_id]}
+                for user_id in available
+                if user_id in usernames
+            ],
+        }
+        for day, start_time, end_time, available in results
+    ]
+
+
+@availability_bp.route("/available", methods=["GET"])
+@jwt_required()
+def get_available_staff():
+    try:
+        window = (
+            date.fromisoformat(request.args["date"]),
+            parse_time(request.args["start"]),
+            parse_time(request.args["end"]),
+        )
+    except (KeyError, ValueError):
+        return jsonify({"message": "date, start and end are required"}), 400
+
+    return jsonify(_lookup([window])[0])
+
+
+@availability_bp.route("/available", methods=["POST"])
+@jwt_required()
+def query_available_staff():
+    """Batch form of the lookup, e.g. for every shift in a week."""
+    data = request.get_json() or {}
+    try:
+        windows = [
+            (
+                date.fromisoformat(window["date"]),
+                parse_time(window["start"]),
+                parse_time(window["end"]),
+            )
+            for window in data.get("windows", [])
+        ]
+    except (KeyError, TypeError, ValueError):
+        return jsonify({"message": "Each window needs date, start and end"}), 400
+
+    return jsonify({"results": _lookup(windows)})
@@ -0,0 +1,60 @@
+# backend/app/routes/calendar.py
+from flask import Blueprint, current_app, jsonify, request, url_for
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from app.database import db
+from app.models import User
+from app.services.calendar_feed import calendar_feed, issue_calendar_token
+
+calendar_bp = Blueprint("calendar", __name__)
+
+
+@calendar_bp.route("/token", methods=["POST"])
+@jwt_required()
+def create_calendar_token():
+    """Issue the current user a calendar feed URL.
+
+    Calendar apps can't send a JWT, so the URL itself carries a token.
+    Issuing a new one revokes the previous URL.
+    """
+    user = db.session.get(User, get_jwt_identity())
+    if user is None:
+        return jsonify({"message": "User not found"}), 404
+    token = issue_calendar_token(user)
+    db.session.commit()
+    return (
+        jsonify(
+            {"url": url_for("calendar.get_calendar_feed", token=token, _external=True)}
+        ),
+        201,
+    )
+
+
+@calendar_bp.route("/token", methods=["DELETE"])
+@jwt_required()
+def revoke_calendar_token():
+    user = db.session.get(User, get_jwt_identity())
+    if user is None:
+        return jsonify({"message": "User not found"}), 404
+    user.calendar_token_hash = None
+    db.session.commit()
+    return jsonify({"message": "Calendar feed revoked"})
+
+
+@calendar_bp.route("/<token>.ics", methods=["GET"])
+def get_calendar_feed(token):
+    """The token holder's confirmed shifts as an iCalendar feed.
+
+    Served from the per-user feed cache with a strong ETag and
+    Last-Modified, so a poll that finds nothing new is a 304 after one
+    query.
+    """
+    feed = calendar_feed(token)
+    if feed is None:
+        return jsonify({"message": "Calendar feed not found"}), 404
+
+    response = current_app.response_class(feed.body, mimetype="text/calendar")
+    response.set_etag(feed.etag)
+    response.last_modified = feed.last_modified
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    return response.make_conditional(request)
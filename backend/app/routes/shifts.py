@@ -1,8 +1,38 @@
-from flask import Blueprint, jsonify, request
-from flask_jwt_extended import jwt_required, get_jwt_identity
+import json
+from flask import Blueprint, current_app, jsonify, request, stream_with_context
+from flask_jwt_extended import jwt_required, get_jwt, get_jwt_identity
 from datetime import datetime
-from app.models import Shift, ShiftStaff, User  # Update this import
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import selectinload
+from app.models import Shift, ShiftCoverage, ShiftStaff, User  # Update this import
 from app.database import db
+from app.services.bulk_shifts import BulkValidationError, bulk_create
+from app.services.payroll import PAYROLL_FORMATS, export_payroll
+from app.services.conflicts import (
+    ACTIVE_ASSIGNMENT_STATUSES,
+    assignment_conflicts,
+    find_conflicts,
+)
+from app.services.scheduler import (
+    rank_open_slots,
+    repair_for_availability,
+    repair_shifts,
+    solve_roster,
+)
+from app.replicas import read_timestamp, recently_written, use_primary
+from app.services.roster_events import get_roster_events
+from app.services.shift_cache import get_shift_cache
+from app.services.sync import (
+    CursorExpired,
+    delete_shift_with_tombstones,
+    new_cursor,
+    parse_cursor,
+    record_shift_move,
+    shift_changes,
+)
+from app.services.templates import exclude_template_date
+from app.signals import notify_roster_changed
+from app.utils.helpers import parse_time
 
 shifts_bp = Blueprint("shifts", __name__)
 
@@ -15,44 +45,249 @@ SHIFT_STATUSES = [
 ]
 
 
+# Listing orders: the calendar's, or the shifts most short of staff first
+SHIFT_SORTS = {
+    "date": (Shift.date, Shift.start_time, Shift.id),
+    "open_slots": (Shift.open_slots.desc(), Shift.date, Shift.start_time, Shift.id),
+}
+
+
+def _shift_listing_query(sort="date"):
+    """Shifts with their assignments and staff preloaded.
+
+    Confirmed counts are stored on the shift, and ``selectinload`` fetches
+    every assignment (joined to its user) in one extra query, so the
+    listing costs two queries regardless of how many shifts or assignments
+    are in range.
+    """
+    return Shift.query.options(
+        selectinload(Shift.staff_assignments).joinedload(ShiftStaff.staff)
+    ).order_by(*SHIFT_SORTS[sort])
+
+
+def _shift_payload(query):
+    return [
+        {
+            "id": shift.id,
+            "title": f"Shift ({shift.confirmed_staff_count}/{shift.required_staff})",
+            "start": shift.starts_at.isoformat(),
+            "end": shift.ends_at.isoformat(),
+            "status": shift.status,
+            "required_staff": shift.required_staff,
+            "confirmed_staff": shift.confirmed_staff_count,
+            "staff": [
+                {
+                    "id": assignment.staff.id,
+                    "username": assignment.staff.username,
+                    "status": assignment.status,
+                }
+                for assignment in shift.staff_assignments
+            ],
+        }
+        for shift in query
+    ]
+
+
+def _shift_listing(start=None, end=None, understaffed=False, sort="date"):
+    """The ``GET /api/shifts`` payload for shifts dated ``start``..``end``.
+
+    ``understaffed`` keeps only uncancelled shifts with open slots.
+    """
+    read_at = read_timestamp()
+    query = _shift_listing_query(sort)
+    if start and end:
+        query = query.filter(Shift.date >= start, Shift.date <= end)
+    if understaffed:
+        query = query.filter(
+            Shift.confirmed_staff_count < Shift.required_staff,
+            Shift.status != "cancelled",
+        )
+
+    return {"shifts": _shift_payload(query), "cursor": new_cursor(read_at)}
+
+
+def _shift_delta(since, start=None, end=None):
+    """Shifts changed and deleted in the range since the ``since`` cursor."""
+    read_at = read_timestamp()
+    shift_ids, deleted_shifts, deleted_assignments = shift_changes(since, start, end)
+
+    shifts = []
+    if shift_ids:
+        shifts = _shift_payload(_shift_listing_query().filter(Shift.id.in_(shift_ids)))
+    return {
+        "shifts": shifts,
+        "deleted": {"shifts": deleted_shifts, "assignments": deleted_assignments},
+        "cursor": new_cursor(read_at, since),
+    }
+
+
 @shifts_bp.route("", methods=["GET"])
 @jwt_required()
 def get_shifts():
+    """Shifts in the requested range, served from the range cache.
+
+    Responses carry a strong ETag, so a client revalidating an unchanged
+    range gets a 304 without the database being touched. Every response
+    includes a ``cursor``; passing it back as ``since`` returns only the
+    shifts changed (with their full staff list) and the ids deleted since.
+
+    ``understaffed=true`` lists only shifts with open slots, and
+    ``sort=open_slots`` puts the shortest-staffed first; both read the
+    stored confirmed counts.
+    """
     try:
         start = request.args.get("start")
         end = request.args.get("end")
-
-        query = Shift.query
+        key = (None, None)
         if start and end:
-            query = query.filter(
-                Shift.date >= datetime.fromisoformat(start),
-                Shift.date <= datetime.fromisoformat(end),
+            key = (
+                datetime.fromisoformat(start).date(),
+                datetime.fromisoformat(end).date(),
             )
+        understaffed = request.args.get("understaffed", "").lower() in ("1", "true")
+        sort = request.args.get("sort", "date")
+        if sort not in SHIFT_SORTS:
+            return jsonify({"message": f"Unknown sort: {sort}"}), 400
 
-        shifts = query.all()
-        return jsonify(
+        if request.args.get("since"):
+            if understaffed:
+                # A delta can't tell clients which shifts stopped matching
+                return (
+                    jsonify({"message": "understaffed can't be combined with since"}),
+                    400,
+                )
+            try:
+                since = parse_cursor(request.args["since"])
+            except ValueError:
+                return jsonify({"message": "Invalid since cursor"}), 400
+            try:
+                return jsonify(_shift_delta(since, *key))
+            except CursorExpired as e:
+                return jsonify({"message": str(e)}), 410
+
+        key = (*key, understaffed, sort)
+        cache = get_shift_cache()
+        cached = cache.get(key)
+        if cached is None:
+            generation = cache.generation
+            # The entry is shared with every user, so don't fill it from a
+            # replica that may not have the write that emptied it yet
+            with use_primary(recently_written(cache.invalidated_at)):
+                body = current_app.json.dumps(_shift_listing(*key)).encode()
+            etag = cache.set(key, body, generation)
+        else:
+            etag, body = cached
+
+        response = current_app.response_class(body, mimetype="application/json")
+        response.set_etag(etag)
+        response.cache_control.private = True
+        response.cache_control.no_cache = True
+        return response.make_conditional(request)
+    except Exception as e:
+        return jsonify({"message": str(e)}), 500
+
+
+@shifts_bp.route("/coverage", methods=["GET"])
+@jwt_required()
+def get_coverage():
+    """Required and confirmed staff per day in ``start``..``end``.
+
+    Read from the maintained ``shift_coverage`` table with one primary key
+    range scan, however many shifts and assignments the days hold. Days
+    without shifts are left out.
+    """
+    try:
+        start = datetime.fromisoformat(request.args["start"]).date()
+        end = datetime.fromisoformat(request.args["end"]).date()
+    except (KeyError, ValueError):
+        return jsonify({"message": "start and end dates are required"}), 400
+
+    days = ShiftCoverage.query.filter(
+        ShiftCoverage.date >= start, ShiftCoverage.date <= end
+    ).order_by(ShiftCoverage.date)
+    return jsonify(
+        {
+            "coverage": [
+                {
+                    "date": day.date.isoformat(),
+                    "shifts": day.shift_count,
+                    "required_staff": day.required_staff,
+                    "confirmed_staff": day.confirmed_staff,
+                    "open_slots": day.open_slots,
+                    "understaffed_shifts": day.understaffed_shifts,
+                }
+                for day in days
+            ]
+        }
+    )
+
+
+def _event_stream(subscription, heartbeat):
+    """Format a subscription's events as a ``text/event-stream`` body."""
+    broker = subscription.broker
+    try:
+        yield "retry: 3000\n\n"
+        while True:
+            event = subscription.get(timeout=heartbeat)
+            if subscription.overflowed:
+                yield 'event: resync\ndata: {"type": "resync"}\n\n'
+                return
+            if event is None:
+                yield ": keepalive\n\n"
+                continue
+            name = "resync" if event["type"] == "resync" else "roster"
+            yield f"event: {name}\ndata: {json.dumps(event)}\n\n"
+    finally:
+        broker.unsubscribe(subscription)
+
+
+@shifts_bp.route("/events", methods=["GET"])
+@jwt_required(locations=["headers", "query_string"])
+def shift_events():
+    """Stream shift and assignment changes as Server-Sent Events.
+
+    EventSource cannot set headers, so the token may also be passed as
+    ``?jwt=``. Events name the change and the shifts and dates it touched;
+    clients fetch the data itself with a ``since`` delta sync. A
+    ``resync`` event means events may have been lost (the client fell too
+    far behind, or the listener reconnected) and a full delta sync from
+    the last cursor is needed.
+    """
+    subscription = get_roster_events().subscribe()
+    heartbeat = current_app.config.get("SSE_HEARTBEAT", 15)
+    return current_app.response_class(
+        _event_stream(subscription, heartbeat),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+def conflict_response(conflicts):
+    """409 listing, per username, the shift ids a booking would overlap."""
+    return (
+        jsonify(
             {
-                "shifts": [
-                    {
-                        "id": shift.id,
-                        "title": f"Shift ({shift.confirmed_staff_count}/{shift.required_staff})",
-                        "start": f"{shift.date}T{shift.start_time}",
-                        "end": f"{shift.date}T{shift.end_time}",
-                        "status": shift.status,
-                        "required_staff": shift.required_staff,
-                        "staff": [
-                            {
-                                "id": assignment.staff.id,
-                                "username": assignment.staff.username,
-                                "status": assignment.status,
-                            }
-                            for assignment in shift.staff_assignments
-                        ],
-                    }
-                    for shift in shifts
-                ]
+                "message": "Staff already booked on an overlapping shift",
+                "conflicts": conflicts,
             }
+        ),
+        409,
+    )
+
+
+@shifts_bp.route("/conflicts", methods=["GET"])
+@jwt_required()
+def get_conflicts():
+    start = request.args.get("start")
+    end = request.args.get("end")
+    if not start or not end:
+        return jsonify({"message": "Missing start or end date"}), 400
+
+    try:
+        conflicts = find_conflicts(
+            datetime.fromisoformat(start).date(), datetime.fromisoformat(end).date()
         )
+        return jsonify({"conflicts": conflicts})
     except Exception as e:
         return jsonify({"message": str(e)}), 500
 
@@ -65,33 +300,43 @@ def create_shift():
 
         new_shift = Shift(
             date=datetime.fromisoformat(data["date"]).date(),
-            start_time=data["startTime"],
-            end_time=data["endTime"],
+            start_time=parse_time(data["startTime"]),
+            end_time=parse_time(data["endTime"]),
             required_staff=data.get("requiredStaff", 1),
             status="draft",
+            employee_id=get_jwt_identity(),
         )
 
-        db.session.add(new_shift)
-
         # Add initial staff assignments if provided
-        if "staff" in data:
-            for staff_username in data["staff"]:
-                staff = User.query.filter_by(username=staff_username).first()
-                if staff:
-                    assignment = ShiftStaff(
-                        shift=new_shift, staff=staff, status="pending"
-                    )
-                    db.session.add(assignment)
+        staff_members = []
+        if data.get("staff"):
+            staff_members = User.query.filter(User.username.in_(data["staff"])).all()
+
+        if not data.get("force"):
+            clashes = assignment_conflicts(
+                [(new_shift, staff.id) for staff in staff_members]
+            )
+            if clashes:
+                return conflict_response(
+                    {staff_members[i].username: ids for i, ids in clashes.items()}
+                )
+
+        db.session.add(new_shift)
+        for staff in staff_members:
+            db.session.add(ShiftStaff(shift=new_shift, staff=staff, status="pending"))
 
         db.session.commit()
+        notify_roster_changed(
+            new_shift.date, kind="shift.created", shift_ids=[new_shift.id]
+        )
 
         return (
             jsonify(
                 {
                     "id": new_shift.id,
                     "date": data["date"],
-                    "start_time": new_shift.start_time,
-                    "end_time": new_shift.end_time,
+                    "start_time": new_shift.start_time.isoformat(),
+                    "end_time": new_shift.end_time.isoformat(),
                     "required_staff": new_shift.required_staff,
                     "status": new_shift.status,
                     "staff": [
@@ -112,6 +357,27 @@ def create_shift():
         return jsonify({"message": str(e)}), 500
 
 
+@shifts_bp.route("/bulk", methods=["POST"])
+@jwt_required()
+def bulk_create_shifts():
+    """Create many shifts and assignments in one all-or-nothing request."""
+    data = request.get_json() or {}
+    try:
+        results = bulk_create(
+            data.get("shifts", []),
+            data.get("assignments", []),
+            created_by=get_jwt_identity(),
+            force=data.get("force", False),
+        )
+        return jsonify(results), 201
+    except BulkValidationError as e:
+        db.session.rollback()
+        return jsonify({"message": str(e), **e.results}), 400
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({"message": str(e)}), 500
+
+
 @shifts_bp.route("/<int:shift_id>/staff", methods=["POST"])
 @jwt_required()
 def assign_staff(shift_id):
@@ -123,44 +389,176 @@ def assign_staff(shift_id):
         if not staff:
             return jsonify({"message": "Staff member not found"}), 404
 
+        status = data.get("status", "pending")
+        if status in ACTIVE_ASSIGNMENT_STATUSES and not data.get("force"):
+            clashes = assignment_conflicts([(shift, staff.id)])
+            if clashes:
+                return conflict_response({staff.username: clashes[0]})
+
         existing = ShiftStaff.query.filter_by(
             shift_id=shift.id, staff_id=staff.id
         ).first()
 
         if existing:
-            existing.status = data.get("status", "pending")
+            existing.status = status
         else:
-            assignment = ShiftStaff(
-                shift=shift, staff=staff, status=data.get("status", "pending")
-            )
-            db.session.add(assignment)
+            try:
+                # A concurrent request may insert the same pair first; the
+                # unique constraint rejects ours and we update theirs instead
+                with db.session.begin_nested():
+                    db.session.add(
+                        ShiftStaff(shift_id=shift.id, staff_id=staff.id, status=status)
+                    )
+            except IntegrityError:
+                existing = ShiftStaff.query.filter_by(
+                    shift_id=shift.id, staff_id=staff.id
+                ).one()
+                existing.status = status
 
         db.session.commit()
-        return jsonify({"message": "Staff assignment updated successfully"})
+        notify_roster_changed(
+            shift.date, kind="assignment.updated", shift_ids=[shift.id]
+        )
+
+        response = {"message": "Staff assignment updated successfully"}
+        if status == "cancelled" and data.get("repair"):
+            response["repair"] = repair_shifts([shift.id])
+        return jsonify(response)
+
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({"message": str(e)}), 500
+
+
+@shifts_bp.route("/solve", methods=["POST"])
+@jwt_required()
+def solve_shifts():
+    if get_jwt().get("role") not in ["admin", "manager"]:
+        return jsonify({"message": "Only managers can run the scheduler"}), 403
+
+    data = request.get_json() or {}
+    dry_run = data.get("dryRun", False)
+
+    # Incremental mode: repair only the listed shifts
+    if data.get("shiftIds"):
+        try:
+            return jsonify(repair_shifts(data["shiftIds"], dry_run=dry_run))
+        except Exception as e:
+            db.session.rollback()
+            return jsonify({"message": str(e)}), 500
+
+    if not data.get("start") or not data.get("end"):
+        return jsonify({"message": "Missing start or end date"}), 400
+
+    try:
+        start = datetime.fromisoformat(data["start"]).date()
+        end = datetime.fromisoformat(data["end"]).date()
 
+        # Incremental mode: one baker's availability changed
+        if data.get("staffId"):
+            result = repair_for_availability(
+                data["staffId"], start, end, dry_run=dry_run, refill=True
+            )
+        else:
+            result = solve_roster(start, end, dry_run=dry_run)
+        return jsonify(result)
     except Exception as e:
         db.session.rollback()
         return jsonify({"message": str(e)}), 500
 
 
+@shifts_bp.route("/open-slots", methods=["GET"])
+@jwt_required()
+def get_open_slots():
+    """Understaffed shifts in ``start``..``end``, most urgent first.
+
+    Each comes with up to ``candidates`` free, available bakers to offer it
+    to; see ``rank_open_slots``.
+    """
+    if get_jwt().get("role") not in ["admin", "manager"]:
+        return jsonify({"message": "Only managers can view open slots"}), 403
+
+    try:
+        start = datetime.fromisoformat(request.args["start"]).date()
+        end = datetime.fromisoformat(request.args["end"]).date()
+    except (KeyError, ValueError):
+        return jsonify({"message": "start and end dates are required"}), 400
+    config = current_app.config
+    try:
+        candidates = int(request.args.get("candidates", config["OPEN_SLOT_CANDIDATES"]))
+    except ValueError:
+        return jsonify({"message": "candidates must be an integer"}), 400
+    if not 1 <= candidates <= config["OPEN_SLOT_MAX_CANDIDATES"]:
+        return (
+            jsonify(
+                {
+                    "message": "candidates must be between 1 and "
+                    f"{config['OPEN_SLOT_MAX_CANDIDATES']}"
+                }
+            ),
+            400,
+        )
+
+    return jsonify(rank_open_slots(start, end, candidates))
+
+
+@shifts_bp.route("/payroll", methods=["GET"])
+@jwt_required()
+def export_payroll_route():
+    """Confirmed shifts and hours in ``start``..``end``, streamed for payroll.
+
+    ``format`` is ``csv`` (default) or ``ndjson``; ``summary=true`` gives
+    one row per baker with their total hours instead of one per shift.
+    """
+    if get_jwt().get("role") not in ["admin", "manager"]:
+        return jsonify({"message": "Only managers can export payroll"}), 403
+
+    try:
+        start = datetime.fromisoformat(request.args["start"]).date()
+        end = datetime.fromisoformat(request.args["end"]).date()
+    except (KeyError, ValueError):
+        return jsonify({"message": "start and end dates are required"}), 400
+    fmt = request.args.get("format", "csv")
+    if fmt not in PAYROLL_FORMATS:
+        return jsonify({"message": f"Unsupported format: {fmt}"}), 400
+    summary = request.args.get("summary", "false").lower() in ("1", "true")
+
+    mimetype, chunks = export_payroll(start, end, fmt, summary)
+    name = f"payroll-{start}-{end}{'-summary' if summary else ''}.{fmt}"
+    return current_app.response_class(
+        stream_with_context(chunks),
+        mimetype=mimetype,
+        headers={
+            "Content-Disposition": f'attachment; filename="{name}"',
+            "X-Accel-Buffering": "no",
+        },
+    )
+
+
 @shifts_bp.route("/<int:shift_id>", methods=["PUT"])
 @jwt_required()
 def update_shift(shift_id):
     try:
         shift = Shift.query.get_or_404(shift_id)
         data = request.get_json()
+        old_date = shift.date
+        template_id = None
 
         if "status" in data and data["status"] in SHIFT_STATUSES:
             shift.status = data["status"]
 
         if "date" in data:
             shift.date = datetime.fromisoformat(data["date"]).date()
+            if shift.date != old_date and shift.template_id is not None:
+                # A moved shift is no longer the template's shift for any
+                # day, so it can't clash with one generated for its new date
+                template_id, shift.template_id = shift.template_id, None
 
         if "startTime" in data:
-            shift.start_time = data["startTime"]
+            shift.start_time = parse_time(data["startTime"])
 
         if "endTime" in data:
-            shift.end_time = data["endTime"]
+            shift.end_time = parse_time(data["endTime"])
 
         if "employee" in data:
             employee = User.query.filter_by(username=data["employee"]).first()
@@ -168,13 +566,39 @@ def update_shift(shift_id):
                 return jsonify({"message": "Employee not found"}), 404
             shift.employee_id = employee.id
 
+        if not data.get("force") and ({"date", "startTime", "endTime"} & set(data)):
+            active = [
+                assignment
+                for assignment in shift.staff_assignments
+                if assignment.status in ACTIVE_ASSIGNMENT_STATUSES
+            ]
+            clashes = assignment_conflicts(
+                [(shift, assignment.staff_id) for assignment in active]
+            )
+            if clashes:
+                conflicts = {
+                    active[i].staff.username: ids for i, ids in clashes.items()
+                }
+                db.session.rollback()
+                return conflict_response(conflicts)
+
+        if shift.date != old_date:
+            record_shift_move(shift, old_date)
+            if template_id is not None:
+                exclude_template_date(template_id, old_date)
         db.session.commit()
+        notify_roster_changed(
+            min(old_date, shift.date),
+            max(old_date, shift.date),
+            kind="shift.updated",
+            shift_ids=[shift.id],
+        )
         return jsonify(
             {
                 "id": shift.id,
                 "date": shift.date.isoformat(),
-                "start_time": shift.start_time,
-                "end_time": shift.end_time,
+                "start_time": shift.start_time.isoformat(),
+                "end_time": shift.end_time.isoformat(),
                 "employee": shift.employee.username,
                 "status": shift.status,
             }
@@ -189,8 +613,12 @@ def update_shift(shift_id):
 def delete_shift(shift_id):
     try:
         shift = Shift.query.get_or_404(shift_id)
-        db.session.delete(shift)
+        day = shift.date
+        if shift.template_id is not None:
+            exclude_template_date(shift.template_id, day)
+        delete_shift_with_tombstones(shift)
         db.session.commit()
+        notify_roster_changed(day, kind="shift.deleted", shift_ids=[shift_id])
         return jsonify({"message": "Shift deleted successfully"})
     except Exception as e:
         db.session.rollback()
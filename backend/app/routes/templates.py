@@ -0,0 +1,132 @@
+# backend/app/routes/templates.py
+from flask import Blueprint, jsonify, request
+from flask_jwt_extended import jwt_required, get_jwt, get_jwt_identity
+from datetime import date
+from app.models import Shift, ShiftTemplate
+from app.database import db
+from app.services.templates import expand_templates
+from app.utils.helpers import parse_time
+
+templates_bp = Blueprint("templates", __name__)
+
+
+def template_to_dict(template):
+    return {
+        "id": template.id,
+        "name": template.name,
+        "day_of_week": template.day_of_week,
+        "start_time": template.start_time.isoformat(),
+        "end_time": template.end_time.isoformat(),
+        "required_staff": template.required_staff,
+        "is_active": template.is_active,
+    }
+
+
+def _is_manager():
+    return get_jwt().get("role") in ["admin", "manager"]
+
+
+def _apply_fields(template, data):
+    """Copy request fields onto ``template``; raises ValueError if invalid."""
+    if "name" in data:
+        template.name = data["name"]
+    if "dayOfWeek" in data:
+        if data["dayOfWeek"] not in range(7):
+            raise ValueError("dayOfWeek must be 0 (Monday) to 6 (Sunday)")
+        template.day_of_week = data["dayOfWeek"]
+    if "startTime" in data:
+        template.start_time = parse_time(data["startTime"])
+    if "endTime" in data:
+        template.end_time = parse_time(data["endTime"])
+    if "requiredStaff" in data:
+        template.required_staff = int(data["requiredStaff"])
+    if "isActive" in data:
+        template.is_active = bool(data["isActive"])
+
+    if not (
+        template.name
+        and template.day_of_week is not None
+        and template.start_time
+        and template.end_time
+    ):
+        raise ValueError("Missing name, dayOfWeek, startTime or endTime")
+
+
+@templates_bp.route("", methods=["GET"])
+@jwt_required()
+def get_templates():
+    templates = ShiftTemplate.query.order_by(
+        ShiftTemplate.day_of_week, ShiftTemplate.start_time, ShiftTemplate.id
+    ).all()
+    return jsonify({"templates": [template_to_dict(t) for t in templates]})
+
+
+@templates_bp.route("", methods=["POST"])
+@jwt_required()
+def create_template():
+    if not _is_manager():
+        return jsonify({"message": "Only managers can edit templates"}), 403
+
+    template = ShiftTemplate(employee_id=get_jwt_identity(), required_staff=1)
+    try:
+        _apply_fields(template, request.get_json() or {})
+    except ValueError as e:
+        return jsonify({"message": str(e)}), 400
+
+    db.session.add(template)
+    db.session.commit()
+    return jsonify(template_to_dict(template)), 201
+
+
+@templates_bp.route("/<int:template_id>", methods=["PUT"])
+@jwt_required()
+def update_template(template_id):
+    if not _is_manager():
+        return jsonify({"message": "Only managers can edit templates"}), 403
+
+    template = ShiftTemplate.query.get_or_404(template_id)
+    try:
+        _apply_fields(template, request.get_json() or {})
+    except ValueError as e:
+        db.session.rollback()
+        return jsonify({"message": str(e)}), 400
+
+    db.session.commit()
+    return jsonify(template_to_dict(template))
+
+
+@templates_bp.route("/<int:template_id>", methods=["DELETE"])
+@jwt_required()
+def delete_template(template_id):
+    if not _is_manager():
+        return jsonify({"message": "Only managers can edit templates"}), 403
+
+    template = ShiftTemplate.query.get_or_404(template_id)
+    # Shifts already generated stay on the roster, just detached
+    Shift.query.filter_by(template_id=template.id).update({"template_id": None})
+    db.session.delete(template)
+    db.session.commit()
+    return jsonify({"message": "Template deleted successfully"})
+
+
+@templates_bp.route("/expand", methods=["POST"])
+@jwt_required()
+def expand():
+    if not _is_manager():
+        return jsonify({"message": "Only managers can expand templates"}), 403
+
+    data = request.get_json() or {}
+    try:
+        start = date.fromisoformat(data["start"])
+        end = date.fromisoformat(data["end"])
+    except (KeyError, TypeError, ValueError):
+        return jsonify({"message": "start and end must be YYYY-MM-DD"}), 400
+
+    try:
+        result = expand_templates(
+            start, end, get_jwt_identity(), template_ids=data.get("templateIds")
+        )
+        return jsonify(result), 201
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({"message": str(e)}), 500
@@ -1,9 +1,16 @@
 # backend/app/routes/users.py
-from flask import Blueprint, jsonify, request
-from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt
+from flask import Blueprint, current_app, jsonify, request
+from flask_jwt_extended import jwt_required
 from functools import wraps
 from app.models.user import User
 from app.database import db
+from app.services.user_cache import current_user
+from app.services.user_directory import (
+    DIRECTORY_FIELDS,
+    decode_cursor,
+    directory_page,
+)
+from app.signals import notify_user_changed
 
 users_bp = Blueprint("users", __name__)
 
@@ -27,28 +34,66 @@ def jwt_required_except_options(*args, **kwargs):
 @users_bp.route("/", methods=["GET", "OPTIONS"])  # with trailing slash
 @jwt_required_except_options()
 def get_users():
+    """A page of the user directory, for managers and admins.
+
+    Query parameters: ``limit`` (page size), ``cursor`` (the previous
+    page's ``next_cursor``), ``role``, ``q`` (username or email prefix) and
+    ``fields`` (comma-separated subset of id, username, email, role).
+    """
 
     try:
-        current_user_id = get_jwt_identity()
-        current_user = User.query.get(current_user_id)
-
-        if current_user.role in ["admin", "manager"]:
-            users = User.query.all()
-            user_list = [
-                {
-                    "id": user.id,
-                    "username": user.username,
-                    "email": user.email,
-                    "role": user.role,
-                }
-                for user in users
-            ]
-        else:
-            user_list = []
+        requester = current_user()
+
+        if not (requester and requester.role in ["admin", "manager"]):
+            return jsonify({"users": [], "next_cursor": None})
+
+        config = current_app.config
+        try:
+            limit = int(request.args.get("limit", config["USER_DIRECTORY_PAGE_SIZE"]))
+        except ValueError:
+            return jsonify({"message": "limit must be an integer"}), 400
+        if not 1 <= limit <= config["USER_DIRECTORY_MAX_PAGE_SIZE"]:
+            return (
+                jsonify(
+                    {
+                        "message": "limit must be between 1 and "
+                        f"{config['USER_DIRECTORY_MAX_PAGE_SIZE']}"
+                    }
+                ),
+                400,
+            )
+
+        cursor = None
+        if request.args.get("cursor"):
+            try:
+                cursor = decode_cursor(request.args["cursor"])
+            except ValueError:
+                return jsonify({"message": "Invalid cursor"}), 400
+
+        fields = DIRECTORY_FIELDS
+        if request.args.get("fields"):
+            fields = tuple(field.strip() for field in request.args["fields"].split(","))
+            unknown = set(fields) - set(DIRECTORY_FIELDS)
+            if unknown:
+                return (
+                    jsonify(
+                        {"message": f"Unknown fields: {', '.join(sorted(unknown))}"}
+                    ),
+                    400,
+                )
+
+        user_list, next_cursor = directory_page(
+            limit,
+            cursor=cursor,
+            role=request.args.get("role"),
+            q=request.args.get("q", "").strip(),
+            fields=fields,
+        )
 
         return jsonify(
             {
                 "users": user_list,
+                "next_cursor": next_cursor,
             }
         )
     except Exception as e:
@@ -127,6 +172,7 @@ def update_user(user_id):
         user.role = data["role"]
 
     db.session.commit()
+    notify_user_changed(user_id)
 
     return jsonify(
         {
@@ -144,4 +190,5 @@ def delete_user(user_id):
     user = User.query.get_or_404(user_id)
     db.session.delete(user)
     db.session.commit()
+    notify_user_changed(user_id)
     return jsonify({"message": "User deleted successfully"})
@@ -0,0 +1,231 @@
+# backend/app/services/availability_index.py
+import threading
+from bisect import bisect_left, bisect_right
+from collections import defaultdict, namedtuple
+from datetime import timedelta
+from flask import current_app
+from sqlalchemy import select
+from app.database import db
+from app.models import Availability, AvailabilityGeneration
+from app.utils.helpers import time_to_minutes
+
+AvailabilityEntry = namedtuple(
+    "AvailabilityEntry",
+    [
+        "id",
+        "user_id",
+        "day_of_week",
+        "start_time",
+        "end_time",
+        "start_date",
+        "end_date",
+    ],
+)
+
+DAY_MINUTES = 24 * 60
+
+
+def _minutes_range(start_time, end_time):
+    """Start/end minutes from midnight; an end at or before the start wraps."""
+    start = time_to_minutes(start_time)
+    end = time_to_minutes(end_time)
+    if end <= start:
+        end += DAY_MINUTES
+    return start, end
+
+
+def _entry_columns(query):
+    return query.with_entities(
+        Availability.id,
+        Availability.user_id,
+        Availability.day_of_week,
+        Availability.start_time,
+        Availability.end_time,
+        Availability.start_date,
+        Availability.end_date,
+    )
+
+
+class AvailabilityIndex:
+    """In-memory interval index over availability windows.
+
+    Windows are bucketed by weekday in tuples sorted by start minute. A
+    window is at most a day long, so a lookup bisects to the windows that
+    open between a day before the shift ends and the shift's start, and
+    only checks their end and date bounds. Windows running past midnight
+    are also looked up from the previous weekday.
+
+    Rows can be added, replaced and removed one at a time; each change
+    builds a new tuple for the weekday it touches. ``copy`` therefore only
+    copies the seven bucket references, and a copy can be changed while
+    readers keep using the original.
+    """
+
+    def __init__(self, entries=()):
+        self._by_day = {}
+        # Where each row sits, for removal; shared with copies, so only the
+        # newest copy may be changed
+        self._locations = {}
+        for entry in entries:
+            self.add(entry)
+
+    @classmethod
+    def from_query(cls, query):
+        """Build an index from an ``Availability`` query."""
+        return cls(AvailabilityEntry(*row) for row in _entry_columns(query))
+
+    def copy(self):
+        """A new index over the same rows, to change and swap in."""
+        index = AvailabilityIndex()
+        index._by_day = dict(self._by_day)
+        index._locations = self._locations
+        return index
+
+    def __len__(self):
+        return sum(len(windows) for windows in self._by_day.values())
+
+    def weekdays(self):
+        """Weekdays some window covers part of, counting after midnight."""
+        days = set()
+        for day, windows in self._by_day.items():
+            if windows:
+                days.add(day)
+            if any(end > DAY_MINUTES for _, end, _, _ in windows):
+                days.add((day + 1) % 7)
+        return days
+
+    def add(self, entry):
+        """Insert ``entry``, replacing any indexed row with the same id."""
+        self.remove(entry.id)
+        start, end = _minutes_range(entry.start_time, entry.end_time)
+        key = (start, end, entry.id)
+        windows = self._by_day.get(entry.day_of_week, ())
+        i = bisect_left(windows, key)
+        self._by_day[entry.day_of_week] = windows[:i] + ((*key, entry),) + windows[i:]
+        self._locations[entry.id] = (entry.day_of_week, key)
+
+    def remove(self, entry_id):
+        location = self._locations.pop(entry_id, None)
+        if location is None:
+            return
+        day, key = location
+        windows = self._by_day[day]
+        i = bisect_left(windows, key)
+        self._by_day[day] = windows[:i] + windows[i + 1 :]
+
+    def _covering(self, weekday, window_day, shift_start, shift_end, user_ids):
+        windows = self._by_day.get(weekday)
+        if not windows:
+            return
+        # Windows last at most a day, so earlier openers end before the shift
+        low = bisect_left(windows, (shift_end - DAY_MINUTES,))
+        high = bisect_right(windows, (shift_start, float("inf")))
+        for _, window_end, _, entry in windows[low:high]:
+            if window_end < shift_end:
+                continue
+            if entry.start_date and window_day < entry.start_date:
+                continue
+            if entry.end_date and window_day > entry.end_date:
+                continue
+            user_ids.add(entry.user_id)
+
+    def available(self, day, start_time, end_time):
+        """Ids of users with a window that covers the whole shift on ``day``.
+
+        Recurring and one-off rows are treated alike: the row must be for
+        the shift's weekday, or for the day before with a window running
+        past midnight, its window must contain the shift, and the date the
+        window opens must fall inside ``start_date``/``end_date`` when they
+        are set.
+        """
+        shift_start, shift_end = _minutes_range(start_time, end_time)
+        user_ids = set()
+        self._covering(day.weekday(), day, shift_start, shift_end, user_ids)
+        # Seen from the previous day, the shift starts a day later
+        self._covering(
+            (day.weekday() - 1) % 7,
+            day - timedelta(days=1),
+            shift_start + DAY_MINUTES,
+            shift_end + DAY_MINUTES,
+            user_ids,
+        )
+        return user_ids
+
+
+class SharedAvailabilityIndex:
+    """Process-wide index that follows the ``availabilities`` table.
+
+    A trigger bumps ``availability_generation`` on every statement that
+    writes the table, from any worker or tool. Each read compares that one
+    row with the generation the index was built at and rebuilds when they
+    differ. This process's own writes are applied incrementally when the
+    counter shows nothing else was written since the index was built.
+
+    Readers get an immutable snapshot: writes change a copy of the index
+    and swap it in, so a lookup never sees a half-applied change.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._index = None
+        self._generation = None
+
+    @staticmethod
+    def _current_generation():
+        return db.session.scalar(
+            select(AvailabilityGeneration.value).where(AvailabilityGeneration.id == 1)
+        )
+
+    def get(self):
+        generation = self._current_generation()
+        with self._lock:
+            if self._index is None or generation != self._generation:
+                # Read after the generation, so a write committed meanwhile
+                # is either in the index or bumps the counter past it
+                self._index = AvailabilityIndex.from_query(Availability.query)
+                self._generation = generation
+            return self._index
+
+    def upsert(self, availability_id):
+        """Reflect a committed insert or update of the row."""
+        row = _entry_columns(Availability.query.filter_by(id=availability_id)).first()
+        if row is None:
+            self.remove(availability_id)
+            return
+        entry = AvailabilityEntry(*row)
+        self._apply(lambda index: index.add(entry))
+
+    def remove(self, availability_id):
+        """Reflect a committed delete."""
+        self._apply(lambda index: index.remove(availability_id))
+
+    def _apply(self, change):
+        # The write was one statement; if anything else was written too,
+        # leave the mismatch for the next read to rebuild on
+        generation = self._current_generation()
+        with self._lock:
+            if self._index is None or generation != self._generation + 1:
+                return
+            index = self._index.copy()
+            change(index)
+            self._index = index
+            self._generation = generation
+
+
+def get_availability_index():
+    """The current app's shared availability index, kept fresh."""
+    shared = current_app.extensions.setdefault(
+        "availability_index", SharedAvailabilityIndex()
+    )
+    return shared.get()
+
+
+def update_availability_index(availability=None, deleted_id=None):
+    """Apply a committed availability write to the shared index."""
+    shared = current_app.extensions.get("availability_index")
+    if shared is None:
+        return
+    if deleted_id is not None:
+        shared.remove(deleted_id)
+    else:
+        shared.upsert(availability.id)
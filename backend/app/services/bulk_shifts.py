@@ -0,0 +1,181 @@
+# backend/app/services/bulk_shifts.py
+from datetime import date
+from sqlalchemy import insert, update
+from app.database import db
+from app.models import Shift, ShiftStaff, User
+from app.services.conflicts import ACTIVE_ASSIGNMENT_STATUSES, assignment_conflicts
+from app.services.coverage import mark_coverage_stale
+from app.signals import notify_roster_changed
+from app.utils.helpers import parse_time
+
+ASSIGNMENT_STATUSES = ("pending", "available", "offered", "confirmed", "cancelled")
+
+
+class BulkValidationError(Exception):
+    """Raised with per-item results when any item in a batch is invalid."""
+
+    def __init__(self, results):
+        super().__init__("One or more items are invalid")
+        self.results = results
+
+
+def _parse_shift(item):
+    """Validate one shift payload; returns (row, errors)."""
+    errors, row = [], {}
+    try:
+        row["date"] = date.fromisoformat(item["date"][:10])
+    except (KeyError, TypeError, ValueError):
+        errors.append("date must be YYYY-MM-DD")
+    for key, field in [("startTime", "start_time"), ("endTime", "end_time")]:
+        try:
+            row[field] = parse_time(item[key])
+        except (KeyError, TypeError, ValueError):
+            errors.append(f"{key} must be HH:MM or HH:MM:SS")
+    required_staff = item.get("requiredStaff", 1)
+    if not isinstance(required_staff, int) or required_staff < 1:
+        errors.append("requiredStaff must be a positive integer")
+    row["required_staff"] = required_staff
+    return row, errors
+
+
+def bulk_create(shift_items, assignment_items, created_by, force=False):
+    """Create many shifts and assignments in one transaction.
+
+    Every item is validated first and all usernames and referenced shifts
+    are resolved with one query each. If anything is invalid (including a
+    double booking, unless ``force``) nothing is written and
+    ``BulkValidationError`` carries the per-item errors. Otherwise shifts
+    and assignments go in as executemany inserts, existing assignments are
+    updated in one executemany, and the per-item results are returned.
+    """
+    usernames = {
+        username for item in shift_items for username in item.get("staff", [])
+    } | {item.get("username") for item in assignment_items}
+    users = {
+        user.username: user
+        for user in User.query.filter(User.username.in_(usernames - {None}))
+    }
+    shift_ids = {item.get("shiftId") for item in assignment_items} - {None}
+    existing_shifts = {
+        shift.id: shift for shift in Shift.query.filter(Shift.id.in_(shift_ids))
+    }
+
+    shift_rows, shift_results = [], []
+    for i, item in enumerate(shift_items):
+        row, errors = _parse_shift(item)
+        item["staff"] = list(dict.fromkeys(item.get("staff", [])))
+        missing = [name for name in item.get("staff", []) if name not in users]
+        if missing:
+            errors.append(f"Unknown staff: {', '.join(missing)}")
+        shift_rows.append(row)
+        shift_results.append({"index": i, "errors": errors})
+
+    assignment_results = []
+    for i, item in enumerate(assignment_items):
+        errors = []
+        if item.get("shiftId") not in existing_shifts:
+            errors.append("Shift not found")
+        if item.get("username") not in users:
+            errors.append("Staff member not found")
+        if item.get("status", "pending") not in ASSIGNMENT_STATUSES:
+            errors.append(f"status must be one of {', '.join(ASSIGNMENT_STATUSES)}")
+        assignment_results.append({"index": i, "errors": errors})
+
+    valid = not any(result["errors"] for result in shift_results + assignment_results)
+
+    # Check every new booking against the roster and each other at once
+    if valid and not force:
+        bookings, owners = [], []
+        for i, (item, row) in enumerate(zip(shift_items, shift_rows)):
+            shift = Shift(**row)
+            for username in item.get("staff", []):
+                bookings.append((shift, users[username].id))
+                owners.append((shift_results[i], username))
+        for i, item in enumerate(assignment_items):
+            if item.get("status", "pending") in ACTIVE_ASSIGNMENT_STATUSES:
+                shift = existing_shifts[item["shiftId"]]
+                bookings.append((shift, users[item["username"]].id))
+                owners.append((assignment_results[i], item["username"]))
+
+        for i, overlapping in assignment_conflicts(bookings).items():
+            result, username = owners[i]
+            result["errors"].append(
+                f"{username} already booked on overlapping shift(s) {overlapping}"
+            )
+            valid = False
+
+    if not valid:
+        raise BulkValidationError(
+            {"shifts": shift_results, "assignments": assignment_results}
+        )
+
+    new_ids = []
+    if shift_rows:
+        new_ids = db.session.scalars(
+            insert(Shift).returning(Shift.id, sort_by_parameter_order=True),
+            [dict(row, status="draft", employee_id=created_by) for row in shift_rows],
+        ).all()
+
+    existing_pairs = {}
+    if assignment_items:
+        existing_pairs = {
+            (assignment.shift_id, assignment.staff_id): assignment.id
+            for assignment in ShiftStaff.query.filter(
+                ShiftStaff.shift_id.in_(shift_ids)
+            )
+        }
+
+    inserts, updates = [], []
+    for item, shift_id in zip(shift_items, new_ids):
+        for username in item.get("staff", []):
+            inserts.append(
+                {
+                    "shift_id": shift_id,
+                    "staff_id": users[username].id,
+                    "status": "pending",
+                }
+            )
+
+    assignment_keys, created = {}, []
+    for i, item in enumerate(assignment_items):
+        key = (item["shiftId"], users[item["username"]].id)
+        status = item.get("status", "pending")
+        if key in existing_pairs:
+            updates.append({"id": existing_pairs[key], "status": status})
+            assignment_results[i].update(id=existing_pairs[key], result="updated")
+        elif key in assignment_keys:
+            # Same pair twice in one batch: the later status wins
+            inserts[assignment_keys[key]]["status"] = status
+            assignment_results[i]["result"] = "merged"
+        else:
+            assignment_keys[key] = len(inserts)
+            created.append((len(inserts), assignment_results[i]))
+            inserts.append({"shift_id": key[0], "staff_id": key[1], "status": status})
+            assignment_results[i]["result"] = "created"
+
+    if inserts:
+        inserted_ids = db.session.scalars(
+            insert(ShiftStaff).returning(ShiftStaff.id, sort_by_parameter_order=True),
+            inserts,
+        ).all()
+        for position, result in created:
+            result["id"] = inserted_ids[position]
+    if updates:
+        db.session.execute(update(ShiftStaff), updates)
+    days = [row["date"] for row in shift_rows] + [
+        shift.date for shift in existing_shifts.values()
+    ]
+    mark_coverage_stale(dates=days)
+    db.session.commit()
+
+    if days:
+        notify_roster_changed(
+            min(days),
+            max(days),
+            kind="shifts.bulk",
+            shift_ids=list(new_ids) + list(existing_shifts),
+        )
+
+    for result, shift_id in zip(shift_results, new_ids):
+        result.update(id=shift_id, result="created")
+    return {"shifts": shift_results, "assignments": assignment_results}
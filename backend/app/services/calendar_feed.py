@@ -0,0 +1,193 @@
+# backend/app/services/calendar_feed.py
+import hashlib
+import secrets
+import threading
+from collections import OrderedDict, namedtuple
+from datetime import datetime, timedelta
+from flask import current_app
+from sqlalchemy import func, select
+from app.database import db
+from app.models import Shift, ShiftStaff, User
+from app.utils.helpers import bakery_now, shift_bounds
+
+# A rendered feed and the state of the user's assignments it was built from
+CalendarFeed = namedtuple("CalendarFeed", ["stamp", "etag", "body", "last_modified"])
+
+
+def hash_calendar_token(token):
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def issue_calendar_token(user):
+    """Give ``user`` a new feed token, revoking any earlier one.
+
+    Only the token's hash is stored, so the plain token is returned once
+    here for the subscription URL. The caller commits.
+    """
+    token = secrets.token_urlsafe(32)
+    user.calendar_token_hash = hash_calendar_token(token)
+    return token
+
+
+def _escape(text):
+    return (
+        text.replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\n", "\\n")
+    )
+
+
+def _fold(line):
+    """Split ``line`` into 75-octet pieces as RFC 5545 requires."""
+    pieces, piece, size = [], "", 0
+    for char in line:
+        width = len(char.encode())
+        if size + width > 75:
+            pieces.append(piece)
+            # Continuation lines start with a space, which counts too
+            piece, size = " ", 1
+        piece += char
+        size += width
+    pieces.append(piece)
+    return "\r\n".join(pieces)
+
+
+def _ics_time(value):
+    # Shift times are wall-clock times at the bakery, so "floating" times
+    # (no zone) show at the same hour on any device
+    return value.strftime("%Y%m%dT%H%M%S")
+
+
+def render_calendar(user_id, username, since):
+    """iCalendar text for ``user_id``'s confirmed shifts from ``since`` on.
+
+    Every value comes from the user's own assignments and shifts, so the
+    output only changes when they do; a shift's DTSTAMP is its latest edit.
+    """
+    rows = db.session.execute(
+        select(
+            Shift.id,
+            Shift.date,
+            Shift.start_time,
+            Shift.end_time,
+            func.greatest(Shift.updated_at, ShiftStaff.updated_at),
+        )
+        .join(ShiftStaff, ShiftStaff.shift_id == Shift.id)
+        .where(
+            ShiftStaff.staff_id == user_id,
+            ShiftStaff.status == "confirmed",
+            Shift.status != "cancelled",
+            Shift.date >= since,
+        )
+        .order_by(Shift.date, Shift.start_time, Shift.id)
+    )
+    lines = [
+        "BEGIN:VCALENDAR",
+        "VERSION:2.0",
+        "PRODID:-//BakeryScheduler//Shifts//EN",
+        "CALSCALE:GREGORIAN",
+        f"X-WR-CALNAME:{_escape(username)} shifts",
+    ]
+    for shift_id, day, start_time, end_time, changed_at in rows:
+        starts_at, ends_at = shift_bounds(day, start_time, end_time)
+        lines += [
+            "BEGIN:VEVENT",
+            f"UID:shift-{shift_id}@bakery-scheduler",
+            f"DTSTAMP:{_ics_time(changed_at or starts_at)}Z",
+            f"DTSTART:{_ics_time(starts_at)}",
+            f"DTEND:{_ics_time(ends_at)}",
+            "SUMMARY:Bakery shift",
+            "STATUS:CONFIRMED",
+            "END:VEVENT",
+        ]
+    lines.append("END:VCALENDAR")
+    return "".join(_fold(line) + "\r\n" for line in lines)
+
+
+class CalendarFeedCache:
+    """Rendered ``CalendarFeed`` per user id.
+
+    Entries don't expire: every poll compares the user's assignment stamp
+    with the entry's, which also catches writes made by other workers. The
+    least recently used entry is evicted past ``max_entries``.
+    """
+
+    def __init__(self, max_entries=5000):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id):
+        with self._lock:
+            feed = self._entries.get(user_id)
+            if feed is not None:
+                self._entries.move_to_end(user_id)
+            return feed
+
+    def set(self, user_id, feed):
+        with self._lock:
+            self._entries[user_id] = feed
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+def get_calendar_cache():
+    return current_app.extensions["calendar_cache"]
+
+
+def init_calendar_cache(app):
+    """Attach an empty per-user feed cache to ``app``."""
+    cache = CalendarFeedCache(app.config.get("CALENDAR_FEED_CACHE_MAX_ENTRIES", 5000))
+    app.extensions["calendar_cache"] = cache
+    return cache
+
+
+def calendar_feed(token):
+    """The ``CalendarFeed`` for the user holding ``token``, or ``None``.
+
+    One query resolves the token and stamps the user's assignments (count
+    and latest change of the rows and their shifts). The feed is rendered
+    again only when that stamp, or the day the feed's window starts on,
+    has moved since the cached copy.
+    """
+    row = db.session.execute(
+        select(
+            User.id,
+            User.username,
+            func.count(ShiftStaff.id),
+            func.max(ShiftStaff.updated_at),
+            func.max(Shift.updated_at),
+        )
+        .outerjoin(ShiftStaff, ShiftStaff.staff_id == User.id)
+        .outerjoin(Shift, Shift.id == ShiftStaff.shift_id)
+        .where(User.calendar_token_hash == hash_calendar_token(token))
+        .group_by(User.id)
+    ).first()
+    if row is None:
+        return None
+    user_id, username, *stamp = row
+
+    since = bakery_now().date() - timedelta(
+        days=current_app.config.get("CALENDAR_FEED_PAST_DAYS", 30)
+    )
+    stamp = (username, since, *stamp)
+    cache = get_calendar_cache()
+    cached = cache.get(user_id)
+    if cached is not None and cached.stamp == stamp:
+        return cached
+
+    body = render_calendar(user_id, username, since).encode()
+    etag = hashlib.sha256(body).hexdigest()[:32]
+    if cached is not None and cached.etag == etag:
+        feed = cached._replace(stamp=stamp)
+    else:
+        # HTTP dates have whole seconds; a change within the second the
+        # previous copy was built must still read as newer
+        last_modified = datetime.utcnow().replace(microsecond=0)
+        if cached is not None and last_modified <= cached.last_modified:
+            last_modified = cached.last_modified + timedelta(seconds=1)
+        feed = CalendarFeed(stamp, etag, body, last_modified)
+    cache.set(user_id, feed)
+    return feed
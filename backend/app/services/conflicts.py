@@ -0,0 +1,164 @@
+# backend/app/services/conflicts.py
+import heapq
+from bisect import bisect_left
+from collections import defaultdict
+from datetime import timedelta
+from app.database import db
+from app.models import Shift, ShiftStaff, User
+from app.utils.helpers import shift_bounds
+
+# Assignment statuses that occupy a slot and the baker's time
+ACTIVE_ASSIGNMENT_STATUSES = ("pending", "available", "offered", "confirmed")
+
+
+class BusyCalendar:
+    """Per-baker commitments kept sorted by start time.
+
+    Shifts are never longer than a day, so an overlap check only has to look
+    back through intervals that started within the last 24 hours.
+    """
+
+    def __init__(self):
+        self._intervals = defaultdict(list)
+
+    def add(self, staff_id, start, end, shift_id=None):
+        intervals = self._intervals[staff_id]
+        interval = (start, end, shift_id)
+        intervals.insert(bisect_left(intervals, interval[:2]), interval)
+
+    def overlapping(self, staff_id, start, end, ignore=None):
+        """Shift ids of the baker's commitments that overlap ``start``..``end``.
+
+        Commitments on the ``ignore`` shift (the one being edited) are skipped.
+        """
+        intervals = self._intervals.get(staff_id)
+        if not intervals:
+            return []
+
+        found = []
+        i = bisect_left(intervals, (end,)) - 1
+        horizon = start - timedelta(days=1)
+        while i >= 0 and intervals[i][0] > horizon:
+            shift_id = intervals[i][2]
+            if intervals[i][1] > start and (ignore is None or shift_id != ignore):
+                found.append(shift_id)
+            i -= 1
+        return found
+
+    def is_free(self, staff_id, start, end):
+        return not self.overlapping(staff_id, start, end)
+
+
+def _active_assignments(start, end, staff_ids=None):
+    """Active assignments on shifts dated ``start``..``end``, one query."""
+    query = (
+        db.session.query(
+            ShiftStaff.staff_id,
+            Shift.id,
+            Shift.date,
+            Shift.start_time,
+            Shift.end_time,
+        )
+        .join(Shift, Shift.id == ShiftStaff.shift_id)
+        .filter(
+            ShiftStaff.status.in_(ACTIVE_ASSIGNMENT_STATUSES),
+            Shift.date >= start,
+            Shift.date <= end,
+        )
+    )
+    if staff_ids is not None:
+        query = query.filter(ShiftStaff.staff_id.in_(staff_ids))
+    return query
+
+
+def load_busy_calendar(staff_ids, start, end):
+    """Commitments of ``staff_ids`` overlapping the ``start``..``end`` datetimes.
+
+    The date bounds (widened by a day for overnight shifts) let the
+    (date, start_time) index narrow the scan; the exact overlap test on the
+    shifts' start/end timestamps then runs in SQL as well.
+    """
+    busy = BusyCalendar()
+    rows = _active_assignments(
+        start.date() - timedelta(days=1), end.date(), staff_ids
+    ).filter(Shift.starts_at < end, Shift.ends_at > start)
+    for staff_id, shift_id, day, start_time, end_time in rows:
+        busy.add(staff_id, *shift_bounds(day, start_time, end_time), shift_id)
+    return busy
+
+
+def assignment_conflicts(shifts_and_staff):
+    """Check proposed assignments against existing ones and each other.
+
+    ``shifts_and_staff`` is a list of ``(shift, staff_id)`` pairs; shifts
+    need ``date``, ``start_time`` and ``end_time`` but may be unsaved. The
+    result maps each conflicting pair's index to the overlapping shift ids
+    (``None`` marks a clash with another unsaved shift in the batch).
+    """
+    if not shifts_and_staff:
+        return {}
+
+    bounds = [
+        shift_bounds(shift.date, shift.start_time, shift.end_time)
+        for shift, _ in shifts_and_staff
+    ]
+    staff_ids = {staff_id for _, staff_id in shifts_and_staff}
+    busy = load_busy_calendar(
+        staff_ids, min(start for start, _ in bounds), max(end for _, end in bounds)
+    )
+
+    conflicts = {}
+    for i, ((shift, staff_id), (start, end)) in enumerate(
+        zip(shifts_and_staff, bounds)
+    ):
+        shift_id = getattr(shift, "id", None)
+        overlapping = busy.overlapping(staff_id, start, end, ignore=shift_id)
+        if overlapping:
+            conflicts[i] = overlapping
+        busy.add(staff_id, start, end, shift_id)
+    return conflicts
+
+
+def find_conflicts(start, end):
+    """Every pair of overlapping active assignments on shifts in the range.
+
+    Assignments are sorted per baker by start time and swept once, keeping
+    a heap of the baker's still-running shifts keyed by end time, so the
+    cost is O(n log n) plus the number of clashes reported.
+    """
+    rows = sorted(
+        (
+            (staff_id, *shift_bounds(day, start_time, end_time), shift_id)
+            for staff_id, shift_id, day, start_time, end_time in _active_assignments(
+                start, end
+            )
+        )
+    )
+
+    clashes = []
+    running, current_staff = [], None
+    for staff_id, shift_start, shift_end, shift_id in rows:
+        if staff_id != current_staff:
+            running, current_staff = [], staff_id
+        while running and running[0][0] <= shift_start:
+            heapq.heappop(running)
+        for _, other_id in running:
+            clashes.append((staff_id, other_id, shift_id))
+        heapq.heappush(running, (shift_end, shift_id))
+
+    usernames = {}
+    if clashes:
+        usernames = dict(
+            db.session.query(User.id, User.username).filter(
+                User.id.in_({staff_id for staff_id, _, _ in clashes})
+            )
+        )
+
+    return [
+        {
+            "staff_id": staff_id,
+            "username": usernames.get(staff_id),
+            "shift_ids": [first_id, second_id],
+        }
+        for staff_id, first_id, second_id in clashes
+    ]
@@ -0,0 +1,183 @@
+# backend/app/services/coverage.py
+from itertools import chain
+from sqlalchemy import delete, event, func, insert, inspect, or_, select, text, update
+from app.database import RoutingSession, db
+from app.models import Shift, ShiftCoverage, ShiftStaff
+
+# Days (and shifts whose days) the open transaction has changed, kept in
+# ``session.info`` until the commit recomputes them
+STALE_DATES = "coverage_stale_dates"
+STALE_SHIFT_IDS = "coverage_stale_shift_ids"
+
+
+def mark_coverage_stale(dates=(), shift_ids=(), session=None):
+    """Have the current transaction recompute coverage for these days.
+
+    ORM changes to shifts and assignments are tracked automatically; code
+    writing them with bulk ``insert``/``update`` statements reports here
+    what it touched.
+    """
+    info = (session or db.session).info
+    info.setdefault(STALE_DATES, set()).update(dates)
+    info.setdefault(STALE_SHIFT_IDS, set()).update(shift_ids)
+
+
+def coverage_query(dates):
+    """Per-day totals for ``dates``, computed from the shifts themselves."""
+    confirmed = func.count(ShiftStaff.id).filter(ShiftStaff.status == "confirmed")
+    per_shift = (
+        select(Shift.date, Shift.required_staff, confirmed.label("confirmed"))
+        .outerjoin(ShiftStaff, ShiftStaff.shift_id == Shift.id)
+        .where(Shift.status != "cancelled")
+        .group_by(Shift.id)
+    )
+    if dates is not None:
+        per_shift = per_shift.where(Shift.date.in_(dates))
+    per_shift = per_shift.subquery()
+
+    shortfall = per_shift.c.required_staff - per_shift.c.confirmed
+    return select(
+        per_shift.c.date,
+        func.count(),
+        func.sum(per_shift.c.required_staff),
+        func.sum(per_shift.c.confirmed),
+        func.sum(func.greatest(shortfall, 0)),
+        func.count().filter(shortfall > 0),
+        func.timezone("UTC", func.now()),
+    ).group_by(per_shift.c.date)
+
+
+def _lock_days(session, dates):
+    # In day order, so two transactions never wait on each other's locks
+    session.execute(
+        text(
+            "SELECT pg_advisory_xact_lock(hashtext('shift_coverage'), day) "
+            "FROM unnest(CAST(:days AS integer[])) AS day"
+        ),
+        {"days": [day.toordinal() for day in sorted(dates)]},
+    )
+
+
+def _recount_confirmed(session, dates, shift_ids):
+    confirmed = (
+        select(func.count(ShiftStaff.id))
+        .where(ShiftStaff.shift_id == Shift.id, ShiftStaff.status == "confirmed")
+        .scalar_subquery()
+    )
+    session.execute(
+        update(Shift)
+        .where(
+            or_(Shift.date.in_(dates), Shift.id.in_(shift_ids)),
+            Shift.confirmed_staff_count != confirmed,
+        )
+        # A recount isn't an edit of the shift; keep its sync timestamp
+        .values(confirmed_staff_count=confirmed, updated_at=Shift.updated_at)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def refresh_coverage(dates=(), shift_ids=(), session=None):
+    """Recount confirmed staff on the touched shifts and their days' totals.
+
+    Covers the shifts in ``shift_ids`` and every shift on ``dates`` or on
+    those shifts' days, then replaces the ``shift_coverage`` rows for all
+    of the days. Refreshes of a day are serialized with a transaction-scoped
+    advisory lock. Under READ COMMITTED each one therefore reads the
+    assignments after the previous one committed, so concurrent writers
+    can't leave a count or a day's totals missing one of them.
+    """
+    session = session or db.session
+    dates, shift_ids, locked = set(dates), set(shift_ids), set()
+    while True:
+        # Re-read once locked: a shift may have moved day while we waited
+        if shift_ids:
+            dates.update(
+                session.scalars(
+                    select(Shift.date).where(Shift.id.in_(shift_ids)).distinct()
+                )
+            )
+        if dates <= locked:
+            break
+        _lock_days(session, dates - locked)
+        locked |= dates
+    if not locked:
+        return
+
+    _recount_confirmed(session, locked, shift_ids)
+    session.execute(delete(ShiftCoverage).where(ShiftCoverage.date.in_(locked)))
+    session.execute(
+        insert(ShiftCoverage).from_select(
+            [
+                ShiftCoverage.date,
+                ShiftCoverage.shift_count,
+                ShiftCoverage.required_staff,
+                ShiftCoverage.confirmed_staff,
+                ShiftCoverage.open_slots,
+                ShiftCoverage.understaffed_shifts,
+                ShiftCoverage.updated_at,
+            ],
+            coverage_query(locked),
+        )
+    )
+
+
+def rebuild_coverage(start=None, end=None, batch_days=92):
+    """Recompute every day in ``start``..``end`` (all days if omitted).
+
+    Recounts the shifts' confirmed staff too. For backfills and repairs;
+    commits after each batch of days.
+    """
+    days = select(Shift.date).union(select(ShiftCoverage.date)).subquery()
+    query = select(days.c.date).order_by(days.c.date)
+    if start is not None:
+        query = query.where(days.c.date >= start)
+    if end is not None:
+        query = query.where(days.c.date <= end)
+    dates = db.session.scalars(query).all()
+    for offset in range(0, len(dates), batch_days):
+        refresh_coverage(dates[offset : offset + batch_days])
+        db.session.commit()
+    return len(dates)
+
+
+def _track_changes(session, flush_context, instances):
+    dates = session.info.setdefault(STALE_DATES, set())
+    shift_ids = session.info.setdefault(STALE_SHIFT_IDS, set())
+    for obj in chain(session.new, session.dirty, session.deleted):
+        if isinstance(obj, Shift):
+            dates.add(obj.date)
+            # A shift moved to another day leaves the old one stale too
+            dates.update(inspect(obj).attrs.date.history.deleted)
+        elif isinstance(obj, ShiftStaff):
+            if obj.shift_id is not None:
+                shift_ids.add(obj.shift_id)
+            elif obj.shift is not None:
+                dates.add(obj.shift.date)
+            shift_ids.update(inspect(obj).attrs.shift_id.history.deleted)
+    dates.discard(None)
+    shift_ids.discard(None)
+
+
+def _refresh_before_commit(session):
+    session.flush()
+    refresh_coverage(
+        session.info.pop(STALE_DATES, ()),
+        session.info.pop(STALE_SHIFT_IDS, ()),
+        session,
+    )
+
+
+def _forget_changes(session):
+    session.info.pop(STALE_DATES, None)
+    session.info.pop(STALE_SHIFT_IDS, None)
+
+
+def init_coverage(app):
+    """Keep ``shift_coverage`` in step with every session's roster writes."""
+    for name, listener in [
+        ("before_flush", _track_changes),
+        ("before_commit", _refresh_before_commit),
+        ("after_rollback", _forget_changes),
+    ]:
+        if not event.contains(RoutingSession, name, listener):
+            event.listen(RoutingSession, name, listener)
@@ -0,0 +1,135 @@
+# backend/app/services/passwords.py
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from flask import current_app, has_app_context, jsonify
+from werkzeug.security import (
+    DEFAULT_PBKDF2_ITERATIONS,
+    check_password_hash,
+    generate_password_hash,
+)
+
+
+class HasherBusy(Exception):
+    """Raised when too many passwords are already waiting to be hashed."""
+
+
+def normalize_method(method):
+    """``method`` with werkzeug's defaults filled in, as stored in hashes."""
+    name, *params = method.split(":")
+    if name == "scrypt" and not params:
+        return "scrypt:32768:8:1"
+    if name == "pbkdf2" and len(params) < 2:
+        digest = params[0] if params else "sha256"
+        return f"pbkdf2:{digest}:{DEFAULT_PBKDF2_ITERATIONS}"
+    return method
+
+
+class PasswordHasher:
+    """Hashes and checks passwords on a bounded pool of processes.
+
+    Key derivation is deliberately slow and CPU bound. Running it in a
+    pool keeps it off the request threads' GIL and caps how many CPUs
+    logins can take at once: ``workers`` hash in parallel, at most
+    ``max_pending`` requests are queued or hashing, and callers that can't
+    get a slot within ``timeout`` seconds get ``HasherBusy`` instead of
+    queueing without bound. Once admitted, a caller waits for its result
+    however long the pool takes to start. ``workers=0`` hashes inline. The
+    pool starts on first use in each process, so forking servers don't
+    share one.
+    """
+
+    def __init__(self, method="scrypt", workers=2, max_pending=64, timeout=10):
+        self.method = normalize_method(method)
+        self.workers = workers
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._executor = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def _pool(self):
+        with self._lock:
+            if self._executor is None or self._pid != os.getpid():
+                # Spawned, not forked: the parent holds threads and sockets
+                self._executor = ProcessPoolExecutor(
+                    self.workers, mp_context=multiprocessing.get_context("spawn")
+                )
+                self._pid = os.getpid()
+            return self._executor
+
+    def _run(self, fn, *args):
+        if not self.workers:
+            return fn(*args)
+        if not self._slots.acquire(timeout=self.timeout):
+            raise HasherBusy("Too many logins at once, try again shortly")
+        try:
+            future = self._pool().submit(fn, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+        # The slot is held until the job finishes, not until this caller
+        # stops waiting, so max_pending bounds the work in the pool
+        future.add_done_callback(lambda _: self._slots.release())
+        try:
+            return future.result()
+        except BrokenProcessPool:
+            # A worker died; start a fresh pool for the next caller
+            with self._lock:
+                self._executor = None
+            raise
+
+    def hash(self, password):
+        return self._run(generate_password_hash, password, self.method)
+
+    def verify(self, password_hash, password):
+        return self._run(check_password_hash, password_hash, password)
+
+    def needs_rehash(self, password_hash):
+        """Whether ``password_hash`` was made with other cost parameters."""
+        return password_hash.split("$", 1)[0] != self.method
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
+
+
+def get_password_hasher():
+    if has_app_context():
+        return current_app.extensions.get("password_hasher")
+    return None
+
+
+def hash_password(password):
+    hasher = get_password_hasher()
+    if hasher is None:
+        return generate_password_hash(password)
+    return hasher.hash(password)
+
+
+def verify_password(password_hash, password):
+    hasher = get_password_hasher()
+    if hasher is None:
+        return check_password_hash(password_hash, password)
+    return hasher.verify(password_hash, password)
+
+
+def init_password_hasher(app):
+    """Attach a hasher configured by the ``PASSWORD_HASH_*`` settings."""
+    hasher = PasswordHasher(
+        method=app.config.get("PASSWORD_HASH_METHOD", "scrypt"),
+        workers=app.config.get("PASSWORD_HASH_WORKERS", 2),
+        max_pending=app.config.get("PASSWORD_HASH_MAX_PENDING", 64),
+        timeout=app.config.get("PASSWORD_HASH_TIMEOUT", 10),
+    )
+    app.extensions["password_hasher"] = hasher
+
+    @app.errorhandler(HasherBusy)
+    def hasher_busy(e):
+        return jsonify({"message": str(e)}), 503, {"Retry-After": "1"}
+
+    return hasher
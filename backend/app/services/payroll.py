@@ -0,0 +1,125 @@
+# backend/app/services/payroll.py
+import csv
+import io
+import json
+from datetime import date, time
+from decimal import Decimal
+from flask import current_app
+from sqlalchemy import cast, func, select
+from app.database import db
+from app.models import Shift, ShiftStaff, User
+
+DETAIL_COLUMNS = (
+    "staff_id",
+    "username",
+    "email",
+    "shift_id",
+    "date",
+    "start_time",
+    "end_time",
+    "hours",
+)
+SUMMARY_COLUMNS = ("staff_id", "username", "email", "shifts", "hours")
+
+
+def _hours():
+    # ends_at already moves overnight shifts' end to the next day
+    return cast(
+        func.extract("epoch", Shift.ends_at - Shift.starts_at) / 3600,
+        db.Numeric(8, 2),
+    )
+
+
+def payroll_query(start, end, summary=False):
+    """Confirmed assignments on shifts dated ``start``..``end``.
+
+    One row per assignment, ordered by baker and then shift start, or with
+    ``summary`` one row per baker with their shift count and total hours.
+    """
+    if summary:
+        columns = [func.count(ShiftStaff.id), func.sum(_hours())]
+    else:
+        columns = [Shift.id, Shift.date, Shift.start_time, Shift.end_time, _hours()]
+    query = (
+        select(User.id, User.username, User.email, *columns)
+        .select_from(ShiftStaff)
+        .join(Shift, Shift.id == ShiftStaff.shift_id)
+        .join(User, User.id == ShiftStaff.staff_id)
+        .where(
+            ShiftStaff.status == "confirmed",
+            Shift.date >= start,
+            Shift.date <= end,
+        )
+    )
+    if summary:
+        return query.group_by(User.id, User.username, User.email).order_by(User.id)
+    return query.order_by(User.id, Shift.date, Shift.start_time, Shift.id)
+
+
+def payroll_rows(start, end, summary=False, batch_size=None):
+    """Yield payroll rows as tuples, a batch at a time.
+
+    ``yield_per`` runs the query on a server-side cursor, so only one
+    batch of rows is held in memory however long the period is.
+    """
+    batch_size = batch_size or current_app.config.get("PAYROLL_EXPORT_BATCH_SIZE", 2000)
+    result = db.session.execute(
+        payroll_query(start, end, summary).execution_options(yield_per=batch_size)
+    )
+    try:
+        for partition in result.partitions():
+            yield from partition
+    finally:
+        result.close()
+
+
+def csv_chunks(columns, rows, rows_per_chunk=1000):
+    """Write ``rows`` as CSV with a header, yielding text every few rows."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    for count, row in enumerate(rows, 1):
+        writer.writerow(row)
+        if count % rows_per_chunk == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+def _json_value(value):
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (date, time)):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def ndjson_chunks(columns, rows, rows_per_chunk=1000):
+    """Write ``rows`` as one JSON object per line, yielding every few rows."""
+    lines = []
+    for row in rows:
+        lines.append(json.dumps(dict(zip(columns, row)), default=_json_value))
+        if len(lines) == rows_per_chunk:
+            yield "\n".join(lines) + "\n"
+            lines = []
+    if lines:
+        yield "\n".join(lines) + "\n"
+
+
+# Export formats: mimetype and chunk writer
+PAYROLL_FORMATS = {
+    "csv": ("text/csv", csv_chunks),
+    "ndjson": ("application/x-ndjson", ndjson_chunks),
+}
+
+
+def export_payroll(start, end, fmt="csv", summary=False):
+    """``(mimetype, chunks)`` for a payroll export in ``fmt``.
+
+    ``chunks`` is a generator of text; nothing is queried until it is
+    first iterated.
+    """
+    mimetype, write = PAYROLL_FORMATS[fmt]
+    columns = SUMMARY_COLUMNS if summary else DETAIL_COLUMNS
+    return mimetype, write(columns, payroll_rows(start, end, summary))
@@ -0,0 +1,189 @@
+# backend/app/services/roster_events.py
+import json
+import queue
+import select
+import threading
+import time
+import psycopg2
+from flask import current_app
+from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
+from sqlalchemy import func, select as sql_select
+
+# NOTIFY payloads are capped at 8000 bytes; bigger changes omit the ids and
+# clients resync the date range instead
+MAX_EVENT_SHIFT_IDS = 200
+
+
+class Subscription:
+    """One connected client's bounded event queue.
+
+    A client that falls ``maxsize`` events behind is dropped rather than
+    slowing down the writers: it is sent a ``resync`` event and should
+    reconnect and catch up through the ``since`` cursor.
+    """
+
+    def __init__(self, broker, maxsize):
+        self.broker = broker
+        self.overflowed = False
+        self._queue = queue.Queue(maxsize=maxsize)
+
+    def put(self, event):
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            self.overflowed = True
+            self.broker.drop(self)
+
+    def get(self, timeout):
+        """Next event, or ``None`` if nothing arrived within ``timeout``."""
+        try:
+            return self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+
+class RosterEventBroker:
+    """Fans roster change events out to SSE subscribers in this process.
+
+    Writers publish with ``pg_notify`` on a pooled connection, so events
+    reach every worker process and are only sent for committed changes.
+    Each process runs one listener thread on one dedicated connection;
+    subscribers only wait on in-memory queues and never touch the
+    database. The listener starts with the first subscriber.
+    """
+
+    def __init__(
+        self, engine, channel="roster_changes", queue_size=100, listen_url=None
+    ):
+        self.engine = engine
+        self.listen_url = listen_url
+        self.channel = channel
+        self.queue_size = queue_size
+        self.dropped = 0
+        self._subscribers = set()
+        self._lock = threading.Lock()
+        self._listener = None
+        self._listening = threading.Event()
+
+    def publish(self, event):
+        payload = json.dumps(event)
+        with self.engine.connect().execution_options(
+            isolation_level="AUTOCOMMIT"
+        ) as conn:
+            conn.execute(sql_select(func.pg_notify(self.channel, payload)))
+
+    def subscribe(self):
+        subscription = Subscription(self, self.queue_size)
+        with self._lock:
+            self._subscribers.add(subscription)
+            if self._listener is None:
+                self._listening.clear()
+                self._listener = threading.Thread(
+                    target=self._listen, name="roster-events", daemon=True
+                )
+                self._listener.start()
+        self._listening.wait(timeout=5)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+    def drop(self, subscription):
+        """Unsubscribe a client that fell too far behind."""
+        with self._lock:
+            if subscription in self._subscribers:
+                self._subscribers.discard(subscription)
+                self.dropped += 1
+
+    def subscriber_count(self):
+        with self._lock:
+            return len(self._subscribers)
+
+    def fan_out(self, event):
+        """Queue ``event`` for every subscriber without ever blocking."""
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for subscription in subscribers:
+            subscription.put(event)
+
+    def _listen(self):
+        while True:
+            try:
+                self._listen_once()
+            except Exception:
+                # Events may have been missed while disconnected
+                self.fan_out({"type": "resync"})
+                time.sleep(1)
+            with self._lock:
+                if not self._subscribers:
+                    self._listener = None
+                    return
+
+    def _connect_listener(self):
+        # A transaction-pooling PgBouncer can't hold a LISTEN, so listen on a
+        # direct connection when one is configured
+        if self.listen_url:
+            return psycopg2.connect(self.listen_url)
+        raw = self.engine.raw_connection()
+        raw.detach()
+        return raw.dbapi_connection
+
+    def _listen_once(self):
+        conn = self._connect_listener()
+        try:
+            conn.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
+            with conn.cursor() as cursor:
+                cursor.execute(f'LISTEN "{self.channel}"')
+            self._listening.set()
+
+            while self.subscriber_count():
+                if not select.select([conn], [], [], 5)[0]:
+                    continue
+                conn.poll()
+                while conn.notifies:
+                    self.fan_out(json.loads(conn.notifies.pop(0).payload))
+        finally:
+            self._listening.clear()
+            conn.close()
+
+
+def roster_event(kind, start=None, end=None, shift_ids=None):
+    if shift_ids is not None and len(shift_ids) > MAX_EVENT_SHIFT_IDS:
+        shift_ids = None
+    return {
+        "type": kind,
+        "start": start.isoformat() if start else None,
+        "end": end.isoformat() if end else None,
+        "shift_ids": shift_ids,
+    }
+
+
+def get_roster_events():
+    return current_app.extensions["roster_events"]
+
+
+def init_roster_events(app):
+    """Attach a broker to ``app`` and publish every roster change."""
+    from app.database import db
+    from app.signals import roster_changed
+
+    with app.app_context():
+        engine = db.engine
+    broker = RosterEventBroker(
+        engine,
+        channel=app.config.get("ROSTER_EVENTS_CHANNEL", "roster_changes"),
+        queue_size=app.config.get("SSE_QUEUE_SIZE", 100),
+        listen_url=app.config.get("ROSTER_EVENTS_DATABASE_URI"),
+    )
+    app.extensions["roster_events"] = broker
+
+    def publish(sender, start=None, end=None, kind="roster.changed", shift_ids=None):
+        # The change is already committed; a lost event must not fail the write
+        try:
+            broker.publish(roster_event(kind, start, end, shift_ids))
+        except Exception:
+            app.logger.exception("Could not publish roster event")
+
+    roster_changed.connect(publish, sender=app, weak=False)
+    return broker
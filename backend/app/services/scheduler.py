@@ -0,0 +1,512 @@
+# backend/app/services/scheduler.py
+from collections import defaultdict, deque, namedtuple
+from datetime import datetime, timedelta
+from itertools import islice
+from sqlalchemy import insert
+from app.database import db
+from app.models import Availability, Shift, ShiftStaff, User
+from app.services.availability_index import AvailabilityIndex, get_availability_index
+from app.services.conflicts import ACTIVE_ASSIGNMENT_STATUSES, BusyCalendar
+from app.services.coverage import mark_coverage_stale
+from app.signals import notify_roster_changed
+from app.utils.helpers import bakery_now, shift_bounds
+
+# Shifts in these states are never filled automatically
+CLOSED_SHIFT_STATUSES = ("completed", "cancelled")
+
+# Above this many baker/shift candidate pairs a block is filled greedily
+MAX_BLOCK_EDGES = 200_000
+
+OpenShift = namedtuple("OpenShift", ["id", "start", "end", "open_slots"])
+Commitments = namedtuple("Commitments", ["busy", "load", "on_shift", "active_count"])
+
+
+class RosterSolver:
+    """Assign bakers to open shift slots.
+
+    Shifts sorted by start are cut into blocks: a shift joins the current
+    block while it starts before the block's latest end, so a block is a
+    chain of overlaps, and two shifts in it need not overlap each other.
+    Each block is solved as a bipartite b-matching between bakers and shift
+    slots in which a baker holds at most one slot of the block. That is
+    stricter than the overlaps require but can't double-book anyone. Bakers
+    are offered to the matching in order of hours already worked; because
+    the sets of matchable bakers form a matroid, this greedy order yields a
+    maximum matching that favours the least-loaded bakers.
+
+    Slots the matching could not fill (or blocks too large to match) are
+    then filled greedily, checking each candidate against their actual
+    commitments. This is the only pass that can give a baker a second,
+    non-overlapping shift from the same block.
+    """
+
+    def __init__(self, shifts, eligible, busy, load, max_block_edges=MAX_BLOCK_EDGES):
+        self.shifts = sorted(shifts, key=lambda s: (s.start, s.end, s.id))
+        self.eligible = eligible
+        self.busy = busy
+        self.load = load
+        self.max_block_edges = max_block_edges
+        self.filled = defaultdict(list)
+
+    def solve(self):
+        """Return a list of ``(shift_id, staff_id)`` pairs to create."""
+        for block in self._overlap_blocks():
+            self._match_block(block)
+        self._greedy_fill()
+
+        return [
+            (shift.id, staff_id)
+            for shift in self.shifts
+            for staff_id in self.filled[shift.id]
+        ]
+
+    def unfilled(self):
+        """Map of shift id to the number of slots still open after solving."""
+        return {
+            shift.id: shift.open_slots - len(self.filled[shift.id])
+            for shift in self.shifts
+            if len(self.filled[shift.id]) < shift.open_slots
+        }
+
+    def _overlap_blocks(self):
+        block, block_end = [], None
+        for shift in self.shifts:
+            if shift.open_slots <= 0:
+                continue
+            if block and shift.start >= block_end:
+                yield block
+                block, block_end = [], None
+            block.append(shift)
+            block_end = shift.end if block_end is None else max(block_end, shift.end)
+        if block:
+            yield block
+
+    def _candidates(self, shift):
+        taken = self.filled[shift.id]
+        return [
+            staff_id
+            for staff_id in self.eligible.get(shift.id, ())
+            if staff_id not in taken
+            and self.busy.is_free(staff_id, shift.start, shift.end)
+        ]
+
+    def _match_block(self, block):
+        options = defaultdict(list)
+        edges = 0
+        for shift in block:
+            for staff_id in self._candidates(shift):
+                options[staff_id].append(shift)
+                edges += 1
+        if edges > self.max_block_edges:
+            return
+
+        capacity = {shift.id: shift.open_slots for shift in block}
+        holders = {shift.id: [] for shift in block}
+        slots_left = sum(capacity.values())
+
+        for staff_id in sorted(options, key=lambda sid: (self.load[sid], sid)):
+            if slots_left == 0:
+                break
+            if self._augment(staff_id, options, capacity, holders):
+                slots_left -= 1
+
+        for shift in block:
+            for staff_id in holders[shift.id]:
+                self._assign(shift, staff_id)
+
+    @staticmethod
+    def _augment(staff_id, options, capacity, holders):
+        """Find a shortest alternating path that seats ``staff_id`` (BFS)."""
+        parent = {}
+        queue = deque()
+        for shift in options[staff_id]:
+            parent[shift.id] = (None, staff_id)
+            queue.append(shift.id)
+
+        while queue:
+            shift_id = queue.popleft()
+            if len(holders[shift_id]) < capacity[shift_id]:
+                # Shift everyone one step along the path
+                while shift_id is not None:
+                    previous, mover = parent[shift_id]
+                    if previous is not None:
+                        holders[previous].remove(mover)
+                    holders[shift_id].append(mover)
+                    shift_id = previous
+                return True
+
+            for holder in holders[shift_id]:
+                for shift in options[holder]:
+                    if shift.id not in parent:
+                        parent[shift.id] = (shift_id, holder)
+                        queue.append(shift.id)
+        return False
+
+    def _greedy_fill(self):
+        for shift in self.shifts:
+            missing = shift.open_slots - len(self.filled[shift.id])
+            if missing <= 0:
+                continue
+            # Seating one candidate only makes that baker busy, so the rest
+            # of the list stays valid
+            candidates = sorted(
+                self._candidates(shift), key=lambda sid: (self.load[sid], sid)
+            )
+            for staff_id in candidates[:missing]:
+                self._assign(shift, staff_id)
+
+    def _assign(self, shift, staff_id):
+        self.filled[shift.id].append(staff_id)
+        self.busy.add(staff_id, shift.start, shift.end, shift.id)
+        self.load[staff_id] += (shift.end - shift.start).total_seconds() / 60
+
+
+def _load_commitments(window_start, window_end):
+    """Every assignment around ``window_start``..``window_end``, in one query.
+
+    Commitments are loaded for the window widened by a day, so overnight
+    neighbours block the baker's time. ``busy`` holds the active ones,
+    ``load`` the minutes each baker works inside the window, ``on_shift``
+    everyone with a row on a shift (even a cancelled one) and
+    ``active_count`` each shift's active assignments.
+    """
+    existing = (
+        db.session.query(
+            ShiftStaff.shift_id,
+            ShiftStaff.staff_id,
+            ShiftStaff.status,
+            Shift.date,
+            Shift.start_time,
+            Shift.end_time,
+        )
+        .join(Shift, Shift.id == ShiftStaff.shift_id)
+        .filter(
+            Shift.date >= window_start - timedelta(days=1),
+            Shift.date <= window_end + timedelta(days=1),
+        )
+        .all()
+    )
+
+    busy = BusyCalendar()
+    load = defaultdict(float)
+    on_shift = defaultdict(set)
+    active_count = defaultdict(int)
+    for shift_id, staff_id, assignment_status, day, start_time, end_time in existing:
+        on_shift[shift_id].add(staff_id)
+        if assignment_status not in ACTIVE_ASSIGNMENT_STATUSES:
+            continue
+        active_count[shift_id] += 1
+        shift_start, shift_end = shift_bounds(day, start_time, end_time)
+        busy.add(staff_id, shift_start, shift_end, shift_id)
+        if window_start <= day <= window_end:
+            load[staff_id] += (shift_end - shift_start).total_seconds() / 60
+    return Commitments(busy, load, on_shift, active_count)
+
+
+def _fill(shifts, window_start, window_end, status, dry_run, staff_ids=None):
+    """Solve the open slots on ``shifts`` against commitments in the window.
+
+    Hours worked inside the window drive the load balancing. Existing
+    assignments are never moved: active ones count towards
+    ``required_staff``, and nobody is re-added to a shift they already have
+    a row for (even a cancelled one). ``staff_ids`` limits who is offered.
+    """
+    busy, load, on_shift, active_count = _load_commitments(window_start, window_end)
+
+    bakers = db.session.query(User.id).filter_by(role="baker")
+    index = AvailabilityIndex.from_query(
+        Availability.query.filter(Availability.user_id.in_(bakers.scalar_subquery()))
+    )
+
+    open_shifts = []
+    eligible = {}
+    available_cache = {}
+    for shift in shifts:
+        open_slots = shift.required_staff - active_count[shift.id]
+        if open_slots <= 0:
+            continue
+        key = (shift.date, shift.start_time, shift.end_time)
+        if key not in available_cache:
+            available_cache[key] = index.available(*key)
+        shift_start, shift_end = shift_bounds(*key)
+        open_shifts.append(OpenShift(shift.id, shift_start, shift_end, open_slots))
+        candidates = available_cache[key] - on_shift[shift.id]
+        if staff_ids is not None:
+            candidates &= staff_ids
+        eligible[shift.id] = sorted(candidates)
+
+    solver = RosterSolver(open_shifts, eligible, busy, load)
+    assignments = solver.solve()
+
+    if assignments and not dry_run:
+        db.session.execute(
+            insert(ShiftStaff),
+            [
+                {"shift_id": shift_id, "staff_id": staff_id, "status": status}
+                for shift_id, staff_id in assignments
+            ],
+        )
+        mark_coverage_stale(shift_ids={shift_id for shift_id, _ in assignments})
+    if not dry_run:
+        db.session.commit()
+    if assignments and not dry_run:
+        notify_roster_changed(
+            window_start,
+            window_end,
+            kind="assignments.solved",
+            shift_ids=sorted({shift_id for shift_id, _ in assignments}),
+        )
+
+    return {
+        "assignments": [
+            {"shift_id": shift_id, "staff_id": staff_id, "status": status}
+            for shift_id, staff_id in assignments
+        ],
+        "unfilled": [
+            {"shift_id": shift_id, "missing": missing}
+            for shift_id, missing in solver.unfilled().items()
+        ],
+        "shifts_considered": len(shifts),
+        "dry_run": dry_run,
+    }
+
+
+def _elapsed_ms(started):
+    return round((datetime.utcnow() - started).total_seconds() * 1000, 1)
+
+
+def solve_roster(start, end, status="offered", dry_run=False):
+    """Fill open slots on every shift dated ``start``..``end`` (inclusive)."""
+    started = datetime.utcnow()
+
+    shifts = (
+        Shift.query.filter(
+            Shift.date >= start,
+            Shift.date <= end,
+            Shift.status.notin_(CLOSED_SHIFT_STATUSES),
+        )
+        .order_by(Shift.date, Shift.start_time)
+        .all()
+    )
+
+    result = _fill(shifts, start, end, status, dry_run)
+    result["elapsed_ms"] = _elapsed_ms(started)
+    return result
+
+
+def repair_shifts(
+    shift_ids, status="offered", dry_run=False, cancelled=None, staff_ids=None
+):
+    """Incrementally refill only ``shift_ids`` after a change.
+
+    Only commitments around the affected shifts are loaded and every other
+    assignment is left untouched, so the result lists exactly the rows the
+    repair changed: new ``assignments`` plus any ``cancelled`` by the caller.
+    ``staff_ids`` limits who the slots are offered to.
+    """
+    started = datetime.utcnow()
+
+    shifts = (
+        Shift.query.filter(
+            Shift.id.in_(shift_ids), Shift.status.notin_(CLOSED_SHIFT_STATUSES)
+        )
+        .order_by(Shift.date, Shift.start_time)
+        .all()
+    )
+
+    if shifts:
+        result = _fill(
+            shifts,
+            shifts[0].date,
+            max(s.date for s in shifts),
+            status,
+            dry_run,
+            staff_ids,
+        )
+    else:
+        if not dry_run:
+            db.session.commit()
+        result = {
+            "assignments": [],
+            "unfilled": [],
+            "shifts_considered": 0,
+            "dry_run": dry_run,
+        }
+
+    if cancelled and not dry_run:
+        # Cancelled rows may sit on closed shifts outside the refilled window
+        notify_roster_changed()
+
+    result["cancelled"] = cancelled or []
+    result["elapsed_ms"] = _elapsed_ms(started)
+    return result
+
+
+def repair_for_availability(
+    staff_id, start, end, status="offered", dry_run=False, previous=None, refill=False
+):
+    """Repair the roster after ``staff_id``'s availability changed.
+
+    Unconfirmed assignments the baker's availability no longer covers are
+    cancelled (confirmed ones are kept and reported as ``conflicts`` for a
+    manager to resolve) and the shifts they vacated are refilled. The baker
+    alone is then offered to understaffed shifts their availability newly
+    covers; ``previous`` is the ``AvailabilityIndex`` of their windows
+    before the change (without it every covered shift counts as new).
+
+    ``refill`` also refills every understaffed shift on the baker's
+    available weekdays from all bakers, as a manager's solve would.
+    """
+    index = AvailabilityIndex.from_query(Availability.query.filter_by(user_id=staff_id))
+
+    assignments = (
+        db.session.query(ShiftStaff, Shift)
+        .join(Shift, Shift.id == ShiftStaff.shift_id)
+        .filter(
+            ShiftStaff.staff_id == staff_id,
+            ShiftStaff.status.in_(ACTIVE_ASSIGNMENT_STATUSES),
+            Shift.date >= start,
+            Shift.date <= end,
+        )
+        .all()
+    )
+
+    affected, cancelled, conflicts = set(), [], []
+    for assignment, shift in assignments:
+        if staff_id in index.available(shift.date, shift.start_time, shift.end_time):
+            continue
+        if assignment.status == "confirmed":
+            conflicts.append({"shift_id": shift.id, "staff_id": staff_id})
+            continue
+        if not dry_run:
+            assignment.status = "cancelled"
+        cancelled.append({"shift_id": shift.id, "staff_id": staff_id})
+        affected.add(shift.id)
+
+    # Understaffed shifts on days the baker is now available could use them
+    newly_covered = set()
+    available_days = index.weekdays()
+    if available_days:
+        active = (
+            db.session.query(db.func.count(ShiftStaff.id))
+            .filter(
+                ShiftStaff.shift_id == Shift.id,
+                ShiftStaff.status.in_(ACTIVE_ASSIGNMENT_STATUSES),
+            )
+            .scalar_subquery()
+        )
+        candidates = db.session.query(
+            Shift.id, Shift.date, Shift.start_time, Shift.end_time
+        ).filter(
+            Shift.date >= start,
+            Shift.date <= end,
+            Shift.status.notin_(CLOSED_SHIFT_STATUSES),
+            active < Shift.required_staff,
+        )
+        for shift_id, day, start_time, end_time in candidates:
+            if day.weekday() not in available_days:
+                continue
+            if refill:
+                affected.add(shift_id)
+            elif staff_id in index.available(day, start_time, end_time) and (
+                previous is None
+                or staff_id not in previous.available(day, start_time, end_time)
+            ):
+                newly_covered.add(shift_id)
+
+    result = repair_shifts(sorted(affected), status, dry_run, cancelled=cancelled)
+    newly_covered -= affected
+    if newly_covered:
+        offered = repair_shifts(
+            sorted(newly_covered), status, dry_run, staff_ids={staff_id}
+        )
+        result["assignments"] += offered["assignments"]
+        result["shifts_considered"] += offered["shifts_considered"]
+        result["elapsed_ms"] += offered["elapsed_ms"]
+    result["conflicts"] = conflicts
+    return result
+
+
+def rank_open_slots(start, end, candidates=5, now=None):
+    """Understaffed shifts dated ``start``..``end``, most urgent first.
+
+    A shift is understaffed while its confirmed staff is below
+    ``required_staff``; shifts that have already started by ``now``
+    (``bakery_now()`` unless given) are left out. Urgency is open slots
+    per hour until the shift starts (counting at least one hour), so a gap
+    tomorrow outranks a bigger one next month.
+
+    Each shift lists up to ``candidates`` bakers who are available for it,
+    not already on it and not booked on an overlapping shift, fewest hours
+    in the range first. Suggestions don't reserve anyone, so a baker may
+    be listed on several simultaneous shifts.
+
+    The range costs a fixed handful of queries: the shifts, the assignments
+    around them, the bakers and the availability index's freshness check.
+    """
+    started = datetime.utcnow()
+    if now is None:
+        now = bakery_now()
+
+    shifts = Shift.query.filter(
+        Shift.date >= start,
+        Shift.date <= end,
+        Shift.status.notin_(CLOSED_SHIFT_STATUSES),
+        Shift.confirmed_staff_count < Shift.required_staff,
+        Shift.starts_at >= now,
+    ).all()
+    if not shifts:
+        return {"open_slots": [], "elapsed_ms": _elapsed_ms(started)}
+
+    busy, load, on_shift, _ = _load_commitments(start, end)
+    bakers = dict(db.session.query(User.id, User.username).filter_by(role="baker"))
+    index = get_availability_index()
+
+    ranked = []
+    available_cache = {}
+    for shift in shifts:
+        key = (shift.date, shift.start_time, shift.end_time)
+        if key not in available_cache:
+            # Loads don't change here, so each time slot's pool is sorted once
+            # and a shift only checks bakers until it has enough free ones
+            available_cache[key] = sorted(
+                index.available(*key) & bakers.keys(),
+                key=lambda sid: (load[sid], sid),
+            )
+        shift_start, shift_end = shift_bounds(*key)
+        best = list(
+            islice(
+                (
+                    staff_id
+                    for staff_id in available_cache[key]
+                    if staff_id not in on_shift[shift.id]
+                    and busy.is_free(staff_id, shift_start, shift_end)
+                ),
+                candidates,
+            )
+        )
+        hours_to_start = (shift_start - now).total_seconds() / 3600
+        ranked.append(
+            {
+                "shift_id": shift.id,
+                "date": shift.date.isoformat(),
+                "start": shift_start.isoformat(),
+                "end": shift_end.isoformat(),
+                "required_staff": shift.required_staff,
+                "confirmed_staff": shift.confirmed_staff_count,
+                "open_slots": shift.open_slots,
+                "hours_to_start": round(hours_to_start, 1),
+                "urgency": round(shift.open_slots / max(hours_to_start, 1), 4),
+                "candidates": [
+                    {
+                        "id": staff_id,
+                        "username": bakers[staff_id],
+                        "hours_worked": round(load[staff_id] / 60, 2),
+                    }
+                    for staff_id in best
+                ],
+            }
+        )
+
+    ranked.sort(key=lambda slot: (-slot["urgency"], slot["start"], slot["shift_id"]))
+    return {"open_slots": ranked, "elapsed_ms": _elapsed_ms(started)}
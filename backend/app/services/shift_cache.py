@@ -0,0 +1,98 @@
+# backend/app/services/shift_cache.py
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from flask import current_app
+
+
+class ShiftRangeCache:
+    """Serialized ``GET /api/shifts`` payloads keyed by date range and options.
+
+    Entries hold the JSON body and its strong ETag. Writes invalidate every
+    entry whose range overlaps the changed dates. Each entry also expires
+    after ``ttl`` seconds, which bounds staleness from writes made by other
+    worker processes. The least recently used entry is evicted past
+    ``max_entries``. ``generation`` counts invalidations: a payload built
+    from a read that raced a write is not stored. ``invalidated_at`` is the
+    monotonic time of the last invalidation.
+    """
+
+    def __init__(self, ttl=30, max_entries=256):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.generation = 0
+        self.invalidated_at = None
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def etag_for(body):
+        return hashlib.sha256(body).hexdigest()[:32]
+
+    def get(self, key):
+        """Return ``(etag, body)`` for a fresh entry, or ``None``."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            etag, body, expires_at = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return etag, body
+
+    def set(self, key, body, generation=None):
+        """Store ``body`` and return its ETag.
+
+        Pass the ``generation`` read before querying; if anything was
+        invalidated since, the body may be stale and is not cached.
+        """
+        etag = self.etag_for(body)
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return etag
+            self._entries[key] = (etag, body, time.monotonic() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return etag
+
+    def invalidate(self, start=None, end=None):
+        """Drop entries overlapping ``start``..``end`` (everything if unknown).
+
+        Unbounded listings (no requested range) are always dropped.
+        """
+        with self._lock:
+            self.generation += 1
+            self.invalidated_at = time.monotonic()
+            if start is None:
+                self._entries.clear()
+                return
+            end = end or start
+            for key in list(self._entries):
+                range_start, range_end = key[:2]
+                if range_start is None or (range_start <= end and start <= range_end):
+                    del self._entries[key]
+
+
+def get_shift_cache():
+    return current_app.extensions["shift_cache"]
+
+
+def init_shift_cache(app):
+    """Attach a cache to ``app`` and invalidate it on roster changes."""
+    from app.signals import roster_changed
+
+    cache = ShiftRangeCache(
+        ttl=app.config.get("SHIFT_CACHE_TTL", 30),
+        max_entries=app.config.get("SHIFT_CACHE_MAX_ENTRIES", 256),
+    )
+    app.extensions["shift_cache"] = cache
+
+    def invalidate(sender, start=None, end=None, **kwargs):
+        cache.invalidate(start, end)
+
+    roster_changed.connect(invalidate, sender=app, weak=False)
+    return cache
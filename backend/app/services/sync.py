@@ -0,0 +1,147 @@
+# backend/app/services/sync.py
+from datetime import datetime, timedelta
+from flask import current_app
+from app.database import db
+from app.models import Shift, ShiftStaff, Tombstone
+
+
+class CursorExpired(Exception):
+    """Raised for a cursor older than the tombstones still kept."""
+
+
+def parse_cursor(cursor):
+    """Cursors are opaque to clients; raises ValueError if malformed."""
+    return datetime.fromisoformat(cursor)
+
+
+def new_cursor(read_at, since=None):
+    """Cursor for a read that started at ``read_at``.
+
+    ``updated_at`` is stamped when a row is flushed, not when it commits,
+    so a write in flight during the read may land with an earlier stamp.
+    The cursor is therefore set ``SYNC_CURSOR_OVERLAP`` seconds back and
+    the next sync re-sends anything changed in that window; clients apply
+    changes as upserts, so repeats are harmless.
+
+    The overlap only covers writes that commit within that many seconds of
+    being stamped. A transaction kept open longer (a large bulk import or
+    solve) can commit rows stamped before a cursor already handed out, and
+    those rows are not sent until they change again. Keep the setting above
+    the longest write transaction, or have clients refetch the full range
+    now and then.
+    """
+    overlap = timedelta(seconds=current_app.config.get("SYNC_CURSOR_OVERLAP", 5))
+    cursor = read_at - overlap
+    if since is not None:
+        cursor = max(cursor, since)
+    return cursor.isoformat()
+
+
+def delete_shift_with_tombstones(shift):
+    """Delete ``shift`` and its assignments, leaving tombstones behind.
+
+    The caller commits, so the tombstones land in the same transaction.
+    """
+    deleted_at = datetime.utcnow()
+    for assignment in shift.staff_assignments:
+        db.session.add(
+            Tombstone(
+                entity="shift_staff",
+                entity_id=assignment.id,
+                shift_id=shift.id,
+                shift_date=shift.date,
+                deleted_at=deleted_at,
+            )
+        )
+        db.session.delete(assignment)
+    db.session.add(
+        Tombstone(
+            entity="shift",
+            entity_id=shift.id,
+            shift_id=shift.id,
+            shift_date=shift.date,
+            deleted_at=deleted_at,
+        )
+    )
+    db.session.delete(shift)
+
+
+def record_shift_move(shift, old_date):
+    """Leave a tombstone for ``shift`` on ``old_date`` after changing its date.
+
+    Ranges are filtered on the shift's current date, so a range that held
+    the old date would otherwise never hear the shift left it. The caller
+    commits.
+    """
+    db.session.add(
+        Tombstone(
+            entity="shift",
+            entity_id=shift.id,
+            shift_id=shift.id,
+            shift_date=old_date,
+            deleted_at=datetime.utcnow(),
+        )
+    )
+
+
+def shift_changes(since, start=None, end=None):
+    """What changed in ``start``..``end`` after the ``since`` datetime.
+
+    Returns ``(shift_ids, deleted_shift_ids, deleted_assignment_ids)``.
+    A shift counts as changed when its own row, any of its assignments or
+    a deleted assignment's tombstone is newer than ``since``, so clients
+    can replace the whole shift, staff list included. A shift moved out of
+    the range is listed as deleted; one still in it is listed as changed.
+    """
+    retention = timedelta(
+        days=current_app.config.get("SYNC_TOMBSTONE_RETENTION_DAYS", 30)
+    )
+    if since < datetime.utcnow() - retention:
+        raise CursorExpired("Cursor has expired; fetch the full range again")
+
+    changed_assignments = db.session.query(ShiftStaff.shift_id).filter(
+        ShiftStaff.updated_at > since
+    )
+    deleted_assignments = db.session.query(Tombstone.shift_id).filter(
+        Tombstone.entity == "shift_staff", Tombstone.deleted_at > since
+    )
+    changed = db.session.query(Shift.id).filter(
+        db.or_(
+            Shift.updated_at > since,
+            Shift.id.in_(changed_assignments),
+            Shift.id.in_(deleted_assignments),
+        )
+    )
+    tombstones = db.session.query(Tombstone.entity, Tombstone.entity_id).filter(
+        Tombstone.deleted_at > since
+    )
+    if start and end:
+        changed = changed.filter(Shift.date >= start, Shift.date <= end)
+        tombstones = tombstones.filter(
+            Tombstone.shift_date >= start, Tombstone.shift_date <= end
+        )
+
+    shift_ids = [shift_id for shift_id, in changed]
+    # Seen holds live shifts, whose move tombstones don't apply here, and
+    # ids already listed (a shift moved and then deleted has two)
+    seen = set(shift_ids)
+    deleted = {"shift": [], "shift_staff": []}
+    for entity, entity_id in tombstones.order_by(Tombstone.id):
+        if entity == "shift":
+            if entity_id in seen:
+                continue
+            seen.add(entity_id)
+        deleted[entity].append(entity_id)
+    return shift_ids, deleted["shift"], deleted["shift_staff"]
+
+
+def prune_tombstones():
+    """Delete tombstones past the retention window; returns how many."""
+    retention = timedelta(
+        days=current_app.config.get("SYNC_TOMBSTONE_RETENTION_DAYS", 30)
+    )
+    count = Tombstone.query.filter(
+        Tombstone.deleted_at < datetime.utcnow() - retention
+    ).delete(synchronize_session=False)
+    db.session.commit()
+    return count
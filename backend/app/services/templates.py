@@ -0,0 +1,86 @@
+# backend/app/services/templates.py
+from datetime import timedelta
+from sqlalchemy.dialects.postgresql import insert
+from app.database import db
+from app.models import Shift, ShiftTemplate, TemplateExclusion
+from app.services.coverage import mark_coverage_stale
+from app.signals import notify_roster_changed
+
+
+def template_dates(day_of_week, start, end):
+    """Every date from ``start`` to ``end`` (inclusive) on ``day_of_week``."""
+    day = start + timedelta(days=(day_of_week - start.weekday()) % 7)
+    while day <= end:
+        yield day
+        day += timedelta(days=7)
+
+
+def exclude_template_date(template_id, day):
+    """Keep template ``template_id`` from generating a shift on ``day`` again.
+
+    Called when a generated shift is deleted or moved off ``day``; the
+    caller commits.
+    """
+    db.session.execute(
+        insert(TemplateExclusion)
+        .values(template_id=template_id, date=day)
+        .on_conflict_do_nothing()
+    )
+
+
+def expand_templates(start, end, created_by, template_ids=None):
+    """Create the shifts active templates describe for ``start``..``end``.
+
+    All rows go to the database in one executemany INSERT ... ON CONFLICT
+    DO NOTHING against the (template_id, date) constraint. Re-running for
+    an overlapping range therefore skips days already expanded, including
+    ones a concurrent expansion just wrote. Days a manager deleted or
+    moved a generated shift away from are recorded as exclusions and
+    skipped too.
+    """
+    query = ShiftTemplate.query.filter_by(is_active=True)
+    if template_ids is not None:
+        query = query.filter(ShiftTemplate.id.in_(template_ids))
+    templates = query.all()
+    excluded = {
+        (template_id, day)
+        for template_id, day in db.session.query(
+            TemplateExclusion.template_id, TemplateExclusion.date
+        ).filter(
+            TemplateExclusion.template_id.in_([t.id for t in templates]),
+            TemplateExclusion.date >= start,
+            TemplateExclusion.date <= end,
+        )
+    }
+
+    rows = [
+        {
+            "date": day,
+            "start_time": template.start_time,
+            "end_time": template.end_time,
+            "required_staff": template.required_staff,
+            "status": "draft",
+            "employee_id": created_by,
+            "template_id": template.id,
+        }
+        for template in templates
+        for day in template_dates(template.day_of_week, start, end)
+    ]
+    wanted = [row for row in rows if (row["template_id"], row["date"]) not in excluded]
+
+    created = []
+    if wanted:
+        created = db.session.scalars(
+            insert(Shift)
+            .on_conflict_do_nothing(constraint="uq_shifts_template_id_date")
+            .returning(Shift.id),
+            wanted,
+        ).all()
+        mark_coverage_stale(shift_ids=created)
+    db.session.commit()
+    if created:
+        notify_roster_changed(
+            start, end, kind="templates.expanded", shift_ids=list(created)
+        )
+
+    return {"created": len(created), "skipped": len(rows) - len(created)}
@@ -0,0 +1,98 @@
+# backend/app/services/user_cache.py
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from flask import current_app
+from flask_jwt_extended import get_jwt_identity
+
+# What authorization checks and /api/auth/me need; never a live ORM object,
+# so entries can be shared between requests and threads
+CachedUser = namedtuple("CachedUser", ["id", "username", "email", "role"])
+
+
+class UserCache:
+    """Per-process ``CachedUser`` snapshots keyed by user id.
+
+    Entries expire after ``ttl`` seconds, which bounds how long another
+    worker's update or delete goes unnoticed; this worker drops an entry
+    as soon as the user changes. The least recently used entry is evicted
+    past ``max_entries``.
+    """
+
+    def __init__(self, ttl=60, max_entries=10000):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id):
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            user, expires_at = entry
+            if expires_at < time.monotonic():
+                del self._entries[user_id]
+                return None
+            self._entries.move_to_end(user_id)
+            return user
+
+    def set(self, user):
+        with self._lock:
+            self._entries[user.id] = (user, time.monotonic() + self.ttl)
+            self._entries.move_to_end(user.id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id):
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+
+def get_user_cache():
+    return current_app.extensions["user_cache"]
+
+
+def load_user(user_id):
+    """``CachedUser`` for ``user_id``, or ``None`` if there is no such user."""
+    from app.database import db
+    from app.models.user import User
+    from app.replicas import use_primary
+
+    cache = get_user_cache()
+    user = cache.get(user_id)
+    if user is None:
+        # Entries are shared by every request, so fill them from the primary
+        with use_primary():
+            row = (
+                db.session.query(User.id, User.username, User.email, User.role)
+                .filter(User.id == user_id)
+                .first()
+            )
+        if row is None:
+            return None
+        user = CachedUser(*row)
+        cache.set(user)
+    return user
+
+
+def current_user():
+    """The user the request's JWT belongs to; needs ``jwt_required``."""
+    return load_user(get_jwt_identity())
+
+
+def init_user_cache(app):
+    """Attach a cache to ``app`` and drop users as they change."""
+    from app.signals import user_changed
+
+    cache = UserCache(
+        ttl=app.config.get("USER_CACHE_TTL", 60),
+        max_entries=app.config.get("USER_CACHE_MAX_ENTRIES", 10000),
+    )
+    app.extensions["user_cache"] = cache
+
+    def invalidate(sender, user_id, **kwargs):
+        cache.invalidate(user_id)
+
+    user_changed.connect(invalidate, sender=app, weak=False)
+    return cache
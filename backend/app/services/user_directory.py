@@ -0,0 +1,84 @@
+# backend/app/services/user_directory.py
+import base64
+import json
+from sqlalchemy import func, select, tuple_, union
+from app.database import db
+from app.models import User
+
+# Fields a client may select with ``fields=``
+DIRECTORY_FIELDS = ("id", "username", "email", "role")
+
+
+def _sort_key(column):
+    # Must match the expression of the ix_users_*_lower indexes
+    return func.lower(column).collate("C")
+
+
+def encode_cursor(sort_key, user_id):
+    """Opaque cursor resuming a listing after ``(sort_key, user_id)``."""
+    raw = json.dumps([sort_key, user_id], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor):
+    """Inverse of ``encode_cursor``; raises ValueError if malformed."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        sort_key, user_id = json.loads(raw)
+    except (TypeError, ValueError) as e:
+        raise ValueError("Invalid cursor") from e
+    if not isinstance(sort_key, str) or type(user_id) is not int:
+        raise ValueError("Invalid cursor")
+    return sort_key, user_id
+
+
+def _escape_like(value):
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def directory_page(limit, cursor=None, role=None, q=None, fields=DIRECTORY_FIELDS):
+    """One page of users ordered by case-folded username, then id.
+
+    Pages continue from ``cursor`` with a keyset comparison rather than an
+    OFFSET, so each page costs one index range scan of ``limit`` rows
+    however deep into the directory it is. ``q`` matches a case-insensitive
+    prefix of the username or email. Returns ``(users, next_cursor)``;
+    ``next_cursor`` is ``None`` on the last page.
+    """
+    sort_key = _sort_key(User.username)
+    columns = [getattr(User, field) for field in fields if field != "id"]
+    query = select(sort_key.label("sort_key"), User.id, *columns)
+
+    if role:
+        query = query.where(User.role == role)
+    if cursor is not None:
+        query = query.where(tuple_(sort_key, User.id) > tuple_(*cursor))
+
+    def page(query):
+        # One extra row tells whether there is another page
+        return query.order_by(sort_key, User.id).limit(limit + 1)
+
+    if q:
+        # An OR of the two prefixes could only filter a walk of the whole
+        # index; each prefix alone is an index range, so take a page of
+        # matches for each and merge them
+        pattern = _escape_like(q.lower()) + "%"
+        matches = union(
+            *(
+                page(query.where(_sort_key(column).like(pattern, escape="\\")))
+                for column in (User.username, User.email)
+            )
+        ).subquery()
+        query = (
+            select(matches).order_by(matches.c.sort_key, matches.c.id).limit(limit + 1)
+        )
+    else:
+        query = page(query)
+
+    rows = db.session.execute(query).all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].sort_key, rows[-1].id)
+    users = [{field: getattr(row, field) for field in fields} for row in rows]
+    return users, next_cursor
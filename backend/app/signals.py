@@ -0,0 +1,28 @@
+# backend/app/signals.py
+from blinker import Namespace
+from flask import current_app
+
+_signals = Namespace()
+
+# Sent after a commit that changed shifts or their staff assignments. The
+# ``start``/``end`` dates bound the shifts affected (``None`` means unknown);
+# ``kind`` names the change and ``shift_ids`` lists the shifts when known.
+roster_changed = _signals.signal("roster-changed")
+
+
+def notify_roster_changed(start=None, end=None, kind="roster.changed", shift_ids=None):
+    roster_changed.send(
+        current_app._get_current_object(),
+        start=start,
+        end=end or start,
+        kind=kind,
+        shift_ids=shift_ids,
+    )
+
+
+# Sent after a commit that changed or deleted the user ``user_id``
+user_changed = _signals.signal("user-changed")
+
+
+def notify_user_changed(user_id):
+    user_changed.send(current_app._get_current_object(), user_id=user_id)
@@ -0,0 +1,37 @@
+# backend/app/utils/helpers.py
+from datetime import datetime, time, timedelta
+
+
+def parse_time(value):
+    """Parse an ``HH:MM`` or ``HH:MM:SS`` string (or pass a ``time`` through)."""
+    if isinstance(value, time):
+        return value
+    return time.fromisoformat(value)
+
+
+def time_to_minutes(value):
+    """Minutes since midnight for a time string or ``time``."""
+    parsed = parse_time(value)
+    return parsed.hour * 60 + parsed.minute
+
+
+def shift_bounds(day, start_time, end_time):
+    """Absolute start/end datetimes for a shift on ``day``.
+
+    An end time at or before the start time means the shift runs past
+    midnight, so the end is moved to the following day.
+    """
+    start = datetime.combine(day, parse_time(start_time))
+    end = datetime.combine(day, parse_time(end_time))
+    if end <= start:
+        end += timedelta(days=1)
+    return start, end
+
+
+def bakery_now():
+    """The bakery's current wall-clock time.
+
+    Shift dates and times are stored as naive local times, so "now" is the
+    server's local clock rather than UTC; take today's date from here too.
+    """
+    return datetime.now()
@@ -0,0 +1,42 @@
+# backend/benchmarks/__init__.py
+import time
+from contextlib import contextmanager
+from sqlalchemy import event
+from app import create_app, db
+
+
+@contextmanager
+def bench_app():
+    """Testing app with fresh tables, dropped again afterwards."""
+    app = create_app("testing")
+    with app.app_context():
+        db.create_all()
+        try:
+            yield app
+        finally:
+            db.session.remove()
+            db.drop_all()
+
+
+@contextmanager
+def measure(label):
+    """Print wall time and SQL statement count for the block."""
+    statements = []
+
+    def count(*args):
+        statements.append(1)
+
+    event.listen(db.engine, "before_cursor_execute", count)
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = (time.perf_counter() - started) * 1000
+        event.remove(db.engine, "before_cursor_execute", count)
+        print(f"{label:<28} {elapsed:>10.1f} ms {len(statements):>6} queries")
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of ``values`` (``pct`` from 0 to 100)."""
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
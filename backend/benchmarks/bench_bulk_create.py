@@ -0,0 +1,83 @@
+# backend/benchmarks/bench_bulk_create.py
+"""Compare creating a month of shifts one request at a time with one bulk call.
+
+Runs against the testing database (tables are created and dropped):
+
+    python -m benchmarks.bench_bulk_create --sites 10 --days 30
+"""
+
+import argparse
+from datetime import date, timedelta
+from flask_jwt_extended import create_access_token
+from app import db
+from app.models import User
+from benchmarks import bench_app, measure
+
+SHIFT_TIMES = [("05:00:00", "13:00:00"), ("13:00:00", "21:00:00")]
+
+
+def month_of_shifts(start, sites, days, staff_pairs):
+    """One shift per site and time slot per day, each with two bakers."""
+    shifts = []
+    for offset in range(days):
+        day = (start + timedelta(days=offset)).isoformat()
+        for site in range(sites):
+            for slot, (start_time, end_time) in enumerate(SHIFT_TIMES):
+                shifts.append(
+                    {
+                        "date": day,
+                        "startTime": start_time,
+                        "endTime": end_time,
+                        "requiredStaff": 2,
+                        "staff": staff_pairs[site * len(SHIFT_TIMES) + slot],
+                    }
+                )
+    return shifts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sites", type=int, default=10)
+    parser.add_argument("--days", type=int, default=30)
+    args = parser.parse_args()
+
+    with bench_app() as app:
+        manager = User(
+            username="bench_manager", email="bench@example.com", role="manager"
+        )
+        db.session.add(manager)
+        slots = args.sites * len(SHIFT_TIMES)
+        bakers = [
+            User(username=f"bench_baker_{i}", email=f"bb{i}@example.com", role="baker")
+            for i in range(slots * 2 * 2)
+        ]
+        db.session.add_all(bakers)
+        db.session.commit()
+
+        token = create_access_token(
+            identity=manager.id, additional_claims={"role": "manager"}
+        )
+        headers = {"Authorization": f"Bearer {token}"}
+        client = app.test_client()
+
+        # Separate bakers and months for each run so neither hits conflicts
+        names = [baker.username for baker in bakers]
+        pairs = [names[i : i + 2] for i in range(0, len(names), 2)]
+        single = month_of_shifts(date(2030, 1, 1), args.sites, args.days, pairs[:slots])
+        bulk = month_of_shifts(date(2030, 3, 1), args.sites, args.days, pairs[slots:])
+        print(f"{len(single)} shifts with {2 * len(single)} assignments per run")
+
+        with measure("one request per shift"):
+            for shift in single:
+                response = client.post("/api/shifts", json=shift, headers=headers)
+                assert response.status_code == 201, response.json
+
+        with measure("bulk request"):
+            response = client.post(
+                "/api/shifts/bulk", json={"shifts": bulk}, headers=headers
+            )
+            assert response.status_code == 201, response.json
+
+
+if __name__ == "__main__":
+    main()
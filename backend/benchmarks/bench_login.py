@@ -0,0 +1,154 @@
+# backend/benchmarks/bench_login.py
+"""Login throughput, and what a login storm does to other requests.
+
+Serves the testing app from a threaded server in a child process and has
+``--clients`` threads log in back to back for ``--duration`` seconds
+while one more thread polls ``/api/auth/me``. Runs once hashing inline on
+the request threads and once per ``--workers`` pool size:
+
+    python -m benchmarks.bench_login --clients 32 --workers 2 4
+
+Login latency is bounded by the hashing cost either way; the point of the
+pool is that ``/api/auth/me`` stays fast while logins are queued.
+"""
+
+import argparse
+import http.client
+import json
+import multiprocessing
+import threading
+import time
+from flask_jwt_extended import create_access_token
+from sqlalchemy import insert
+from werkzeug.security import generate_password_hash
+from werkzeug.serving import WSGIRequestHandler, make_server
+from app import create_app, db
+from app.models import User
+from app.services.passwords import PasswordHasher
+from benchmarks import bench_app, percentile
+
+
+class QuietHandler(WSGIRequestHandler):
+    def log_request(self, *args, **kwargs):
+        pass
+
+
+def serve(method, workers, port_queue):
+    app = create_app("testing")
+    hasher = app.extensions["password_hasher"] = PasswordHasher(
+        method=method, workers=workers, max_pending=256, timeout=30
+    )
+    # Start the pool's processes before the clock starts
+    hasher.verify(generate_password_hash("warm-up", "pbkdf2:sha256:1"), "warm-up")
+    server = make_server(
+        "127.0.0.1", 0, app, threaded=True, request_handler=QuietHandler
+    )
+    port_queue.put(server.server_port)
+    server.serve_forever()
+
+
+def client(port, deadline, request, record):
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=60)
+    while time.perf_counter() < deadline:
+        method, path, body, headers = request()
+        started = time.perf_counter()
+        conn.request(method, path, body, headers)
+        response = conn.getresponse()
+        response.read()
+        record(time.perf_counter() - started, response.status)
+    conn.close()
+
+
+def run(args, workers, token):
+    ports = multiprocessing.Queue()
+    # Not a daemon: daemonic processes can't start the hashing pool
+    server = multiprocessing.Process(target=serve, args=(args.method, workers, ports))
+    server.start()
+    port = ports.get(timeout=30)
+
+    logins, probes, statuses = [], [], []
+    lock = threading.Lock()
+    counter = iter(range(10**9))
+
+    def login_request():
+        user = next(counter) % args.users
+        body = json.dumps({"username": f"bench_user_{user}", "password": "secret"})
+        return "POST", "/api/auth/login", body, {"Content-Type": "application/json"}
+
+    def me_request():
+        time.sleep(0.01)
+        return "GET", "/api/auth/me", None, {"Authorization": f"Bearer {token}"}
+
+    def record_login(elapsed, status):
+        with lock:
+            logins.append(elapsed)
+            statuses.append(status)
+
+    def record_probe(elapsed, status):
+        probes.append(elapsed)
+
+    deadline = time.perf_counter() + args.duration
+    threads = [
+        threading.Thread(
+            target=client, args=(port, deadline, login_request, record_login)
+        )
+        for _ in range(args.clients)
+    ] + [
+        threading.Thread(target=client, args=(port, deadline, me_request, record_probe))
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    server.terminate()
+    server.join()
+
+    failed = sum(status != 200 for status in statuses)
+    label = f"pool of {workers}" if workers else "inline"
+    print(
+        f"{label:<12} {len(logins) / args.duration:>9.1f} "
+        f"{percentile(logins, 50) * 1000:>11.1f} {percentile(logins, 99) * 1000:>11.1f} "
+        f"{percentile(probes, 50) * 1000:>9.1f} {percentile(probes, 99) * 1000:>9.1f} "
+        f"{failed:>7}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--clients", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=10)
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--method", default="scrypt")
+    parser.add_argument("--workers", type=int, nargs="+", default=[2, 4])
+    args = parser.parse_args()
+
+    with bench_app():
+        password_hash = generate_password_hash("secret", args.method)
+        db.session.execute(
+            insert(User),
+            [
+                {
+                    "username": f"bench_user_{i}",
+                    "email": f"bench_user_{i}@example.com",
+                    "password_hash": password_hash,
+                    "role": "baker",
+                }
+                for i in range(args.users)
+            ],
+        )
+        db.session.commit()
+        token = create_access_token(
+            identity=db.session.query(User.id).limit(1).scalar(),
+            additional_claims={"role": "baker"},
+        )
+
+        print(
+            f"{'hashing':<12} {'logins/s':>9} {'login p50':>11} {'login p99':>11} "
+            f"{'me p50':>9} {'me p99':>9} {'errors':>7}"
+        )
+        for workers in [0, *args.workers]:
+            run(args, workers, token)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+# backend/benchmarks/bench_open_slots.py
+"""Rank a month of open slots, with candidates, across every site.
+
+The month is solved with confirmations first and then every seventh
+assignment is cancelled, leaving gaps scattered over all days and sites.
+Runs against the testing database (tables are created and dropped):
+
+    python -m benchmarks.bench_open_slots --bakers 300 --sites 30
+"""
+
+import argparse
+from datetime import date, timedelta
+from sqlalchemy import update
+from app import db
+from app.models import ShiftStaff
+from app.services.coverage import rebuild_coverage
+from app.services.scheduler import rank_open_slots, solve_roster
+from benchmarks import bench_app, measure
+from benchmarks.bench_roster_repair import SHIFT_TIMES, seed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--bakers", type=int, default=300)
+    parser.add_argument("--sites", type=int, default=30)
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--candidates", type=int, default=5)
+    args = parser.parse_args()
+
+    with bench_app():
+        start = date(2030, 1, 1)
+        end = start + timedelta(days=args.days - 1)
+        seed(args.bakers, args.sites, args.days, start)
+        solve_roster(start, end, status="confirmed")
+        db.session.execute(
+            update(ShiftStaff).where(ShiftStaff.id % 7 == 0).values(status="cancelled")
+        )
+        db.session.commit()
+        rebuild_coverage(start, end)
+        print(
+            f"{args.bakers} bakers, "
+            f"{args.sites * args.days * len(SHIFT_TIMES)} shifts"
+        )
+
+        for label in ["open slots (cold index)", "open slots"]:
+            with measure(label):
+                result = rank_open_slots(start, end, args.candidates)
+        slots = result["open_slots"]
+        print(
+            f"  {len(slots)} understaffed shifts, "
+            f"{sum(len(slot['candidates']) for slot in slots)} candidates listed"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+# backend/benchmarks/bench_pool.py
+"""Throughput of a worker's connection pool at several pool settings.
+
+``--threads`` request threads each check out a connection, read a week of
+shifts, hold the connection for ``--hold-ms`` more (the rest of a request
+keeps its session open) and give it back, for ``--duration`` seconds per
+setting. Reports requests per second, latency, time spent waiting for a
+connection and pool timeouts:
+
+    python -m benchmarks.bench_pool --threads 32 --duration 5
+
+``--pgbouncer-url`` adds the same runs in PGBOUNCER_MODE against a
+PgBouncer in front of the testing database.
+"""
+
+import argparse
+import random
+import threading
+import time
+from datetime import date, timedelta
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.exc import TimeoutError as PoolTimeout
+from sqlalchemy.orm import Session
+from app import db
+from app.database import configure_engine, engine_options
+from app.models import Shift, User
+from benchmarks import bench_app, percentile
+
+# (label, DB_* overrides) for each run
+SETTINGS = [
+    ("size=2", {"DB_POOL_SIZE": 2, "DB_MAX_OVERFLOW": 0}),
+    ("size=5", {"DB_POOL_SIZE": 5, "DB_MAX_OVERFLOW": 0}),
+    ("size=5 overflow=10", {"DB_POOL_SIZE": 5, "DB_MAX_OVERFLOW": 10}),
+    ("size=20", {"DB_POOL_SIZE": 20, "DB_MAX_OVERFLOW": 0}),
+    (
+        "size=5 overflow=10 pre-ping",
+        {"DB_POOL_SIZE": 5, "DB_MAX_OVERFLOW": 10, "DB_POOL_PRE_PING": True},
+    ),
+    (
+        "size=5 overflow=10 timeout",
+        {
+            "DB_POOL_SIZE": 5,
+            "DB_MAX_OVERFLOW": 10,
+            "DB_STATEMENT_TIMEOUT_MS": 5000,
+        },
+    ),
+]
+FIRST_DAY = date(2030, 1, 1)
+
+
+def seed(days, shifts_per_day):
+    db.session.execute(
+        insert(User),
+        [
+            {
+                "username": "bench_manager",
+                "email": "bench@example.com",
+                "role": "manager",
+            }
+        ],
+    )
+    manager_id = db.session.query(User.id).scalar()
+    db.session.execute(
+        insert(Shift),
+        [
+            {
+                "date": FIRST_DAY + timedelta(days=offset),
+                "start_time": "05:00:00",
+                "end_time": "13:00:00",
+                "required_staff": 3,
+                "status": "published",
+                "employee_id": manager_id,
+            }
+            for offset in range(days)
+            for _ in range(shifts_per_day)
+        ],
+    )
+    db.session.commit()
+
+
+def run(url, config, args):
+    engine = create_engine(url, **engine_options(config))
+    configure_engine(engine, config)
+    latencies, waits = [], []
+    timeouts = [0]
+    lock = threading.Lock()
+    deadline = time.perf_counter() + args.duration
+
+    def worker(seed):
+        rng = random.Random(seed)
+        mine, waited, timed_out = [], [], 0
+        while time.perf_counter() < deadline:
+            start = FIRST_DAY + timedelta(days=rng.randrange(args.days - 6))
+            started = time.perf_counter()
+            try:
+                with Session(engine) as session:
+                    session.connection()
+                    waited.append(time.perf_counter() - started)
+                    session.scalars(
+                        select(Shift).where(
+                            Shift.date.between(start, start + timedelta(days=6))
+                        )
+                    ).all()
+                    time.sleep(args.hold_ms / 1000)
+            except PoolTimeout:
+                timed_out += 1
+                continue
+            mine.append(time.perf_counter() - started)
+        with lock:
+            latencies.extend(mine)
+            waits.extend(waited)
+            timeouts[0] += timed_out
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(args.threads)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    engine.dispose()
+    return latencies, waits, timeouts[0]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--threads", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=5)
+    parser.add_argument("--hold-ms", type=float, default=2)
+    parser.add_argument("--pool-timeout", type=int, default=5)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--shifts-per-day", type=int, default=20)
+    parser.add_argument("--pgbouncer-url", default=None)
+    args = parser.parse_args()
+
+    with bench_app():
+        seed(args.days, args.shifts_per_day)
+        targets = [(db.engine.url, False)]
+        if args.pgbouncer_url:
+            targets.append((args.pgbouncer_url, True))
+
+        print(
+            f"{'setting':<36} {'req/s':>8} {'p50 ms':>8} {'p99 ms':>8} "
+            f"{'wait p99 ms':>12} {'timeouts':>9}"
+        )
+        for url, pgbouncer in targets:
+            for label, overrides in SETTINGS:
+                config = {
+                    "DB_POOL_TIMEOUT": args.pool_timeout,
+                    "DB_APPLICATION_NAME": "bench-pool",
+                    "PGBOUNCER_MODE": pgbouncer,
+                    **overrides,
+                }
+                latencies, waits, timeouts = run(url, config, args)
+                if pgbouncer:
+                    label += " pgbouncer"
+
+                def ms(values, pct):
+                    return percentile(values, pct) * 1000 if values else 0
+
+                print(
+                    f"{label:<36} {len(latencies) / args.duration:>8.1f} "
+                    f"{ms(latencies, 50):>8.2f} {ms(latencies, 99):>8.2f} "
+                    f"{ms(waits, 99):>12.2f} {timeouts:>9}"
+                )
+
+
+if __name__ == "__main__":
+    main()
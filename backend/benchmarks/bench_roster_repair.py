@@ -0,0 +1,112 @@
+# backend/benchmarks/bench_roster_repair.py
+"""Compare a full month solve with an incremental single-shift repair.
+
+Runs against the testing database (tables are created and dropped):
+
+    python -m benchmarks.bench_roster_repair --bakers 300 --sites 30
+"""
+
+import argparse
+from datetime import date, timedelta
+from sqlalchemy import insert
+from app import db
+from app.models import Availability, Shift, ShiftStaff, User
+from app.services.scheduler import repair_shifts, solve_roster
+from benchmarks import bench_app, measure
+
+SHIFT_TIMES = [("05:00:00", "13:00:00"), ("13:00:00", "21:00:00")]
+
+
+def seed(bakers, sites, days, start):
+    db.session.execute(
+        insert(User),
+        [
+            {
+                "username": f"bench_baker_{i}",
+                "email": f"bench_baker_{i}@example.com",
+                "role": "baker",
+            }
+            for i in range(bakers)
+        ]
+        + [
+            {
+                "username": "bench_manager",
+                "email": "bench@example.com",
+                "role": "manager",
+            }
+        ],
+    )
+    manager_id = db.session.query(User.id).filter_by(username="bench_manager").scalar()
+    baker_ids = [
+        user_id for (user_id,) in db.session.query(User.id).filter_by(role="baker")
+    ]
+
+    db.session.execute(
+        insert(Availability),
+        [
+            {
+                "user_id": baker_id,
+                "day_of_week": weekday,
+                "start_time": "04:00:00",
+                "end_time": "22:00:00",
+            }
+            for i, baker_id in enumerate(baker_ids)
+            for weekday in range(7)
+            if (i + weekday) % 3  # everyone takes two days in seven off
+        ],
+    )
+    db.session.execute(
+        insert(Shift),
+        [
+            {
+                "date": start + timedelta(days=offset),
+                "start_time": start_time,
+                "end_time": end_time,
+                "required_staff": 3,
+                "status": "published",
+                "employee_id": manager_id,
+            }
+            for offset in range(days)
+            for _ in range(sites)
+            for start_time, end_time in SHIFT_TIMES
+        ],
+    )
+    db.session.commit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--bakers", type=int, default=300)
+    parser.add_argument("--sites", type=int, default=30)
+    parser.add_argument("--days", type=int, default=30)
+    args = parser.parse_args()
+
+    with bench_app():
+        start = date(2030, 1, 1)
+        end = start + timedelta(days=args.days - 1)
+        seed(args.bakers, args.sites, args.days, start)
+        print(
+            f"{args.bakers} bakers, "
+            f"{args.sites * args.days * len(SHIFT_TIMES)} shifts"
+        )
+
+        with measure("full solve"):
+            result = solve_roster(start, end)
+        print(f"  assigned {len(result['assignments'])} slots")
+
+        # One baker calls in sick mid-month
+        assignment = (
+            ShiftStaff.query.join(Shift)
+            .filter(Shift.date == start + timedelta(days=args.days // 2))
+            .first()
+        )
+        assignment.status = "cancelled"
+        db.session.commit()
+
+        with measure("incremental repair"):
+            result = repair_shifts([assignment.shift_id])
+        print(f"  changed {len(result['assignments'])} assignments")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+# backend/benchmarks/bench_sse.py
+"""Fan roster events out to hundreds of SSE subscribers on one worker.
+
+Serves the app from a threaded server in this process, connects
+``--subscribers`` clients to ``/api/shifts/events`` plus ``--slow`` clients
+that never read, and publishes ``--events`` events through Postgres
+NOTIFY at ``--rate`` per second. Reports publish latency (what a writer pays), delivery latency
+from publish to receipt, and how many slow clients were dropped:
+
+    python -m benchmarks.bench_sse --subscribers 500 --slow 20 --events 400 --rate 20
+"""
+
+import argparse
+import json
+import multiprocessing
+import socket
+import statistics
+import threading
+import time
+from flask_jwt_extended import create_access_token
+from werkzeug.serving import WSGIRequestHandler, make_server
+from app import db
+from app.models import User
+from app.services.roster_events import get_roster_events
+from benchmarks import bench_app, percentile
+
+
+class SmallBufferHandler(WSGIRequestHandler):
+    """Small send buffers make clients that stop reading back up quickly."""
+
+    def setup(self):
+        super().setup()
+        self.connection.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, 8192)
+
+    def log_request(self, *args, **kwargs):
+        pass
+
+
+def open_stream(port, token, rcvbuf=None):
+    sock = socket.socket()
+    if rcvbuf:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, rcvbuf)
+    sock.connect(("127.0.0.1", port))
+    sock.sendall(
+        f"GET /api/shifts/events?jwt={token} HTTP/1.1\r\n"
+        f"Host: localhost\r\n\r\n".encode()
+    )
+    return sock
+
+
+def read_events(sock, expected, latencies, done):
+    """Collect delivery latencies until ``expected`` events have arrived."""
+    buffer, received = b"", 0
+    while received < expected:
+        chunk = sock.recv(65536)
+        if not chunk:
+            break
+        buffer += chunk
+        *messages, buffer = buffer.split(b"\n\n")
+        now = time.time()
+        for message in messages:
+            if b"event: roster" in message:
+                event = json.loads(message.split(b"data: ", 1)[1])
+                latencies.append(now - event["sent"])
+                received += 1
+    done.append(received)
+    sock.close()
+
+
+def run_clients(port, token, subscribers, slow, events, results):
+    """Subscribers run in their own process so they don't share the GIL."""
+    latencies, done, readers = [], [], []
+    for _ in range(subscribers):
+        reader = threading.Thread(
+            target=read_events,
+            args=(open_stream(port, token), events, latencies, done),
+            daemon=True,
+        )
+        reader.start()
+        readers.append(reader)
+    stalled = [open_stream(port, token, rcvbuf=1024) for _ in range(slow)]
+
+    for reader in readers:
+        reader.join(timeout=120)
+    results.put((latencies, sum(done)))
+    for sock in stalled:
+        sock.close()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--subscribers", type=int, default=500)
+    parser.add_argument("--slow", type=int, default=20)
+    parser.add_argument("--events", type=int, default=400)
+    parser.add_argument("--rate", type=int, default=20)
+    parser.add_argument("--queue-size", type=int, default=100)
+    args = parser.parse_args()
+
+    with bench_app() as app:
+        manager = User(
+            username="bench_manager", email="bench@example.com", role="manager"
+        )
+        db.session.add(manager)
+        db.session.commit()
+        token = create_access_token(
+            identity=manager.id, additional_claims={"role": "manager"}
+        )
+
+        broker = get_roster_events()
+        broker.queue_size = args.queue_size
+        server = make_server(
+            "127.0.0.1", 0, app, threaded=True, request_handler=SmallBufferHandler
+        )
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+
+        results = multiprocessing.Queue()
+        clients = multiprocessing.Process(
+            target=run_clients,
+            args=(
+                server.server_port,
+                token,
+                args.subscribers,
+                args.slow,
+                args.events,
+                results,
+            ),
+        )
+        clients.start()
+
+        deadline = time.time() + 30
+        while broker.subscriber_count() < args.subscribers + args.slow:
+            if time.time() > deadline:
+                raise SystemExit("Subscribers did not connect in time")
+            time.sleep(0.05)
+        print(f"{broker.subscriber_count()} subscribers connected")
+
+        publish_times = []
+        started = time.perf_counter()
+        for i in range(args.events):
+            sent = time.perf_counter()
+            broker.publish({"type": "bench", "shift_ids": [i], "sent": time.time()})
+            publish_times.append(time.perf_counter() - sent)
+            time.sleep(max(0, started + (i + 1) / args.rate - time.perf_counter()))
+        publish_elapsed = time.perf_counter() - started
+
+        latencies, delivered = results.get(timeout=180)
+        clients.join()
+
+        def ms(seconds):
+            return f"{seconds * 1000:.2f} ms"
+
+        print(
+            f"published {args.events} events in {publish_elapsed:.2f}s; "
+            f"publish p50 {ms(statistics.median(publish_times))} "
+            f"p99 {ms(percentile(publish_times, 99))}"
+        )
+        print(
+            f"delivered {delivered}/{args.subscribers * args.events} events; "
+            f"latency p50 {ms(percentile(latencies, 50))} "
+            f"p95 {ms(percentile(latencies, 95))} "
+            f"p99 {ms(percentile(latencies, 99))}"
+        )
+        print(f"slow clients dropped: {broker.dropped}/{args.slow}")
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+# backend/benchmarks/bench_user_directory.py
+"""User directory page latency as the users table grows.
+
+Grows the table to each ``--sizes`` step and times ``GET /api/users``
+pages: the first page, a page deep into the directory reached through its
+cursor, a role-filtered page and a prefix search. For contrast it also
+times fetching the same deep page with LIMIT/OFFSET, which is what the
+directory avoids:
+
+    python -m benchmarks.bench_user_directory --sizes 1000 10000 100000
+
+Keyset pages should cost about the same at every size; the OFFSET column
+grows with the table.
+"""
+
+import argparse
+import time
+from flask_jwt_extended import create_access_token
+from sqlalchemy import insert, select, text
+from app import db
+from app.models import User
+from app.services.user_directory import _sort_key, encode_cursor
+from benchmarks import bench_app, percentile
+
+ROLES = ["baker"] * 8 + ["manager", "admin"]
+
+
+def grow(start, stop):
+    for offset in range(start, stop, 10000):
+        db.session.execute(
+            insert(User),
+            [
+                {
+                    "username": f"Staff_{(i * 7919) % 1000003:07d}_{i}",
+                    "email": f"staff_{i}@example.com",
+                    "role": ROLES[i % len(ROLES)],
+                }
+                for i in range(offset, min(stop, offset + 10000))
+            ],
+        )
+    db.session.commit()
+    db.session.execute(text("ANALYZE users"))
+    db.session.commit()
+
+
+def timed(client, headers, query, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        response = client.get("/api/users", query_string=query, headers=headers)
+        timings.append(time.perf_counter() - started)
+        assert response.status_code == 200, response.json
+    return timings
+
+
+def offset_page(offset, limit, repeat):
+    sort_key = _sort_key(User.username)
+    query = (
+        select(User.id, User.username, User.email, User.role)
+        .order_by(sort_key, User.id)
+        .offset(offset)
+        .limit(limit)
+    )
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        db.session.execute(query).all()
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--limit", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    with bench_app() as app:
+        manager = User(username="bench_manager", email="bench@example.com")
+        manager.role = "manager"
+        db.session.add(manager)
+        db.session.commit()
+        headers = {
+            "Authorization": "Bearer "
+            + create_access_token(
+                identity=manager.id, additional_claims={"role": "manager"}
+            )
+        }
+        client = app.test_client()
+
+        print(
+            f"{'users':>8} {'first p50':>10} {'deep p50':>10} {'role p50':>10} "
+            f"{'search p50':>11} {'deep p99':>10} {'offset p50':>11}  (ms)"
+        )
+        size = 0
+        for target in args.sizes:
+            grow(size, target)
+            size = target
+            # Resume from 90% of the way through the directory
+            depth = size * 9 // 10
+            sort_key, user_id = db.session.execute(
+                select(_sort_key(User.username), User.id)
+                .order_by(_sort_key(User.username), User.id)
+                .offset(depth)
+                .limit(1)
+            ).one()
+            deep = {"limit": args.limit, "cursor": encode_cursor(sort_key, user_id)}
+
+            first = timed(client, headers, {"limit": args.limit}, args.repeat)
+            deep_timings = timed(client, headers, deep, args.repeat)
+            role = timed(client, headers, {**deep, "role": "manager"}, args.repeat)
+            search = timed(
+                client, headers, {"limit": args.limit, "q": "staff_05"}, args.repeat
+            )
+            offset = offset_page(depth, args.limit, args.repeat)
+            print(
+                f"{size:>8} {percentile(first, 50) * 1000:>10.2f} "
+                f"{percentile(deep_timings, 50) * 1000:>10.2f} "
+                f"{percentile(role, 50) * 1000:>10.2f} "
+                f"{percentile(search, 50) * 1000:>11.2f} "
+                f"{percentile(deep_timings, 99) * 1000:>10.2f} "
+                f"{percentile(offset, 50) * 1000:>11.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,328 @@
+# backend/benchmarks/generate_data.py
+"""Fill a database with a large synthetic bakery.
+
+Creates managers, bakers with weekly availability, and years of shifts
+with dense assignments, streaming every table through COPY so millions
+of rows load in seconds. Every generated user shares ``--password``,
+so the load test can log in as any of them. Writes to the database of
+``--config`` (run the migrations first):
+
+    python -m benchmarks.generate_data --bakers 3000 --years 3 --shifts-per-day 60
+
+``--truncate`` empties the scheduling tables (and users) first. Without
+it, rows are appended after the current maximum ids. Secondary indexes
+and constraints are dropped for the load and rebuilt afterwards, all in
+one transaction; run it against a database nothing else is using. The
+new shifts' confirmed counts are set in that transaction, and the
+coverage of the loaded days is rebuilt once it commits.
+"""
+
+import argparse
+import csv
+import io
+import random
+import time
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+from werkzeug.security import generate_password_hash
+from app import create_app, db
+from app.services.coverage import rebuild_coverage
+
+# (start, end) pairs shifts cycle through; the last one runs overnight
+SHIFT_TIMES = [
+    ("05:00:00", "13:00:00"),
+    ("13:00:00", "21:00:00"),
+    ("21:00:00", "05:00:00"),
+]
+# Availability windows bakers pick from, per working day
+AVAILABILITY_WINDOWS = [
+    ("04:00:00", "14:00:00"),
+    ("12:00:00", "22:00:00"),
+    ("04:00:00", "22:00:00"),
+    ("20:00:00", "06:00:00"),
+]
+ASSIGNMENT_STATUSES = ["confirmed"] * 6 + ["offered"] * 2 + ["pending", "cancelled"]
+TABLES = ["users", "availabilities", "shifts", "shift_staff"]
+
+
+def copy_rows(cursor, table, columns, rows, chunk_size=200_000):
+    """COPY ``rows`` into ``table`` as CSV, ``chunk_size`` rows at a time."""
+    sql = f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)"
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    count = 0
+
+    def flush():
+        buffer.seek(0)
+        cursor.copy_expert(sql, buffer)
+        buffer.seek(0)
+        buffer.truncate()
+
+    for row in rows:
+        writer.writerow(row)
+        count += 1
+        if count % chunk_size == 0:
+            flush()
+    if count % chunk_size:
+        flush()
+    return count
+
+
+@contextmanager
+def deferred_indexes(cursor, tables):
+    """Drop secondary indexes and constraints on ``tables``, restore after.
+
+    Rebuilding an index by sorting, and checking a foreign key with one
+    join, is far cheaper than maintaining them row by row during COPY.
+    """
+    cursor.execute(
+        "SELECT conrelid::regclass::text, conname, pg_get_constraintdef(oid) "
+        "FROM pg_constraint WHERE contype IN ('f', 'u') "
+        "AND conrelid::regclass::text = ANY(%s) ORDER BY contype",
+        (tables,),
+    )
+    constraints = cursor.fetchall()
+    cursor.execute(
+        "SELECT indexname, indexdef FROM pg_indexes i WHERE tablename = ANY(%s) "
+        "AND NOT EXISTS (SELECT 1 FROM pg_constraint c "
+        "WHERE c.conname = i.indexname AND c.contype IN ('p', 'u'))",
+        (tables,),
+    )
+    indexes = cursor.fetchall()
+    # Foreign keys ('f') sort first, so they are dropped before the unique
+    # keys they use and, restoring in reverse, added back after them
+    for table, name, _ in constraints:
+        cursor.execute(f'ALTER TABLE {table} DROP CONSTRAINT "{name}"')
+    for name, _ in indexes:
+        cursor.execute(f'DROP INDEX "{name}"')
+    yield
+    started = time.perf_counter()
+    for _, definition in indexes:
+        cursor.execute(definition)
+    for table, name, definition in reversed(constraints):
+        cursor.execute(f'ALTER TABLE {table} ADD CONSTRAINT "{name}" {definition}')
+    elapsed = (time.perf_counter() - started) * 1000
+    print(f"{'indexes and constraints':<28} {elapsed:>10.1f} ms")
+
+
+def max_ids(cursor):
+    ids = {}
+    for table in TABLES:
+        cursor.execute(f"SELECT coalesce(max(id), 0) FROM {table}")
+        ids[table] = cursor.fetchone()[0]
+    return ids
+
+
+def generate(cursor, args):
+    rng = random.Random(args.seed)
+    now = datetime.utcnow().isoformat(sep=" ")
+    base = max_ids(cursor)
+    password_hash = generate_password_hash(args.password)
+
+    def timed(table, columns, rows):
+        started = time.perf_counter()
+        count = copy_rows(cursor, table, columns, rows)
+        elapsed = (time.perf_counter() - started) * 1000
+        print(f"{table:<28} {elapsed:>10.1f} ms {count:>10} rows")
+
+    manager_ids = [base["users"] + 1 + i for i in range(args.managers)]
+    baker_ids = [manager_ids[-1] + 1 + i for i in range(args.bakers)]
+    timed(
+        "users",
+        ["id", "username", "email", "password_hash", "role"],
+        (
+            (
+                user_id,
+                f"{args.prefix}_{role}_{i}",
+                f"{args.prefix}_{role}_{i}@example.com",
+                password_hash,
+                role,
+            )
+            for role, ids in [("manager", manager_ids), ("baker", baker_ids)]
+            for i, user_id in enumerate(ids)
+        ),
+    )
+
+    def availability_rows():
+        availability_id = base["availabilities"]
+        for baker_id in baker_ids:
+            for day in sorted(rng.sample(range(7), args.days_available)):
+                start_time, end_time = rng.choice(AVAILABILITY_WINDOWS)
+                availability_id += 1
+                yield (
+                    availability_id,
+                    baker_id,
+                    day,
+                    start_time,
+                    end_time,
+                    True,
+                    now,
+                    now,
+                )
+
+    timed(
+        "availabilities",
+        [
+            "id",
+            "user_id",
+            "day_of_week",
+            "start_time",
+            "end_time",
+            "is_recurring",
+            "created_at",
+            "updated_at",
+        ],
+        availability_rows(),
+    )
+
+    start = args.start or date.today() - timedelta(days=365 * args.years // 2)
+    days = 365 * args.years
+    today = date.today()
+
+    def shift_status(day):
+        if day < today:
+            return "completed"
+        return "published" if day <= today + timedelta(days=14) else "draft"
+
+    timed(
+        "shifts",
+        [
+            "id",
+            "date",
+            "start_time",
+            "end_time",
+            "required_staff",
+            "status",
+            "employee_id",
+            "created_at",
+            "updated_at",
+        ],
+        (
+            (
+                base["shifts"] + 1 + offset * args.shifts_per_day + slot,
+                start + timedelta(days=offset),
+                *SHIFT_TIMES[slot % len(SHIFT_TIMES)],
+                args.staff_per_shift,
+                shift_status(start + timedelta(days=offset)),
+                manager_ids[slot % len(manager_ids)],
+                now,
+                now,
+            )
+            for offset in range(days)
+            for slot in range(args.shifts_per_day)
+        ),
+    )
+
+    # Each day's slots go to consecutive bakers in a rotating window, so
+    # nobody works twice in a day while there are enough bakers
+    slots_per_day = args.shifts_per_day * args.staff_per_shift
+    if slots_per_day > len(baker_ids):
+        print("warning: fewer bakers than daily slots; some will be double booked")
+
+    def assignment_rows():
+        assignment_id = base["shift_staff"]
+        for offset in range(days):
+            for slot in range(args.shifts_per_day):
+                shift_id = base["shifts"] + 1 + offset * args.shifts_per_day + slot
+                for k in range(args.staff_per_shift):
+                    baker = baker_ids[
+                        (offset * slots_per_day + slot * args.staff_per_shift + k)
+                        % len(baker_ids)
+                    ]
+                    assignment_id += 1
+                    yield (
+                        assignment_id,
+                        shift_id,
+                        baker,
+                        rng.choice(ASSIGNMENT_STATUSES),
+                        now,
+                        now,
+                    )
+
+    timed(
+        "shift_staff",
+        ["id", "shift_id", "staff_id", "status", "created_at", "updated_at"],
+        assignment_rows(),
+    )
+
+    # COPY skips the ORM hooks that keep confirmed counts, so set them for
+    # the new shifts in one pass
+    started = time.perf_counter()
+    cursor.execute(
+        "UPDATE shifts SET confirmed_staff_count = confirmed.count "
+        "FROM (SELECT shift_id, count(*) AS count FROM shift_staff "
+        "WHERE status = 'confirmed' AND shift_id > %s GROUP BY shift_id) "
+        "AS confirmed WHERE shifts.id = confirmed.shift_id",
+        (base["shifts"],),
+    )
+    elapsed = (time.perf_counter() - started) * 1000
+    print(f"{'confirmed counts':<28} {elapsed:>10.1f} ms {cursor.rowcount:>10} rows")
+
+    for table in TABLES:
+        cursor.execute(
+            f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+            f"(SELECT coalesce(max(id), 1) FROM {table}))"
+        )
+    return start, start + timedelta(days=days - 1)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--config", default="development")
+    parser.add_argument("--managers", type=int, default=20)
+    parser.add_argument("--bakers", type=int, default=2000)
+    parser.add_argument("--years", type=int, default=2)
+    parser.add_argument("--start", type=date.fromisoformat, default=None)
+    parser.add_argument("--shifts-per-day", type=int, default=40)
+    parser.add_argument("--staff-per-shift", type=int, default=3)
+    parser.add_argument("--days-available", type=int, default=5)
+    parser.add_argument("--prefix", default="load")
+    parser.add_argument("--password", default="loadtest")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--truncate", action="store_true")
+    parser.add_argument(
+        "--keep-indexes",
+        action="store_true",
+        help="Maintain indexes during the load (faster when appending a little)",
+    )
+    return parser.parse_args(argv)
+
+
+def load(args):
+    """Run the load described by ``args``; needs an app context."""
+    raw = db.engine.raw_connection()
+    try:
+        cursor = raw.cursor()
+        if args.truncate:
+            cursor.execute(
+                "TRUNCATE shift_staff, shifts, shift_templates, availabilities, "
+                "tombstones, shift_coverage, users RESTART IDENTITY CASCADE"
+            )
+        started = time.perf_counter()
+        if args.keep_indexes:
+            start, end = generate(cursor, args)
+        else:
+            with deferred_indexes(cursor, TABLES):
+                start, end = generate(cursor, args)
+        raw.commit()
+        # The coverage rows are per day, so recompute the loaded days
+        coverage_started = time.perf_counter()
+        rebuild_coverage(start, end)
+        elapsed = (time.perf_counter() - coverage_started) * 1000
+        print(f"{'shift_coverage':<28} {elapsed:>10.1f} ms")
+        print(f"{'total':<28} {(time.perf_counter() - started) * 1000:>10.1f} ms")
+        cursor.execute("ANALYZE")
+        raw.commit()
+    finally:
+        raw.close()
+
+
+def main():
+    args = parse_args()
+    app = create_app(args.config)
+    with app.app_context():
+        load(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,333 @@
+# backend/benchmarks/load_test.py
+"""Repeatable mixed-traffic load test for the auth, users and shifts APIs.
+
+Virtual users log in as generated managers and bakers (see
+``benchmarks.generate_data``) and issue a fixed, seeded mix of requests
+for ``--duration`` seconds. Latency percentiles and throughput are
+reported per endpoint:
+
+    python -m benchmarks.generate_data --truncate
+    python -m benchmarks.load_test --concurrency 16 --duration 60
+
+Without ``--base-url`` the app for ``--config`` is served by a threaded
+server in a child process; point ``--base-url`` at a real deployment
+(gunicorn, behind the proxy, ...) for production numbers. Fixture ids
+and usernames are read from the ``--config`` database either way.
+"""
+
+import argparse
+import http.client
+import json
+import multiprocessing
+import random
+import threading
+import time
+from collections import defaultdict
+from datetime import date, timedelta
+from urllib.parse import urlencode, urlsplit
+from werkzeug.serving import WSGIRequestHandler, make_server
+from app import create_app, db
+from app.models import Shift, User
+from benchmarks import percentile
+
+# Relative weight of each action in the mix; writes are left out with
+# --read-only
+ACTIONS = {
+    "login": 1,
+    "me": 3,
+    "list_users": 1,
+    "get_user": 2,
+    "list_shifts": 8,
+    "sync_shifts": 2,
+    "conflicts": 1,
+    "available_staff": 2,
+    "create_shift": 1,
+    "assign_staff": 1,
+}
+WRITE_ACTIONS = {"create_shift", "assign_staff"}
+MANAGER_ACTIONS = {"list_users", "create_shift", "assign_staff"}
+
+
+class QuietHandler(WSGIRequestHandler):
+    def log_request(self, *args, **kwargs):
+        pass
+
+
+def serve(config, port_queue):
+    app = create_app(config)
+    server = make_server(
+        "127.0.0.1", 0, app, threaded=True, request_handler=QuietHandler
+    )
+    port_queue.put(server.server_port)
+    server.serve_forever()
+
+
+def load_fixtures(config, prefix, sample_size=500):
+    """Usernames, user ids and shift dates/ids to build requests from."""
+    app = create_app(config)
+    with app.app_context():
+        users = (
+            db.session.query(User.id, User.username, User.role)
+            .filter(User.username.like(f"{prefix}\\_%"))
+            .order_by(User.id)
+            .limit(sample_size * 2)
+            .all()
+        )
+        first_day, last_day = db.session.query(
+            db.func.min(Shift.date), db.func.max(Shift.date)
+        ).one()
+        shift_ids = [
+            shift_id
+            for (shift_id,) in db.session.query(Shift.id)
+            .filter(Shift.date >= date.today())
+            .order_by(Shift.id)
+            .limit(sample_size)
+        ]
+
+    if not users or first_day is None:
+        raise SystemExit("No generated data; run benchmarks.generate_data first")
+    return {
+        "managers": [u.username for u in users if u.role == "manager"],
+        "bakers": [u.username for u in users if u.role == "baker"],
+        "user_ids": [u.id for u in users],
+        "first_day": first_day,
+        "last_day": last_day,
+        "shift_ids": shift_ids,
+    }
+
+
+class VirtualUser:
+    """One client with a keep-alive connection and its own seeded RNG."""
+
+    def __init__(self, base_url, fixtures, args, seed, record, is_manager):
+        parts = urlsplit(base_url)
+        self.host, self.port = parts.hostname, parts.port or 80
+        self.fixtures = fixtures
+        self.password = args.password
+        self.rng = random.Random(seed)
+        self.record = record
+        self.conn = None
+        self.token = None
+        self.cursor = None
+        self.is_manager = is_manager and bool(fixtures["managers"])
+        self.actions = [
+            action
+            for action, weight in ACTIONS.items()
+            for _ in range(weight)
+            if not (args.read_only and action in WRITE_ACTIONS)
+            and (self.is_manager or action not in MANAGER_ACTIONS)
+        ]
+
+    def request(self, label, method, path, body=None, ok=(200,)):
+        headers = {"Content-Type": "application/json"}
+        if self.token:
+            headers["Authorization"] = f"Bearer {self.token}"
+        payload = json.dumps(body) if body is not None else None
+
+        started = time.perf_counter()
+        try:
+            if self.conn is None:
+                self.conn = http.client.HTTPConnection(self.host, self.port, timeout=30)
+            self.conn.request(method, path, payload, headers)
+            response = self.conn.getresponse()
+            data = response.read()
+            status = response.status
+        except (OSError, http.client.HTTPException):
+            self.conn.close()
+            self.conn = None
+            data, status = b"", 0
+        self.record(label, time.perf_counter() - started, status in ok)
+        return status, data
+
+    def random_week(self):
+        first, last = self.fixtures["first_day"], self.fixtures["last_day"]
+        start = first + timedelta(
+            days=self.rng.randrange(max(1, (last - first).days - 6))
+        )
+        return start, start + timedelta(days=6)
+
+    def login(self):
+        pool = self.fixtures["managers" if self.is_manager else "bakers"]
+        status, data = self.request(
+            "POST /api/auth/login",
+            "POST",
+            "/api/auth/login",
+            {"username": self.rng.choice(pool), "password": self.password},
+        )
+        if status == 200:
+            self.token = json.loads(data)["token"]
+
+    def step(self):
+        action = self.rng.choice(self.actions)
+        if action == "login" or self.token is None:
+            self.login()
+        elif action == "me":
+            self.request("GET /api/auth/me", "GET", "/api/auth/me")
+        elif action == "list_users":
+            self.request("GET /api/users", "GET", "/api/users")
+        elif action == "get_user":
+            user_id = self.rng.choice(self.fixtures["user_ids"])
+            self.request("GET /api/users/<id>", "GET", f"/api/users/{user_id}")
+        elif action == "list_shifts":
+            start, end = self.random_week()
+            query = urlencode({"start": start.isoformat(), "end": end.isoformat()})
+            status, data = self.request(
+                "GET /api/shifts", "GET", f"/api/shifts?{query}"
+            )
+            if status == 200:
+                self.cursor = (start, end, json.loads(data)["cursor"])
+        elif action == "sync_shifts" and self.cursor:
+            start, end, cursor = self.cursor
+            query = urlencode(
+                {"start": start.isoformat(), "end": end.isoformat(), "since": cursor}
+            )
+            self.request("GET /api/shifts?since", "GET", f"/api/shifts?{query}")
+        elif action == "conflicts":
+            start, end = self.random_week()
+            query = urlencode({"start": start.isoformat(), "end": end.isoformat()})
+            self.request(
+                "GET /api/shifts/conflicts", "GET", f"/api/shifts/conflicts?{query}"
+            )
+        elif action == "available_staff":
+            start, _ = self.random_week()
+            query = urlencode(
+                {"date": start.isoformat(), "start": "05:00", "end": "13:00"}
+            )
+            self.request(
+                "GET /api/availability/available",
+                "GET",
+                f"/api/availability/available?{query}",
+            )
+        elif action == "create_shift":
+            start, _ = self.random_week()
+            self.request(
+                "POST /api/shifts",
+                "POST",
+                "/api/shifts",
+                {"date": start.isoformat(), "startTime": "06:00", "endTime": "14:00"},
+                ok=(201,),
+            )
+        elif action == "assign_staff" and self.fixtures["shift_ids"]:
+            shift_id = self.rng.choice(self.fixtures["shift_ids"])
+            # A 409 (baker already booked) is a normal outcome
+            self.request(
+                "POST /api/shifts/<id>/staff",
+                "POST",
+                f"/api/shifts/{shift_id}/staff",
+                {
+                    "username": self.rng.choice(self.fixtures["bakers"]),
+                    "status": "offered",
+                },
+                ok=(200, 409),
+            )
+
+    def run(self, deadline):
+        self.login()
+        while time.perf_counter() < deadline:
+            self.step()
+        if self.conn:
+            self.conn.close()
+
+
+def report(stats, elapsed):
+    rows = []
+    for label in sorted(stats):
+        latencies = stats[label]["latencies"]
+        rows.append(
+            {
+                "endpoint": label,
+                "requests": len(latencies),
+                "errors": stats[label]["errors"],
+                "rps": len(latencies) / elapsed,
+                "p50_ms": percentile(latencies, 50) * 1000,
+                "p95_ms": percentile(latencies, 95) * 1000,
+                "p99_ms": percentile(latencies, 99) * 1000,
+            }
+        )
+    everything = [lat for s in stats.values() for lat in s["latencies"]]
+    rows.append(
+        {
+            "endpoint": "total",
+            "requests": len(everything),
+            "errors": sum(s["errors"] for s in stats.values()),
+            "rps": len(everything) / elapsed,
+            "p50_ms": percentile(everything, 50) * 1000,
+            "p95_ms": percentile(everything, 95) * 1000,
+            "p99_ms": percentile(everything, 99) * 1000,
+        }
+    )
+
+    print(
+        f"{'endpoint':<34} {'requests':>9} {'errors':>7} {'req/s':>8} "
+        f"{'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}"
+    )
+    for row in rows:
+        print(
+            f"{row['endpoint']:<34} {row['requests']:>9} {row['errors']:>7} "
+            f"{row['rps']:>8.1f} {row['p50_ms']:>8.1f} {row['p95_ms']:>8.1f} "
+            f"{row['p99_ms']:>8.1f}"
+        )
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--config", default="development")
+    parser.add_argument("--base-url", default=None)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=30)
+    parser.add_argument("--prefix", default="load")
+    parser.add_argument("--password", default="loadtest")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--read-only", action="store_true")
+    parser.add_argument("--json", help="Also write the results to this file")
+    args = parser.parse_args()
+
+    fixtures = load_fixtures(args.config, args.prefix)
+
+    server = None
+    base_url = args.base_url
+    if base_url is None:
+        ports = multiprocessing.Queue()
+        server = multiprocessing.Process(
+            target=serve, args=(args.config, ports), daemon=True
+        )
+        server.start()
+        base_url = f"http://127.0.0.1:{ports.get(timeout=30)}"
+
+    stats = defaultdict(lambda: {"latencies": [], "errors": 0})
+    lock = threading.Lock()
+
+    def record(label, elapsed, ok):
+        with lock:
+            stats[label]["latencies"].append(elapsed)
+            if not ok:
+                stats[label]["errors"] += 1
+
+    started = time.perf_counter()
+    deadline = started + args.duration
+    users = [
+        # Every third virtual user is a manager
+        VirtualUser(base_url, fixtures, args, args.seed * 1000 + i, record, i % 3 == 0)
+        for i in range(args.concurrency)
+    ]
+    threads = [
+        threading.Thread(target=user.run, args=(deadline,), daemon=True)
+        for user in users
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    rows = report(stats, elapsed)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"args": vars(args), "results": rows}, f, indent=2)
+    if server is not None:
+        server.terminate()
+
+
+if __name__ == "__main__":
+    main()
@@ -3,6 +3,8 @@ import click
 from flask.cli import with_appcontext
 from app.database import db
 from app.models.user import User
+from app.services.coverage import rebuild_coverage
+from app.services.payroll import PAYROLL_FORMATS, export_payroll
 
 
 @click.command(name="create-tables")
@@ -38,3 +40,29 @@ def seed_db():
     except Exception as e:
         db.session.rollback()
         click.echo(f"Error seeding database: {str(e)}")
+
+
+@click.command(name="export-payroll")
+@click.option("--start", required=True, type=click.DateTime(["%Y-%m-%d"]))
+@click.option("--end", required=True, type=click.DateTime(["%Y-%m-%d"]))
+@click.option(
+    "--format", "fmt", type=click.Choice(list(PAYROLL_FORMATS)), default="csv"
+)
+@click.option("--summary", is_flag=True, help="One row per baker with total hours.")
+@click.option("--output", type=click.File("w"), default="-")
+@with_appcontext
+def export_payroll_command(start, end, fmt, summary, output):
+    """Write confirmed shifts and hours for a pay period."""
+    mimetype, chunks = export_payroll(start.date(), end.date(), fmt, summary)
+    for chunk in chunks:
+        output.write(chunk)
+
+
+@click.command(name="rebuild-coverage")
+@click.option("--start", type=click.DateTime(["%Y-%m-%d"]))
+@click.option("--end", type=click.DateTime(["%Y-%m-%d"]))
+@with_appcontext
+def rebuild_coverage_command(start, end):
+    """Recount shifts' confirmed staff and the per-day coverage table."""
+    days = rebuild_coverage(start and start.date(), end and end.date())
+    click.echo(f"Recomputed coverage for {days} day(s)")
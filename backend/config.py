@@ -25,6 +25,103 @@ class Config:
         f"@{os.getenv('DB_HOST')}:{os.getenv('DB_PORT')}/{os.getenv('DB_NAME')}"
     )
 
+    # Connection pool, per worker process: keep DB_POOL_SIZE open, allow
+    # DB_MAX_OVERFLOW more under load, wait DB_POOL_TIMEOUT seconds for one,
+    # and replace connections older than DB_POOL_RECYCLE seconds (-1: never).
+    # Pre-ping checks each connection on checkout so ones killed by a
+    # failover are replaced instead of failing a request.
+    DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+    DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", "30"))
+    DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "-1"))
+    DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "false") == "true"
+    DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "0"))
+    DB_APPLICATION_NAME = os.getenv("DB_APPLICATION_NAME", "bakery-scheduler")
+
+    # Set when DB_HOST is a PgBouncer in transaction pooling mode. LISTEN
+    # needs a session of its own, so roster events then listen on
+    # ROSTER_EVENTS_DATABASE_URI (a direct connection) when it is set
+    PGBOUNCER_MODE = os.getenv("PGBOUNCER_MODE", "false") == "true"
+    ROSTER_EVENTS_DATABASE_URI = os.getenv("ROSTER_EVENTS_DATABASE_URI")
+
+    # Read replicas (comma-separated URIs) for GET requests. A user's
+    # requests stay on the primary for REPLICA_STICKY_SECONDS after they
+    # write, which should exceed the usual replication lag
+    DB_REPLICA_URIS = [
+        uri for uri in os.getenv("DB_REPLICA_URIS", "").split(",") if uri.strip()
+    ]
+    REPLICA_STICKY_SECONDS = float(os.getenv("REPLICA_STICKY_SECONDS", "5"))
+
+    # Shift listing cache: seconds an entry may serve other workers' stale
+    # data, and how many ranges to keep
+    SHIFT_CACHE_TTL = int(os.getenv("SHIFT_CACHE_TTL", "30"))
+    SHIFT_CACHE_MAX_ENTRIES = int(os.getenv("SHIFT_CACHE_MAX_ENTRIES", "256"))
+
+    # Password hashing: werkzeug method and cost (e.g. "scrypt:32768:8:1" or
+    # "pbkdf2:sha256:600000"; existing hashes are upgraded at login), how
+    # many processes hash at once (0 hashes inline), how many requests may
+    # wait for them, and how long they wait for a place before getting a 503
+    PASSWORD_HASH_METHOD = os.getenv("PASSWORD_HASH_METHOD", "scrypt")
+    PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", "2"))
+    PASSWORD_HASH_MAX_PENDING = int(os.getenv("PASSWORD_HASH_MAX_PENDING", "64"))
+    PASSWORD_HASH_TIMEOUT = int(os.getenv("PASSWORD_HASH_TIMEOUT", "10"))
+
+    # Authenticated user lookups: seconds another worker's change to a user
+    # may go unnoticed, and how many users to keep
+    USER_CACHE_TTL = int(os.getenv("USER_CACHE_TTL", "60"))
+    USER_CACHE_MAX_ENTRIES = int(os.getenv("USER_CACHE_MAX_ENTRIES", "10000"))
+
+    # User directory: page size when a client doesn't ask, and the most a
+    # client may ask for
+    USER_DIRECTORY_PAGE_SIZE = int(os.getenv("USER_DIRECTORY_PAGE_SIZE", "50"))
+    USER_DIRECTORY_MAX_PAGE_SIZE = int(os.getenv("USER_DIRECTORY_MAX_PAGE_SIZE", "200"))
+
+    # Payroll exports: rows fetched from the server-side cursor at a time
+    PAYROLL_EXPORT_BATCH_SIZE = int(os.getenv("PAYROLL_EXPORT_BATCH_SIZE", "2000"))
+
+    # Calendar feeds: days of past shifts kept in a feed, and how many
+    # users' rendered feeds each worker keeps
+    CALENDAR_FEED_PAST_DAYS = int(os.getenv("CALENDAR_FEED_PAST_DAYS", "30"))
+    CALENDAR_FEED_CACHE_MAX_ENTRIES = int(
+        os.getenv("CALENDAR_FEED_CACHE_MAX_ENTRIES", "5000")
+    )
+
+    # Availability writes re-solve the baker's shifts this many days ahead
+    # (0 turns the automatic repair off)
+    AVAILABILITY_REPAIR_DAYS = int(os.getenv("AVAILABILITY_REPAIR_DAYS", "28"))
+
+    # Open-slot ranking: candidate bakers listed per shift by default, and
+    # the most a client may ask for
+    OPEN_SLOT_CANDIDATES = int(os.getenv("OPEN_SLOT_CANDIDATES", "5"))
+    OPEN_SLOT_MAX_CANDIDATES = int(os.getenv("OPEN_SLOT_MAX_CANDIDATES", "50"))
+
+    # Delta sync: seconds each cursor is set back to catch in-flight writes,
+    # and days tombstones (and so cursors) stay valid
+    SYNC_CURSOR_OVERLAP = int(os.getenv("SYNC_CURSOR_OVERLAP", "5"))
+    SYNC_TOMBSTONE_RETENTION_DAYS = int(
+        os.getenv("SYNC_TOMBSTONE_RETENTION_DAYS", "30")
+    )
+
+    # Live roster events: the Postgres NOTIFY channel, how many events a slow
+    # client may fall behind before it is dropped, and the keepalive interval
+    ROSTER_EVENTS_CHANNEL = os.getenv("ROSTER_EVENTS_CHANNEL", "roster_changes")
+    SSE_QUEUE_SIZE = int(os.getenv("SSE_QUEUE_SIZE", "100"))
+    SSE_HEARTBEAT = int(os.getenv("SSE_HEARTBEAT", "15"))
+
+    # Request instrumentation: per-endpoint timings at /api/instrumentation,
+    # a warning for requests slower than SLOW_REQUEST_MS, and a cProfile of
+    # one request in PROFILE_SAMPLE_RATE (0 turns sampling off)
+    INSTRUMENTATION_ENABLED = os.getenv("INSTRUMENTATION_ENABLED", "false") == "true"
+    SLOW_REQUEST_MS = int(os.getenv("SLOW_REQUEST_MS", "500"))
+    PROFILE_SAMPLE_RATE = int(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+    INSTRUMENTATION_TOP_STATEMENTS = 3
+    SERVER_TIMING_HEADER = False
+
+    # Prometheus metrics at /metrics; set METRICS_TOKEN to require
+    # "Authorization: Bearer <token>" from the scraper
+    METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true") == "true"
+    METRICS_TOKEN = os.getenv("METRICS_TOKEN")
+
     # CORS configuration
     CORS_HEADERS = "Content-Type"
     CORS_ALLOWED_ORIGINS = os.getenv("CORS_ALLOWED_ORIGINS", "").split(",")
@@ -32,10 +129,18 @@ class Config:
 
 class DevelopmentConfig(Config):
     DEBUG = True
+    INSTRUMENTATION_ENABLED = os.getenv("INSTRUMENTATION_ENABLED", "true") == "true"
+    SERVER_TIMING_HEADER = True
 
 
 class ProductionConfig(Config):
     DEBUG = False
+    # Size the pool so workers * (DB_POOL_SIZE + DB_MAX_OVERFLOW) stays under
+    # the server's (or PgBouncer's) max_connections
+    DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+    DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true") == "true"
+    DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "30000"))
+
     # When deploying to AWS, you might want to use AWS Secrets Manager for sensitive data
 
     # In production, you might want to be more strict with CORS
@@ -47,6 +152,8 @@ class ProductionConfig(Config):
 class TestingConfig(Config):
     TESTING = True
     SQLALCHEMY_DATABASE_URI = "postgresql:///test_baker_scheduling"
+    JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY", "test-jwt-secret")
+    PASSWORD_HASH_WORKERS = 0
 
 
 config = {
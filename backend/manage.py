@@ -1,9 +1,13 @@
 # backend/manage.py
 import os
+import click
+from datetime import date
 from flask_migrate import Migrate
 from flask.cli import FlaskGroup
 from app import create_app, db
 from app.models.user import User
+from app.services.scheduler import repair_shifts, solve_roster
+from app.services.sync import prune_tombstones
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -54,5 +58,54 @@ def seed_db():
         db.session.rollback()
 
 
+@cli.command("solve_roster")
+@click.option("--start", required=True, help="First shift date (YYYY-MM-DD)")
+@click.option("--end", required=True, help="Last shift date (YYYY-MM-DD)")
+@click.option("--dry-run", is_flag=True, help="Report assignments without saving")
+def solve_roster_command(start, end, dry_run):
+    """Assign bakers to open shifts from their availability."""
+    try:
+        result = solve_roster(
+            date.fromisoformat(start), date.fromisoformat(end), dry_run=dry_run
+        )
+        print(
+            f"Assigned {len(result['assignments'])} slots across "
+            f"{result['shifts_considered']} shifts in {result['elapsed_ms']}ms"
+        )
+        for gap in result["unfilled"]:
+            print(f"Shift {gap['shift_id']} still needs {gap['missing']} staff")
+    except Exception as e:
+        print(f"Error solving roster: {e}")
+        db.session.rollback()
+
+
+@cli.command("repair_roster")
+@click.option("--shift-id", "shift_ids", type=int, multiple=True, required=True)
+@click.option("--dry-run", is_flag=True, help="Report assignments without saving")
+def repair_roster_command(shift_ids, dry_run):
+    """Refill only the given shifts, leaving the rest of the roster as is."""
+    try:
+        result = repair_shifts(list(shift_ids), dry_run=dry_run)
+        for assignment in result["assignments"]:
+            print(
+                f"Shift {assignment['shift_id']}: "
+                f"assigned staff {assignment['staff_id']}"
+            )
+        print(f"Repaired {len(shift_ids)} shifts in {result['elapsed_ms']}ms")
+    except Exception as e:
+        print(f"Error repairing roster: {e}")
+        db.session.rollback()
+
+
+@cli.command("prune_tombstones")
+def prune_tombstones_command():
+    """Delete tombstones older than SYNC_TOMBSTONE_RETENTION_DAYS."""
+    try:
+        print(f"Pruned {prune_tombstones()} tombstones")
+    except Exception as e:
+        print(f"Error pruning tombstones: {e}")
+        db.session.rollback()
+
+
 if __name__ == "__main__":
     cli()
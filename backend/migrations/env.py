@@ -90,9 +90,22 @@ def run_migrations_online():
                 directives[:] = []
                 logger.info('No changes in schema detected.')
 
+    # reflection drops the COLLATE clause of expression indexes, so
+    # autogenerate would drop and re-create collated indexes on every run
+    def include_object(object, name, type_, reflected, compare_to):
+        index = compare_to if reflected else object
+        if type_ == 'index' and index is not None:
+            return not any(
+                'COLLATE' in str(expression)
+                for expression in getattr(index, 'expressions', [])
+            )
+        return True
+
     conf_args = current_app.extensions['migrate'].configure_args
     if conf_args.get("process_revision_directives") is None:
         conf_args["process_revision_directives"] = process_revision_directives
+    if conf_args.get("include_object") is None:
+        conf_args["include_object"] = include_object
 
     connectable = get_engine()
 
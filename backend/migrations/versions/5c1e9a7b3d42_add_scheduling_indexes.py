@@ -0,0 +1,48 @@
+"""Add indexes for scheduling hot paths
+
+Revision ID: 5c1e9a7b3d42
+Revises: a32ddf2cd0cd
+Create Date: 2026-10-18 09:12:44.318207
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5c1e9a7b3d42'
+down_revision = 'a32ddf2cd0cd'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Calendar range queries filter and order on date, then start time
+    op.create_index('ix_shifts_date_start_time', 'shifts', ['date', 'start_time'], unique=False)
+    op.create_index('ix_shifts_employee_id', 'shifts', ['employee_id'], unique=False)
+
+    # Keep the newest row of any duplicated (shift_id, staff_id) pair so the
+    # unique constraint can be created on existing data
+    op.execute(
+        """
+        DELETE FROM shift_staff a
+        USING shift_staff b
+        WHERE a.shift_id = b.shift_id
+          AND a.staff_id = b.staff_id
+          AND a.id < b.id
+        """
+    )
+    op.create_unique_constraint('uq_shift_staff_shift_id_staff_id', 'shift_staff', ['shift_id', 'staff_id'])
+    op.create_index('ix_shift_staff_staff_id_status', 'shift_staff', ['staff_id', 'status'], unique=False)
+
+    op.create_index('ix_availabilities_user_id_day_of_week', 'availabilities', ['user_id', 'day_of_week'], unique=False)
+    op.create_index('ix_availabilities_day_of_week', 'availabilities', ['day_of_week'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_availabilities_day_of_week', table_name='availabilities')
+    op.drop_index('ix_availabilities_user_id_day_of_week', table_name='availabilities')
+    op.drop_index('ix_shift_staff_staff_id_status', table_name='shift_staff')
+    op.drop_constraint('uq_shift_staff_shift_id_staff_id', 'shift_staff', type_='unique')
+    op.drop_index('ix_shifts_employee_id', table_name='shifts')
+    op.drop_index('ix_shifts_date_start_time', table_name='shifts')
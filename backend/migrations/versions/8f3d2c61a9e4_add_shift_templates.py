@@ -0,0 +1,43 @@
+"""Add shift templates
+
+Revision ID: 8f3d2c61a9e4
+Revises: 5c1e9a7b3d42
+Create Date: 2026-10-18 11:40:02.915734
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8f3d2c61a9e4'
+down_revision = '5c1e9a7b3d42'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('shift_templates',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=120), nullable=False),
+    sa.Column('day_of_week', sa.Integer(), nullable=False),
+    sa.Column('start_time', sa.String(length=8), nullable=False),
+    sa.Column('end_time', sa.String(length=8), nullable=False),
+    sa.Column('required_staff', sa.Integer(), nullable=False),
+    sa.Column('is_active', sa.Boolean(), nullable=False),
+    sa.Column('employee_id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['employee_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.add_column('shifts', sa.Column('template_id', sa.Integer(), nullable=True))
+    op.create_foreign_key('shifts_template_id_fkey', 'shifts', 'shift_templates', ['template_id'], ['id'])
+    op.create_unique_constraint('uq_shifts_template_id_date', 'shifts', ['template_id', 'date'])
+
+
+def downgrade():
+    op.drop_constraint('uq_shifts_template_id_date', 'shifts', type_='unique')
+    op.drop_constraint('shifts_template_id_fkey', 'shifts', type_='foreignkey')
+    op.drop_column('shifts', 'template_id')
+    op.drop_table('shift_templates')
@@ -0,0 +1,26 @@
+"""Add calendar feed token hash to users
+
+Revision ID: a4e7b9c1d352
+Revises: f6a2c8d4b371
+Create Date: 2026-10-18 20:12:37.604219
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a4e7b9c1d352'
+down_revision = 'f6a2c8d4b371'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('users', sa.Column('calendar_token_hash', sa.String(length=64), nullable=True))
+    op.create_unique_constraint('users_calendar_token_hash_key', 'users', ['calendar_token_hash'])
+
+
+def downgrade():
+    op.drop_constraint('users_calendar_token_hash_key', 'users', type_='unique')
+    op.drop_column('users', 'calendar_token_hash')
@@ -0,0 +1,28 @@
+"""Add user directory indexes for keyset paging and prefix search
+
+Revision ID: b5d8e21f4a90
+Revises: e3a9f4c2b718
+Create Date: 2026-10-18 16:42:11.518302
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b5d8e21f4a90'
+down_revision = 'e3a9f4c2b718'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_users_username_lower', 'users', [sa.text('lower(username) COLLATE "C"'), 'id'], unique=False)
+    op.create_index('ix_users_role_username_lower', 'users', ['role', sa.text('lower(username) COLLATE "C"'), 'id'], unique=False)
+    op.create_index('ix_users_email_lower', 'users', [sa.text('lower(email) COLLATE "C"')], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_users_email_lower', table_name='users')
+    op.drop_index('ix_users_role_username_lower', table_name='users')
+    op.drop_index('ix_users_username_lower', table_name='users')
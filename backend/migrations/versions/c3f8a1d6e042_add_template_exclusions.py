@@ -0,0 +1,30 @@
+"""Add template_exclusions for deleted and moved generated shifts
+
+Revision ID: c3f8a1d6e042
+Revises: a4e7b9c1d352
+Create Date: 2026-10-18 21:04:51.318640
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c3f8a1d6e042'
+down_revision = 'a4e7b9c1d352'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('template_exclusions',
+    sa.Column('template_id', sa.Integer(), nullable=False),
+    sa.Column('date', sa.Date(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['template_id'], ['shift_templates.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('template_id', 'date')
+    )
+
+
+def downgrade():
+    op.drop_table('template_exclusions')
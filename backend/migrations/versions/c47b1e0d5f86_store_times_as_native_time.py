@@ -0,0 +1,101 @@
+"""Store shift, template and availability times as native TIME
+
+Revision ID: c47b1e0d5f86
+Revises: 8f3d2c61a9e4
+Create Date: 2026-10-18 13:05:51.204417
+
+Converting in place with ALTER COLUMN ... TYPE would rewrite each table
+under an ACCESS EXCLUSIVE lock. Instead each table gets new TIME columns,
+kept in sync by a trigger while existing rows are backfilled in small
+autocommitted batches. Only the final swap (rename columns) takes a brief
+exclusive lock; NOT NULL is proven by a CHECK constraint validated
+beforehand so it needs no table scan under that lock.
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c47b1e0d5f86'
+down_revision = '8f3d2c61a9e4'
+branch_labels = None
+depends_on = None
+
+TABLES = ['shifts', 'shift_templates', 'availabilities']
+BATCH_SIZE = 5000
+
+
+def _backfill(table):
+    bind = op.get_bind()
+    low, high = bind.execute(sa.text(f'SELECT min(id), max(id) FROM {table}')).one()
+    if low is None:
+        return
+    for start in range(low, high + 1, BATCH_SIZE):
+        # A no-op update fires the sync trigger, which fills the new columns
+        bind.execute(
+            sa.text(
+                f'UPDATE {table} SET start_time = start_time '
+                f'WHERE id >= :start AND id < :end AND start_time_new IS NULL'
+            ),
+            {'start': start, 'end': start + BATCH_SIZE},
+        )
+
+
+def upgrade():
+    for table in TABLES:
+        op.add_column(table, sa.Column('start_time_new', sa.Time(), nullable=True))
+        op.add_column(table, sa.Column('end_time_new', sa.Time(), nullable=True))
+        op.execute(
+            f"""
+            CREATE FUNCTION {table}_sync_times() RETURNS trigger AS $$
+            BEGIN
+                NEW.start_time_new := NEW.start_time::time;
+                NEW.end_time_new := NEW.end_time::time;
+                RETURN NEW;
+            END
+            $$ LANGUAGE plpgsql
+            """
+        )
+        op.execute(
+            f'CREATE TRIGGER {table}_sync_times BEFORE INSERT OR UPDATE ON {table} '
+            f'FOR EACH ROW EXECUTE FUNCTION {table}_sync_times()'
+        )
+
+    with op.get_context().autocommit_block():
+        for table in TABLES:
+            _backfill(table)
+            op.execute(
+                f'ALTER TABLE {table} ADD CONSTRAINT {table}_times_not_null '
+                f'CHECK (start_time_new IS NOT NULL AND end_time_new IS NOT NULL) '
+                f'NOT VALID'
+            )
+            op.execute(f'ALTER TABLE {table} VALIDATE CONSTRAINT {table}_times_not_null')
+        op.execute(
+            'CREATE INDEX CONCURRENTLY ix_shifts_date_start_time_new '
+            'ON shifts (date, start_time_new)'
+        )
+
+    # Short swap: everything below is catalog-only
+    for table in TABLES:
+        op.execute(f'DROP TRIGGER {table}_sync_times ON {table}')
+        op.execute(f'DROP FUNCTION {table}_sync_times()')
+        op.alter_column(table, 'start_time_new', nullable=False)
+        op.alter_column(table, 'end_time_new', nullable=False)
+        op.drop_constraint(f'{table}_times_not_null', table, type_='check')
+        op.drop_column(table, 'start_time')
+        op.drop_column(table, 'end_time')
+        op.alter_column(table, 'start_time_new', new_column_name='start_time')
+        op.alter_column(table, 'end_time_new', new_column_name='end_time')
+    op.execute('ALTER INDEX ix_shifts_date_start_time_new RENAME TO ix_shifts_date_start_time')
+
+
+def downgrade():
+    for table in TABLES:
+        for column in ['start_time', 'end_time']:
+            op.alter_column(
+                table,
+                column,
+                type_=sa.String(length=8),
+                postgresql_using=f"to_char({column}, 'HH24:MI:SS')",
+            )
@@ -0,0 +1,53 @@
+"""Add shift_coverage per-day staffing totals
+
+Revision ID: d91c7a3e5f20
+Revises: b5d8e21f4a90
+Create Date: 2026-10-18 18:21:44.902117
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd91c7a3e5f20'
+down_revision = 'b5d8e21f4a90'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('shift_coverage',
+    sa.Column('date', sa.Date(), nullable=False),
+    sa.Column('shift_count', sa.Integer(), nullable=False),
+    sa.Column('required_staff', sa.Integer(), nullable=False),
+    sa.Column('confirmed_staff', sa.Integer(), nullable=False),
+    sa.Column('open_slots', sa.Integer(), nullable=False),
+    sa.Column('understaffed_shifts', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('date')
+    )
+    # Backfill from the existing roster; the app keeps it current from here
+    op.execute("""
+        INSERT INTO shift_coverage (date, shift_count, required_staff,
+            confirmed_staff, open_slots, understaffed_shifts, updated_at)
+        SELECT date, count(*), sum(required_staff), sum(confirmed),
+            sum(greatest(required_staff - confirmed, 0)),
+            count(*) FILTER (WHERE confirmed < required_staff),
+            timezone('UTC', now())
+        FROM (
+            SELECT shifts.date, shifts.required_staff,
+                count(shift_staff.id) FILTER (
+                    WHERE shift_staff.status = 'confirmed'
+                ) AS confirmed
+            FROM shifts
+            LEFT JOIN shift_staff ON shift_staff.shift_id = shifts.id
+            WHERE shifts.status != 'cancelled'
+            GROUP BY shifts.id
+        ) AS per_shift
+        GROUP BY date
+    """)
+
+
+def downgrade():
+    op.drop_table('shift_coverage')
@@ -0,0 +1,38 @@
+"""Add tombstones and updated_at indexes for delta sync
+
+Revision ID: e3a9f4c2b718
+Revises: c47b1e0d5f86
+Create Date: 2026-10-18 14:05:37.204511
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e3a9f4c2b718'
+down_revision = 'c47b1e0d5f86'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('tombstones',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('entity', sa.String(length=50), nullable=False),
+    sa.Column('entity_id', sa.Integer(), nullable=False),
+    sa.Column('shift_id', sa.Integer(), nullable=False),
+    sa.Column('shift_date', sa.Date(), nullable=False),
+    sa.Column('deleted_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_tombstones_deleted_at', 'tombstones', ['deleted_at'], unique=False)
+    op.create_index('ix_shifts_updated_at', 'shifts', ['updated_at'], unique=False)
+    op.create_index('ix_shift_staff_updated_at', 'shift_staff', ['updated_at'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_shift_staff_updated_at', table_name='shift_staff')
+    op.drop_index('ix_shifts_updated_at', table_name='shifts')
+    op.drop_index('ix_tombstones_deleted_at', table_name='tombstones')
+    op.drop_table('tombstones')
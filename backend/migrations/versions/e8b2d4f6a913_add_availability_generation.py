@@ -0,0 +1,44 @@
+"""Add availability_generation counter kept by a trigger
+
+Revision ID: e8b2d4f6a913
+Revises: c3f8a1d6e042
+Create Date: 2026-10-19 09:42:18.507326
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e8b2d4f6a913'
+down_revision = 'c3f8a1d6e042'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('availability_generation',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('value', sa.BigInteger(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.execute("INSERT INTO availability_generation (id, value) VALUES (1, 0)")
+    op.execute("""
+        CREATE OR REPLACE FUNCTION bump_availability_generation() RETURNS trigger AS $$
+        BEGIN
+            UPDATE availability_generation SET value = value + 1 WHERE id = 1;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER availabilities_bump_generation
+            AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON availabilities
+            FOR EACH STATEMENT EXECUTE FUNCTION bump_availability_generation()
+    """)
+
+
+def downgrade():
+    op.execute('DROP TRIGGER IF EXISTS availabilities_bump_generation ON availabilities')
+    op.execute('DROP FUNCTION IF EXISTS bump_availability_generation()')
+    op.drop_table('availability_generation')
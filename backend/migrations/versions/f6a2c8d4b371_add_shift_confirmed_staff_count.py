@@ -0,0 +1,36 @@
+"""Add stored confirmed_staff_count to shifts
+
+Revision ID: f6a2c8d4b371
+Revises: d91c7a3e5f20
+Create Date: 2026-10-18 19:04:12.318540
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f6a2c8d4b371'
+down_revision = 'd91c7a3e5f20'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('shifts', sa.Column('confirmed_staff_count', sa.Integer(), server_default='0', nullable=False))
+
+    # Count the existing confirmations; the app maintains it from here
+    op.execute("""
+        UPDATE shifts SET confirmed_staff_count = counts.confirmed
+        FROM (
+            SELECT shift_id, count(*) AS confirmed
+            FROM shift_staff
+            WHERE status = 'confirmed'
+            GROUP BY shift_id
+        ) AS counts
+        WHERE shifts.id = counts.shift_id
+    """)
+
+
+def downgrade():
+    op.drop_column('shifts', 'confirmed_staff_count')
@@ -1,11 +1,13 @@
 # seed_database.py
-from datetime import datetime, date, timedelta
+from datetime import datetime, date, time, timedelta
 from werkzeug.security import generate_password_hash
 from app import create_app
 from app.database import db
 from app.models.user import User
 from app.models.shift import Shift
 from app.models.shift_staff import ShiftStaff
+from app.models.shift_template import ShiftTemplate
+from app.services.templates import expand_templates
 from sqlalchemy import text
 
 
@@ -15,6 +17,9 @@ def reset_sequences():
         connection.execute(text("ALTER SEQUENCE users_id_seq RESTART WITH 1;"))
         connection.execute(text("ALTER SEQUENCE shifts_id_seq RESTART WITH 1;"))
         connection.execute(text("ALTER SEQUENCE shift_staff_id_seq RESTART WITH 1;"))
+        connection.execute(
+            text("ALTER SEQUENCE shift_templates_id_seq RESTART WITH 1;")
+        )
         connection.commit()
 
 
@@ -23,24 +28,14 @@ def clear_tables():
     print("Clearing existing data...")
     db.session.execute(text("TRUNCATE TABLE shift_staff CASCADE;"))
     db.session.execute(text("TRUNCATE TABLE shifts CASCADE;"))
+    db.session.execute(text("TRUNCATE TABLE shift_templates CASCADE;"))
     db.session.execute(text("TRUNCATE TABLE users CASCADE;"))
+    db.session.execute(text("TRUNCATE TABLE shift_coverage;"))
+    db.session.execute(text("TRUNCATE TABLE tombstones;"))
     db.session.commit()
     print("All tables cleared.")
 
 
-def get_next_month_weekend_dates():
-    dates = []
-    current = date.today()
-    end_date = current + timedelta(days=30)
-
-    while current <= end_date:
-        # 3 = Thursday, 4 = Friday, 5 = Saturday
-        if current.weekday() in [3, 4, 5]:
-            dates.append(current)
-        current += timedelta(days=1)
-    return dates
-
-
 def seed_database():
     # Create application context
     app = create_app()
@@ -74,54 +69,46 @@ def seed_database():
             db.session.commit()
             print("Users created successfully!")
 
-            print("Creating shifts...")
-            # Create shifts
-            weekend_dates = get_next_month_weekend_dates()
-            shifts = []
-
-            for current_date in weekend_dates:
-                # Morning shift
-                morning_shift = Shift(
-                    date=current_date,
-                    start_time="05:00:00",
-                    end_time="13:00:00",
+            print("Creating shift templates...")
+            # Thursday to Saturday, fixed morning and afternoon shifts
+            templates = [
+                ShiftTemplate(
+                    name=f"{day_name} {part}",
+                    day_of_week=day_of_week,
+                    start_time=start_time,
+                    end_time=end_time,
                     required_staff=2,
-                    status=(
-                        "published"
-                        if current_date <= date.today() + timedelta(days=7)
-                        else "draft"
-                    ),
                     employee_id=2,  # Created by manager1
                 )
-                shifts.append(morning_shift)
-
-                # Afternoon shift
-                afternoon_shift = Shift(
-                    date=current_date,
-                    start_time="13:00:00",
-                    end_time="21:00:00",
-                    required_staff=2,
-                    status=(
-                        "published"
-                        if current_date <= date.today() + timedelta(days=7)
-                        else "draft"
-                    ),
-                    employee_id=2,  # Created by manager1
-                )
-                shifts.append(afternoon_shift)
-
-            # Add shifts to session
-            for shift in shifts:
-                db.session.add(shift)
+                for day_of_week, day_name in [
+                    (3, "Thursday"),
+                    (4, "Friday"),
+                    (5, "Saturday"),
+                ]
+                for part, start_time, end_time in [
+                    ("morning", "05:00:00", "13:00:00"),
+                    ("afternoon", "13:00:00", "21:00:00"),
+                ]
+            ]
+            db.session.add_all(templates)
+            db.session.commit()
+            print("Shift templates created successfully!")
 
+            print("Creating shifts...")
+            # Expand the templates over the next month
+            expand_templates(date.today(), date.today() + timedelta(days=30), 2)
+            Shift.query.filter(Shift.date <= date.today() + timedelta(days=7)).update(
+                {"status": "published"}
+            )
             db.session.commit()
+            shifts = Shift.query.order_by(Shift.date, Shift.start_time).all()
             print("Shifts created successfully!")
 
             print("Creating shift assignments...")
             # Create shift assignments for published shifts
             for shift in shifts:
                 if shift.status == "published":
-                    if "05:00:00" in shift.start_time:
+                    if shift.start_time == time(5, 0):
                         # Morning shift assignments
                         assignments = [
                             ShiftStaff(
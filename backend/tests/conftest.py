@@ -1,4 +1,7 @@
 import pytest
+from contextlib import contextmanager
+from flask_jwt_extended import create_access_token
+from sqlalchemy import event
 from app import create_app, db
 from app.models.user import User
 
@@ -13,6 +16,7 @@ def test_client():
             # Create the database and the database table(s)
             db.create_all()
             yield testing_client  # this is where the testing happens!
+            db.session.remove()
             db.drop_all()
 
 
@@ -20,3 +24,40 @@ def test_client():
 def new_user():
     user = User(username="testuser", email="testuser@example.com", password="password")
     return user
+
+
+@pytest.fixture(scope="module")
+def manager_user(test_client):
+    manager = User(username="test_manager", email="manager@example.com", role="manager")
+    manager.set_password("password")
+    db.session.add(manager)
+    db.session.commit()
+    return manager
+
+
+@pytest.fixture(scope="module")
+def auth_headers(manager_user):
+    token = create_access_token(
+        identity=manager_user.id, additional_claims={"role": manager_user.role}
+    )
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.fixture
+def count_queries(test_client):
+    """Count the SQL statements executed inside a ``with`` block."""
+
+    @contextmanager
+    def counter():
+        statements = []
+
+        def before_cursor_execute(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(db.engine, "before_cursor_execute", before_cursor_execute)
+        try:
+            yield statements
+        finally:
+            event.remove(db.engine, "before_cursor_execute", before_cursor_execute)
+
+    return counter
@@ -0,0 +1,228 @@
+# backend/tests/test_availability.py
+import random
+import time
+from datetime import date, time as time_of_day, timedelta
+from sqlalchemy import text
+from app.database import db
+from app.models import User
+from app.services.availability_index import (
+    AvailabilityEntry,
+    AvailabilityIndex,
+    get_availability_index,
+)
+
+
+def test_availability_crud(test_client, auth_headers):
+    baker = User(username="avail_baker", email="avail_baker@example.com", role="baker")
+    db.session.add(baker)
+    db.session.commit()
+
+    response = test_client.post(
+        "/api/availability",
+        json={
+            "userId": baker.id,
+            "dayOfWeek": 3,
+            "startTime": "05:00",
+            "endTime": "14:00",
+        },
+        headers=auth_headers,
+    )
+    assert response.status_code == 201
+    availability_id = response.json["id"]
+    assert response.json["start_time"] == "05:00:00"
+
+    response = test_client.put(
+        f"/api/availability/{availability_id}",
+        json={"endTime": "12:00"},
+        headers=auth_headers,
+    )
+    assert response.json["end_time"] == "12:00:00"
+
+    response = test_client.get(
+        f"/api/availability?userId={baker.id}", headers=auth_headers
+    )
+    assert [a["id"] for a in response.json["availabilities"]] == [availability_id]
+
+    response = test_client.post(
+        "/api/availability",
+        json={
+            "userId": baker.id,
+            "dayOfWeek": 9,
+            "startTime": "05:00",
+            "endTime": "09:00",
+        },
+        headers=auth_headers,
+    )
+    assert response.status_code == 400
+
+    response = test_client.delete(
+        f"/api/availability/{availability_id}", headers=auth_headers
+    )
+    assert response.status_code == 200
+
+
+def test_available_lookup_follows_writes(test_client, auth_headers):
+    baker = User(
+        username="lookup_baker", email="lookup_baker@example.com", role="baker"
+    )
+    db.session.add(baker)
+    db.session.commit()
+    thursday_shift = "/api/availability/available?date=2030-01-03&start=05:00&end=13:00"
+
+    def available():
+        response = test_client.get(thursday_shift, headers=auth_headers)
+        return [user["username"] for user in response.json["available"]]
+
+    assert "lookup_baker" not in available()
+
+    response = test_client.post(
+        "/api/availability",
+        json={
+            "userId": baker.id,
+            "dayOfWeek": 3,
+            "startTime": "04:00",
+            "endTime": "14:00",
+        },
+        headers=auth_headers,
+    )
+    assert "lookup_baker" in available()
+
+    test_client.put(
+        f"/api/availability/{response.json['id']}",
+        json={"startDate": "2030-02-01"},
+        headers=auth_headers,
+    )
+    assert "lookup_baker" not in available()
+
+
+def test_batch_lookup_uses_constant_queries(test_client, auth_headers, count_queries):
+    windows = [
+        {
+            "date": (date(2030, 1, 7) + timedelta(days=d)).isoformat(),
+            "start": s,
+            "end": e,
+        }
+        for d in range(7)
+        for s, e in [("05:00", "13:00"), ("13:00", "21:00")]
+    ]
+    test_client.post(
+        "/api/availability/available", json={"windows": windows}, headers=auth_headers
+    )
+
+    with count_queries() as statements:
+        response = test_client.post(
+            "/api/availability/available",
+            json={"windows": windows * 20},
+            headers=auth_headers,
+        )
+    assert len(response.json["results"]) == len(windows) * 20
+    assert len(statements) <= 2
+
+
+def test_index_answers_a_week_of_shifts_quickly():
+    rng = random.Random(7)
+    entries = [
+        AvailabilityEntry(
+            id=i,
+            user_id=i // 5,
+            day_of_week=rng.randrange(7),
+            start_time=f"{rng.randrange(0, 12):02d}:00:00",
+            end_time=f"{rng.randrange(13, 24):02d}:00:00",
+            start_date=None,
+            end_date=None,
+        )
+        for i in range(500 * 5)
+    ]
+    index = AvailabilityIndex(entries)
+
+    shifts = [
+        (date(2030, 1, 7) + timedelta(days=d), f"{h:02d}:00:00", f"{h + 8:02d}:00:00")
+        for d in range(7)
+        for h in range(4, 15)
+        for _ in range(10)
+    ]
+    started = time.perf_counter()
+    results = [index.available(*shift) for shift in shifts]
+    elapsed = time.perf_counter() - started
+    assert elapsed < 1
+
+    # Same answer as checking every entry directly
+    day, start_time, end_time = shifts[0]
+    expected = {
+        e.user_id
+        for e in entries
+        if e.day_of_week == day.weekday()
+        and e.start_time <= start_time
+        and e.end_time >= end_time
+    }
+    assert results[0] == expected
+
+    index.remove(entries[0].id)
+    index.add(entries[0]._replace(day_of_week=(entries[0].day_of_week + 1) % 7))
+    assert len(index) == len(entries)
+
+
+def test_shared_index_stays_incremental_and_sees_other_workers(
+    test_client, auth_headers, count_queries
+):
+    baker = User(username="shared_baker", email="shared_baker@example.com")
+    db.session.add(baker)
+    db.session.commit()
+    index = get_availability_index()
+    # A fresh index costs one lookup of the generation row, not a table scan
+    with count_queries() as statements:
+        assert get_availability_index() is index
+    assert len(statements) == 1 and "availabilities" not in statements[0]
+
+    def add_window(day_of_week):
+        return test_client.post(
+            "/api/availability",
+            json={
+                "userId": baker.id,
+                "dayOfWeek": day_of_week,
+                "startTime": "04:00",
+                "endTime": "14:00",
+            },
+            headers=auth_headers,
+        )
+
+    # This worker's write is applied to a copy; readers keep their snapshot
+    add_window(0)
+    with count_queries() as statements:
+        updated = get_availability_index()
+    assert len(statements) == 1
+    assert updated is not index and len(updated) == len(index) + 1
+    assert get_availability_index() is updated
+
+    # Another worker commits just before this one writes: its row must not
+    # hide behind the generation this worker's write leaves
+    db.session.execute(
+        text(
+            "INSERT INTO availabilities (user_id, day_of_week, start_time, end_time) "
+            "VALUES (:user_id, 2, '04:00', '14:00')"
+        ),
+        {"user_id": baker.id},
+    )
+    db.session.commit()
+    add_window(1)
+    assert baker.id in get_availability_index().available(
+        date(2030, 1, 2), time_of_day(5), time_of_day(13)
+    )
+
+
+def test_overnight_windows_cover_the_next_morning():
+    monday = date(2030, 1, 7)
+    index = AvailabilityIndex(
+        [
+            AvailabilityEntry(1, 10, 0, time_of_day(22), time_of_day(6), None, monday),
+            AvailabilityEntry(2, 20, 1, time_of_day(0), time_of_day(23), None, None),
+        ]
+    )
+    tuesday = monday + timedelta(days=1)
+    assert index.available(tuesday, time_of_day(2), time_of_day(5)) == {10, 20}
+    assert index.available(tuesday, time_of_day(5), time_of_day(7)) == {20}
+    assert index.available(monday, time_of_day(23), time_of_day(5)) == {10}
+    # A week later the window opens after its end date
+    next_tuesday = tuesday + timedelta(days=7)
+    assert index.available(next_tuesday, time_of_day(2), time_of_day(5)) == {20}
+    assert index.weekdays() == {0, 1}
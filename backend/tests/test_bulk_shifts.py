@@ -0,0 +1,119 @@
+# backend/tests/test_bulk_shifts.py
+from datetime import date
+from app.database import db
+from app.models import Shift, ShiftStaff, User
+
+
+def test_bulk_create_shifts_and_assignments(
+    test_client, manager_user, auth_headers, count_queries
+):
+    bakers = [
+        User(
+            username=f"bulk_baker_{i}",
+            email=f"bulk_baker_{i}@example.com",
+            role="baker",
+        )
+        for i in range(3)
+    ]
+    existing = Shift(
+        date=date(2030, 5, 1),
+        start_time="05:00:00",
+        end_time="13:00:00",
+        employee_id=manager_user.id,
+    )
+    db.session.add_all(bakers + [existing])
+    db.session.add(ShiftStaff(shift=existing, staff=bakers[0], status="pending"))
+    db.session.commit()
+
+    shifts = [
+        {
+            "date": f"2030-05-{day:02d}",
+            "startTime": "05:00",
+            "endTime": "13:00",
+            "requiredStaff": 2,
+            "staff": ["bulk_baker_1", "bulk_baker_2"],
+        }
+        for day in range(2, 12)
+    ]
+    assignments = [
+        {"shiftId": existing.id, "username": "bulk_baker_0", "status": "confirmed"},
+        {"shiftId": existing.id, "username": "bulk_baker_1"},
+    ]
+
+    with count_queries() as statements:
+        response = test_client.post(
+            "/api/shifts/bulk",
+            json={"shifts": shifts, "assignments": assignments},
+            headers=auth_headers,
+        )
+    assert response.status_code == 201
+    # The whole batch is published to live clients as a single event
+    notifies = [s for s in statements if "pg_notify" in s]
+    assert len(notifies) == 1
+    # Plus three to refresh the touched days' coverage totals
+    assert len(statements) - len(notifies) <= 11
+
+    created_ids = [result["id"] for result in response.json["shifts"]]
+    assert len(created_ids) == 10
+    assert [a["result"] for a in response.json["assignments"]] == ["updated", "created"]
+
+    assert ShiftStaff.query.filter(ShiftStaff.shift_id.in_(created_ids)).count() == 20
+    statuses = {a.staff.username: a.status for a in existing.staff_assignments}
+    assert statuses == {"bulk_baker_0": "confirmed", "bulk_baker_1": "pending"}
+
+
+def test_bulk_create_is_all_or_nothing(test_client, manager_user, auth_headers):
+    before = Shift.query.count()
+    response = test_client.post(
+        "/api/shifts/bulk",
+        json={
+            "shifts": [
+                {"date": "2030-06-01", "startTime": "05:00", "endTime": "13:00"},
+                {"date": "not-a-date", "startTime": "05:00", "endTime": "13:00"},
+                {
+                    "date": "2030-06-02",
+                    "startTime": "05:00",
+                    "endTime": "13:00",
+                    "staff": ["nobody_by_this_name"],
+                },
+            ],
+            "assignments": [{"shiftId": 999999, "username": "test_manager"}],
+        },
+        headers=auth_headers,
+    )
+    assert response.status_code == 400
+    assert [bool(r["errors"]) for r in response.json["shifts"]] == [False, True, True]
+    assert response.json["assignments"][0]["errors"] == ["Shift not found"]
+    assert Shift.query.count() == before
+
+
+def test_bulk_create_rejects_double_booking_within_batch(
+    test_client, manager_user, auth_headers
+):
+    db.session.add(
+        User(username="bulk_clash", email="bulk_clash@example.com", role="baker")
+    )
+    db.session.commit()
+
+    response = test_client.post(
+        "/api/shifts/bulk",
+        json={
+            "shifts": [
+                {
+                    "date": "2030-07-01",
+                    "startTime": "05:00",
+                    "endTime": "13:00",
+                    "staff": ["bulk_clash"],
+                },
+                {
+                    "date": "2030-07-01",
+                    "startTime": "12:00",
+                    "endTime": "20:00",
+                    "staff": ["bulk_clash"],
+                },
+            ]
+        },
+        headers=auth_headers,
+    )
+    assert response.status_code == 400
+    assert "overlapping" in response.json["shifts"][1]["errors"][0]
@@ -0,0 +1,88 @@
+# backend/tests/test_calendar.py
+from datetime import date, timedelta
+from urllib.parse import urlsplit
+from flask_jwt_extended import create_access_token
+from app import db
+from app.models import Shift, ShiftStaff, User
+
+
+def test_calendar_feed_is_cached_until_the_bakers_shifts_change(
+    test_client, manager_user, auth_headers, count_queries
+):
+    baker, colleague = (
+        User(username=name, email=f"{name}@example.com", role="baker")
+        for name in ["ics_baker", "ics_colleague"]
+    )
+    day = date.today() + timedelta(days=3)
+    shifts = [
+        Shift(
+            date=day + timedelta(days=offset),
+            start_time=start,
+            end_time=end,
+            employee_id=manager_user.id,
+        )
+        for offset, start, end in [
+            (0, "22:00:00", "06:00:00"),
+            (1, "07:00:00", "15:00:00"),
+        ]
+    ]
+    db.session.add_all([baker, colleague, *shifts])
+    db.session.add_all(
+        [
+            ShiftStaff(shift=shifts[0], staff=baker, status="confirmed"),
+            ShiftStaff(shift=shifts[1], staff=baker, status="pending"),
+        ]
+    )
+    db.session.commit()
+    token = create_access_token(identity=baker.id, additional_claims={"role": "baker"})
+
+    response = test_client.post(
+        "/api/calendar/token", headers={"Authorization": f"Bearer {token}"}
+    )
+    assert response.status_code == 201
+    feed_path = urlsplit(response.json["url"]).path
+
+    response = test_client.get(feed_path)
+    assert response.status_code == 200
+    assert response.mimetype == "text/calendar"
+    body = response.get_data(as_text=True)
+    # The overnight shift ends the next morning; the pending one isn't listed
+    assert f"DTSTART:{day:%Y%m%d}T220000\r\n" in body
+    assert f"DTEND:{day + timedelta(days=1):%Y%m%d}T060000\r\n" in body
+    assert body.count("BEGIN:VEVENT") == 1
+    etag, last_modified = response.headers["ETag"], response.headers["Last-Modified"]
+
+    # A colleague's change leaves the feed alone: one query, then a 304
+    test_client.post(
+        f"/api/shifts/{shifts[0].id}/staff",
+        json={"username": "ics_colleague", "status": "confirmed"},
+        headers=auth_headers,
+    )
+    with count_queries() as statements:
+        response = test_client.get(feed_path, headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert len(statements) == 1
+    response = test_client.get(feed_path, headers={"If-Modified-Since": last_modified})
+    assert response.status_code == 304
+
+    test_client.post(
+        f"/api/shifts/{shifts[1].id}/staff",
+        json={"username": "ics_baker", "status": "confirmed"},
+        headers=auth_headers,
+    )
+    response = test_client.get(feed_path, headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.get_data(as_text=True).count("BEGIN:VEVENT") == 2
+    assert response.headers["ETag"] != etag
+    response = test_client.get(feed_path, headers={"If-Modified-Since": last_modified})
+    assert response.status_code == 200
+
+    # A new URL revokes the old one, and revoking leaves none
+    headers = {"Authorization": f"Bearer {token}"}
+    new_path = urlsplit(
+        test_client.post("/api/calendar/token", headers=headers).json["url"]
+    ).path
+    assert test_client.get(feed_path).status_code == 404
+    assert test_client.get(new_path).status_code == 200
+    test_client.delete("/api/calendar/token", headers=headers)
+    assert test_client.get(new_path).status_code == 404
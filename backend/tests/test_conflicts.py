@@ -0,0 +1,127 @@
+# backend/tests/test_conflicts.py
+from datetime import date, time
+from app.database import db
+from app.models import Shift, ShiftStaff, User
+
+
+def add_shift(manager, day, start_time, end_time):
+    shift = Shift(
+        date=day,
+        start_time=start_time,
+        end_time=end_time,
+        required_staff=2,
+        employee_id=manager.id,
+    )
+    db.session.add(shift)
+    return shift
+
+
+def test_assign_staff_rejects_overlapping_booking(
+    test_client, manager_user, auth_headers
+):
+    baker = User(username="clash_baker", email="clash_baker@example.com", role="baker")
+    night = add_shift(manager_user, date(2030, 3, 1), "22:00:00", "06:00:00")
+    morning = add_shift(manager_user, date(2030, 3, 2), "05:00:00", "13:00:00")
+    later = add_shift(manager_user, date(2030, 3, 2), "06:00:00", "14:00:00")
+    db.session.add_all(
+        [baker, ShiftStaff(shift=night, staff=baker, status="confirmed")]
+    )
+    db.session.commit()
+
+    response = test_client.post(
+        f"/api/shifts/{morning.id}/staff",
+        json={"username": "clash_baker", "status": "offered"},
+        headers=auth_headers,
+    )
+    assert response.status_code == 409
+    assert response.json["conflicts"] == {"clash_baker": [night.id]}
+
+    # Back-to-back with the overnight shift is fine
+    response = test_client.post(
+        f"/api/shifts/{later.id}/staff",
+        json={"username": "clash_baker", "status": "offered"},
+        headers=auth_headers,
+    )
+    assert response.status_code == 200
+
+    # Managers can still force a double booking deliberately
+    response = test_client.post(
+        f"/api/shifts/{morning.id}/staff",
+        json={"username": "clash_baker", "status": "offered", "force": True},
+        headers=auth_headers,
+    )
+    assert response.status_code == 200
+
+
+def test_update_shift_rejects_moving_into_a_clash(
+    test_client, manager_user, auth_headers
+):
+    baker = User(username="move_baker", email="move_baker@example.com", role="baker")
+    first = add_shift(manager_user, date(2030, 3, 10), "05:00:00", "13:00:00")
+    second = add_shift(manager_user, date(2030, 3, 10), "13:00:00", "21:00:00")
+    db.session.add_all(
+        [
+            baker,
+            ShiftStaff(shift=first, staff=baker, status="confirmed"),
+            ShiftStaff(shift=second, staff=baker, status="confirmed"),
+        ]
+    )
+    db.session.commit()
+
+    response = test_client.put(
+        f"/api/shifts/{second.id}", json={"startTime": "12:00:00"}, headers=auth_headers
+    )
+    assert response.status_code == 409
+    assert db.session.get(Shift, second.id).start_time == time(13, 0)
+
+
+def test_create_shift_checks_initial_staff(test_client, manager_user, auth_headers):
+    baker = User(username="new_shift_baker", email="nsb@example.com", role="baker")
+    existing = add_shift(manager_user, date(2030, 3, 20), "05:00:00", "13:00:00")
+    db.session.add_all(
+        [baker, ShiftStaff(shift=existing, staff=baker, status="pending")]
+    )
+    db.session.commit()
+
+    payload = {
+        "date": "2030-03-20",
+        "startTime": "10:00:00",
+        "endTime": "18:00:00",
+        "staff": ["new_shift_baker"],
+    }
+    response = test_client.post("/api/shifts", json=payload, headers=auth_headers)
+    assert response.status_code == 409
+
+    payload["startTime"] = "13:00:00"
+    response = test_client.post("/api/shifts", json=payload, headers=auth_headers)
+    assert response.status_code == 201
+    assert [s["username"] for s in response.json["staff"]] == ["new_shift_baker"]
+
+
+def test_conflict_report_lists_every_clash(test_client, manager_user, auth_headers):
+    baker = User(
+        username="report_baker", email="report_baker@example.com", role="baker"
+    )
+    a = add_shift(manager_user, date(2030, 4, 1), "05:00:00", "13:00:00")
+    b = add_shift(manager_user, date(2030, 4, 1), "09:00:00", "17:00:00")
+    c = add_shift(manager_user, date(2030, 4, 1), "12:00:00", "20:00:00")
+    d = add_shift(manager_user, date(2030, 4, 1), "20:00:00", "23:00:00")
+    db.session.add(baker)
+    for shift in [a, b, c, d]:
+        db.session.add(ShiftStaff(shift=shift, staff=baker, status="confirmed"))
+    db.session.commit()
+
+    response = test_client.get(
+        "/api/shifts/conflicts?start=2030-04-01&end=2030-04-01", headers=auth_headers
+    )
+    assert response.status_code == 200
+    pairs = {
+        frozenset(clash["shift_ids"])
+        for clash in response.json["conflicts"]
+        if clash["username"] == "report_baker"
+    }
+    assert pairs == {
+        frozenset([a.id, b.id]),
+        frozenset([a.id, c.id]),
+        frozenset([b.id, c.id]),
+    }
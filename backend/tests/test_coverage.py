@@ -0,0 +1,312 @@
+# backend/tests/test_coverage.py
+from datetime import date, time as time_of_day
+from sqlalchemy import func, select, text
+from app import db
+from app.models import Availability, Shift, ShiftCoverage, ShiftStaff, User
+from app.services.coverage import coverage_query
+from app.services.scheduler import repair_for_availability
+from benchmarks.generate_data import load, parse_args
+
+
+def coverage(test_client, auth_headers, start, end):
+    response = test_client.get(
+        f"/api/shifts/coverage?start={start}&end={end}", headers=auth_headers
+    )
+    assert response.status_code == 200
+    return {
+        day["date"]: (
+            day["shifts"],
+            day["required_staff"],
+            day["confirmed_staff"],
+            day["open_slots"],
+            day["understaffed_shifts"],
+        )
+        for day in response.json["coverage"]
+    }
+
+
+def test_coverage_follows_roster_writes(test_client, manager_user, auth_headers):
+    db.session.add_all(
+        User(username=f"cover_{i}", email=f"cover_{i}@example.com") for i in range(3)
+    )
+    db.session.commit()
+    window = ("2042-03-01", "2042-03-31")
+
+    response = test_client.post(
+        "/api/shifts",
+        json={
+            "date": "2042-03-02",
+            "startTime": "05:00",
+            "endTime": "13:00",
+            "requiredStaff": 2,
+            "staff": ["cover_0", "cover_1"],
+        },
+        headers=auth_headers,
+    )
+    shift_id = response.json["id"]
+    assert coverage(test_client, auth_headers, *window) == {
+        "2042-03-02": (1, 2, 0, 2, 1)
+    }
+
+    for username in ["cover_0", "cover_1", "cover_2"]:
+        test_client.post(
+            f"/api/shifts/{shift_id}/staff",
+            json={"username": username, "status": "confirmed"},
+            headers=auth_headers,
+        )
+    # Overstaffing one shift doesn't fill another's open slots
+    response = test_client.post(
+        "/api/shifts/bulk",
+        json={
+            "shifts": [
+                {
+                    "date": "2042-03-02",
+                    "startTime": "14:00",
+                    "endTime": "20:00",
+                    "requiredStaff": 1,
+                }
+            ]
+        },
+        headers=auth_headers,
+    )
+    assert response.status_code == 201
+    assert coverage(test_client, auth_headers, *window) == {
+        "2042-03-02": (2, 3, 3, 1, 1)
+    }
+
+    # Moving a shift refreshes both the day it left and the day it joined
+    test_client.put(
+        f"/api/shifts/{shift_id}", json={"date": "2042-03-05"}, headers=auth_headers
+    )
+    assert coverage(test_client, auth_headers, *window) == {
+        "2042-03-02": (1, 1, 0, 1, 1),
+        "2042-03-05": (1, 2, 3, 0, 0),
+    }
+
+    # Cancelled shifts don't count
+    db.session.get(Shift, shift_id).status = "cancelled"
+    db.session.commit()
+    test_client.delete(
+        f"/api/shifts/{response.json['shifts'][0]['id']}", headers=auth_headers
+    )
+    assert coverage(test_client, auth_headers, *window) == {}
+
+
+def assert_matches_recompute():
+    """Stored coverage and confirmed counts equal a recompute from scratch."""
+    db.session.expire_all()
+    fresh = {row[0]: row[1:6] for row in db.session.execute(coverage_query(None))}
+    stored = {
+        day.date: (
+            day.shift_count,
+            day.required_staff,
+            day.confirmed_staff,
+            day.open_slots,
+            day.understaffed_shifts,
+        )
+        for day in ShiftCoverage.query
+    }
+    assert stored == fresh
+    recounted = dict(
+        db.session.execute(
+            select(Shift.id, func.count(ShiftStaff.id))
+            .outerjoin(
+                ShiftStaff,
+                (ShiftStaff.shift_id == Shift.id) & (ShiftStaff.status == "confirmed"),
+            )
+            .group_by(Shift.id)
+        ).all()
+    )
+    assert dict(db.session.query(Shift.id, Shift.confirmed_staff_count)) == recounted
+
+
+def test_every_bulk_path_matches_a_full_recompute(
+    test_client, manager_user, auth_headers
+):
+    # Each raw-SQL writer must leave the totals a full rebuild would
+    bakers = [
+        User(username=f"bulk_cover_{i}", email=f"bulk_cover_{i}@example.com")
+        for i in range(4)
+    ]
+    db.session.add_all(bakers)
+    db.session.flush()
+    db.session.add_all(
+        Availability(
+            user_id=baker.id,
+            day_of_week=0,
+            start_time=time_of_day(0),
+            end_time=time_of_day(23, 59),
+        )
+        for baker in bakers
+    )
+    db.session.commit()
+
+    response = test_client.post(
+        "/api/templates",
+        json={
+            "name": "Coverage mornings",
+            "dayOfWeek": 0,
+            "startTime": "04:00",
+            "endTime": "12:00",
+            "requiredStaff": 3,
+        },
+        headers=auth_headers,
+    )
+    test_client.post(
+        "/api/templates/expand",
+        json={
+            "start": "2042-04-01",
+            "end": "2042-04-30",
+            "templateIds": [response.json["id"]],
+        },
+        headers=auth_headers,
+    )
+    assert_matches_recompute()
+
+    response = test_client.post(
+        "/api/shifts/solve",
+        json={"start": "2042-04-01", "end": "2042-04-30"},
+        headers=auth_headers,
+    )
+    assert response.status_code == 200
+    assert_matches_recompute()
+
+    response = test_client.post(
+        "/api/shifts/bulk",
+        json={
+            "shifts": [
+                {
+                    "date": "2042-04-08",
+                    "startTime": "13:00",
+                    "endTime": "21:00",
+                    "requiredStaff": 2,
+                    "staff": ["bulk_cover_0"],
+                }
+            ],
+            "assignments": [
+                {
+                    "shiftId": shift.id,
+                    "username": "bulk_cover_1",
+                    "status": "confirmed",
+                }
+                for shift in Shift.query.filter(Shift.template_id.isnot(None))
+            ],
+        },
+        headers=auth_headers,
+    )
+    assert response.status_code == 201, response.json
+    assert_matches_recompute()
+
+    repair_for_availability(bakers[2].id, date(2042, 4, 1), date(2042, 4, 30))
+    assert_matches_recompute()
+
+    load(
+        parse_args(
+            [
+                "--managers=1",
+                "--bakers=8",
+                "--years=1",
+                "--start=2044-01-01",
+                "--shifts-per-day=2",
+                "--days-available=2",
+                "--prefix=coverage_load",
+                "--keep-indexes",
+            ]
+        )
+    )
+    assert_matches_recompute()
+
+
+def test_coverage_reads_a_primary_key_range(test_client, auth_headers):
+    db.session.execute(text("SET LOCAL enable_seqscan = off"))
+    plan = "\n".join(
+        db.session.scalars(
+            text(
+                "EXPLAIN SELECT * FROM shift_coverage "
+                "WHERE date BETWEEN :start AND :end ORDER BY date"
+            ),
+            {"start": date(2042, 1, 1), "end": date(2042, 12, 31)},
+        )
+    )
+    db.session.rollback()
+    assert "shift_coverage_pkey" in plan
+
+    response = test_client.get("/api/shifts/coverage", headers=auth_headers)
+    assert response.status_code == 400
+
+
+def test_stored_confirmed_counts_and_understaffed_listing(
+    test_client, manager_user, auth_headers, count_queries
+):
+    db.session.add_all(
+        User(username=f"count_{i}", email=f"count_{i}@example.com") for i in range(3)
+    )
+    db.session.commit()
+    ids = [
+        test_client.post(
+            "/api/shifts",
+            json={
+                "date": "2042-06-01",
+                "startTime": start,
+                "endTime": end,
+                "requiredStaff": 2,
+                "staff": ["count_0"],
+            },
+            headers=auth_headers,
+        ).json["id"]
+        for start, end in [("05:00", "13:00"), ("13:00", "21:00")]
+    ]
+
+    def counts():
+        db.session.expire_all()
+        return [
+            db.session.get(Shift, shift_id).confirmed_staff_count for shift_id in ids
+        ]
+
+    for username in ["count_0", "count_1", "count_2"]:
+        test_client.post(
+            f"/api/shifts/{ids[0]}/staff",
+            json={"username": username, "status": "confirmed"},
+            headers=auth_headers,
+        )
+    response = test_client.post(
+        "/api/shifts/bulk",
+        json={
+            "assignments": [
+                {"shiftId": ids[1], "username": "count_0", "status": "confirmed"}
+            ]
+        },
+        headers=auth_headers,
+    )
+    assert response.status_code == 201
+    assert counts() == [3, 1]
+
+    test_client.post(
+        f"/api/shifts/{ids[0]}/staff",
+        json={"username": "count_2", "status": "cancelled"},
+        headers=auth_headers,
+    )
+    assert counts() == [2, 1]
+
+    period = "/api/shifts?start=2042-06-01&end=2042-06-01"
+    with count_queries() as statements:
+        response = test_client.get(
+            f"{period}&understaffed=true&sort=open_slots", headers=auth_headers
+        )
+    assert [shift["id"] for shift in response.json["shifts"]] == [ids[1]]
+    assert response.json["shifts"][0]["title"] == "Shift (1/2)"
+    # The filter reads the stored count; only the preload touches assignments
+    assert "shift_staff" not in statements[0]
+    response = test_client.get(f"{period}&sort=open_slots", headers=auth_headers)
+    assert [shift["id"] for shift in response.json["shifts"]] == [ids[1], ids[0]]
+    assert test_client.get(f"{period}&sort=x", headers=auth_headers).status_code == 400
+
+    # The repair command recounts from the assignments
+    db.session.execute(text("UPDATE shifts SET confirmed_staff_count = 9"))
+    db.session.commit()
+    runner = test_client.application.test_cli_runner()
+    result = runner.invoke(
+        args=["rebuild-coverage", "--start=2042-06-01", "--end=2042-06-01"]
+    )
+    assert result.exit_code == 0, result.output
+    assert counts() == [2, 1]
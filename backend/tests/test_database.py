@@ -0,0 +1,48 @@
+# backend/tests/test_database.py
+from sqlalchemy import create_engine, text
+from app.database import configure_engine, engine_options
+from config import TestingConfig
+
+DATABASE_URI = TestingConfig.SQLALCHEMY_DATABASE_URI
+
+
+def test_engine_options_from_config():
+    options = engine_options(
+        {
+            "DB_POOL_SIZE": 3,
+            "DB_MAX_OVERFLOW": 1,
+            "DB_POOL_TIMEOUT": 2,
+            "DB_POOL_RECYCLE": 600,
+            "DB_POOL_PRE_PING": True,
+            "DB_STATEMENT_TIMEOUT_MS": 1500,
+            "DB_APPLICATION_NAME": "bakery-test",
+        }
+    )
+    assert options["pool_size"] == 3
+    assert options["pool_pre_ping"] is True
+    assert options["connect_args"]["options"] == "-c statement_timeout=1500"
+
+    engine = create_engine(DATABASE_URI, **options)
+    with engine.connect() as conn:
+        assert conn.execute(text("SHOW statement_timeout")).scalar() == "1500ms"
+        assert conn.execute(text("SHOW application_name")).scalar() == "bakery-test"
+    assert engine.pool.size() == 3
+    engine.dispose()
+
+
+def test_pgbouncer_mode_sets_timeout_per_transaction():
+    config = {"PGBOUNCER_MODE": True, "DB_STATEMENT_TIMEOUT_MS": 1500}
+    options = engine_options(config)
+    # PgBouncer refuses the "options" startup parameter
+    assert "options" not in options["connect_args"]
+
+    engine = create_engine(DATABASE_URI, **options)
+    configure_engine(engine, config)
+    with engine.connect() as conn:
+        assert conn.execute(text("SHOW statement_timeout")).scalar() == "1500ms"
+        conn.commit()
+        # The next transaction sets it again rather than relying on the session
+        conn.execute(text("SET statement_timeout = 0"))
+        conn.commit()
+        assert conn.execute(text("SHOW statement_timeout")).scalar() == "1500ms"
+    engine.dispose()
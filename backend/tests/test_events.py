@@ -0,0 +1,57 @@
+# backend/tests/test_events.py
+import json
+import time
+from app.services.roster_events import get_roster_events
+
+
+def next_event(stream):
+    """Next non-keepalive SSE message from a streamed response."""
+    while True:
+        chunk = next(stream).decode()
+        if not chunk.startswith(":"):
+            return chunk
+
+
+def test_shift_events_stream(test_client, manager_user, auth_headers):
+    token = auth_headers["Authorization"].split()[1]
+    response = test_client.get(f"/api/shifts/events?jwt={token}", buffered=False)
+    assert response.status_code == 200
+    assert response.mimetype == "text/event-stream"
+    stream = iter(response.response)
+    assert next(stream).startswith(b"retry:")
+
+    created = test_client.post(
+        "/api/shifts",
+        json={"date": "2036-01-01", "startTime": "05:00", "endTime": "13:00"},
+        headers=auth_headers,
+    )
+
+    message = next_event(stream)
+    assert message.startswith("event: roster\n")
+    event = json.loads(message.split("data: ", 1)[1])
+    assert event == {
+        "type": "shift.created",
+        "start": "2036-01-01",
+        "end": "2036-01-01",
+        "shift_ids": [created.json["id"]],
+    }
+    response.close()
+    assert get_roster_events().subscriber_count() == 0
+
+
+def test_slow_subscriber_is_dropped_without_blocking(test_client):
+    broker = get_roster_events()
+    slow = broker.subscribe()
+    fast = broker.subscribe()
+
+    started = time.perf_counter()
+    for i in range(broker.queue_size + 10):
+        broker.fan_out({"type": "shift.updated", "shift_ids": [i]})
+        # The fast client keeps up
+        assert fast.get(timeout=1)["shift_ids"] == [i]
+    assert time.perf_counter() - started < 1
+
+    assert slow.overflowed
+    assert not fast.overflowed
+    assert broker.subscriber_count() == 1
+    broker.unsubscribe(fast)
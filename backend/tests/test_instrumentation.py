@@ -0,0 +1,80 @@
+# backend/tests/test_instrumentation.py
+import pytest
+from sqlalchemy import event
+from flask_jwt_extended import create_access_token
+from app import create_app
+from app.instrumentation import init_instrumentation
+from app.replicas import init_replicas
+
+
+@pytest.fixture(scope="module")
+def instrumented_client(test_client, manager_user):
+    app = create_app("testing")
+    app.config.update(
+        SERVER_TIMING_HEADER=True, SLOW_REQUEST_MS=0, PROFILE_SAMPLE_RATE=2
+    )
+    init_instrumentation(app)
+    with app.app_context():
+        token = create_access_token(
+            identity=manager_user.id, additional_claims={"role": "manager"}
+        )
+        client = app.test_client()
+        client.environ_base["HTTP_AUTHORIZATION"] = f"Bearer {token}"
+        yield client
+
+
+def test_request_timings(instrumented_client, caplog):
+    for _ in range(4):
+        response = instrumented_client.get(
+            "/api/shifts?start=2040-01-01&end=2040-01-02"
+        )
+        assert response.status_code == 200
+    assert response.headers["Server-Timing"].startswith("app;dur=")
+    assert 'queries"' in response.headers["Server-Timing"]
+    assert "Slow request GET /api/shifts" in caplog.text
+
+    response = instrumented_client.get("/api/instrumentation")
+    assert response.status_code == 200
+    (listing,) = [
+        e for e in response.json["endpoints"] if e["endpoint"] == "/api/shifts"
+    ]
+    assert listing["method"] == "GET"
+    assert listing["count"] == 4
+    # Only the first request missed the range cache
+    assert listing["avg_sql_statements"] == 0.2
+    # One request in two was profiled
+    profiles = response.json["profiles"]
+    assert len(profiles) == 2
+    assert "function calls" in profiles[0]["profile"]
+
+    instrumented_client.delete("/api/instrumentation")
+    response = instrumented_client.get("/api/instrumentation")
+    assert [e["endpoint"] for e in response.json["endpoints"]] == [
+        "/api/instrumentation"
+    ]
+
+
+def test_replica_queries_are_timed(test_client, manager_user):
+    app = create_app("testing")
+    app.config.update(DB_REPLICA_URIS=[app.config["SQLALCHEMY_DATABASE_URI"]])
+    router = init_replicas(app)
+    init_instrumentation(app)
+    replica_statements = []
+    event.listen(
+        router.engines[0],
+        "after_cursor_execute",
+        lambda *args: replica_statements.append(args[2]),
+    )
+    with app.app_context():
+        token = create_access_token(
+            identity=manager_user.id, additional_claims={"role": "manager"}
+        )
+        client = app.test_client()
+        client.environ_base["HTTP_AUTHORIZATION"] = f"Bearer {token}"
+        client.get("/api/shifts?start=2040-02-01&end=2040-02-02")
+        (listing,) = client.get("/api/instrumentation").json["endpoints"]
+    router.dispose()
+
+    # The listing was read from the replica, and its statements still counted
+    assert replica_statements
+    assert listing["avg_sql_statements"] == len(replica_statements)
@@ -0,0 +1,155 @@
+# backend/tests/test_metrics.py
+import re
+import threading
+import pytest
+from app.metrics import _labels
+
+SAMPLE = re.compile(
+    r"^(?P<name>[a-zA-Z_:][a-zA-Z0-9_:]*)"
+    r'(?:\{(?P<labels>(?:[a-zA-Z_][a-zA-Z0-9_]*="(?:[^"\\]|\\.)*",?)*)\})?'
+    r" (?P<value>[-+]?(?:[0-9.e+-]+|Inf|NaN))$"
+)
+LABEL = re.compile(r'([a-zA-Z_][a-zA-Z0-9_]*)="((?:[^"\\]|\\.)*)"')
+
+
+def parse_metrics(text):
+    """Parse the text exposition format, checking it as a scraper would."""
+    types, samples = {}, []
+    assert text.endswith("\n")
+    for line in text.splitlines():
+        if line.startswith("# TYPE "):
+            _, _, name, kind = line.split(" ")
+            assert kind in ("counter", "gauge", "histogram")
+            types[name] = kind
+        elif line.startswith("# HELP "):
+            continue
+        else:
+            match = SAMPLE.match(line)
+            assert match, f"unparseable line: {line!r}"
+            name = match["name"]
+            family = re.sub(r"_(bucket|sum|count)$", "", name)
+            assert name in types or family in types, f"no TYPE for {name}"
+            labels = dict(LABEL.findall(match["labels"] or ""))
+            samples.append((name, labels, float(match["value"])))
+    return types, samples
+
+
+def scrape(client):
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.content_type.startswith("text/plain; version=0.0.4")
+    return parse_metrics(response.get_data(as_text=True))
+
+
+def value(samples, name, **labels):
+    matches = [
+        v
+        for n, l, v in samples
+        if n == name and all(l.get(k) == x for k, x in labels.items())
+    ]
+    assert len(matches) == 1, (name, labels, matches)
+    return matches[0]
+
+
+def test_request_metrics(test_client, auth_headers):
+    for _ in range(3):
+        assert test_client.get("/api/auth/me", headers=auth_headers).status_code == 200
+    assert test_client.get("/api/users", headers=auth_headers).status_code == 200
+    assert (
+        test_client.get(
+            "/api/shifts?start=2040-01-01&end=2040-01-07", headers=auth_headers
+        ).status_code
+        == 200
+    )
+    assert test_client.get("/api/users/999999", headers=auth_headers).status_code == 404
+
+    types, samples = scrape(test_client)
+    assert types["http_requests_total"] == "counter"
+    assert types["http_request_duration_seconds"] == "histogram"
+    assert types["http_requests_in_flight"] == "gauge"
+    assert types["roster_event_subscribers"] == "gauge"
+    assert types["roster_event_subscribers_dropped_total"] == "counter"
+
+    me = {"blueprint": "auth", "route": "/api/auth/me", "method": "GET"}
+    assert value(samples, "http_requests_total", status="200", **me) == 3
+    assert value(samples, "http_request_duration_seconds_count", **me) == 3
+    assert value(samples, "http_request_duration_seconds_sum", **me) > 0
+    assert (
+        value(
+            samples,
+            "http_requests_total",
+            blueprint="users",
+            route="/api/users/<int:user_id>",
+            status="404",
+        )
+        == 1
+    )
+    assert (
+        value(samples, "http_requests_total", blueprint="shifts", route="/api/shifts")
+        == 1
+    )
+
+    # Buckets are cumulative and end at +Inf == count
+    buckets = [
+        (l["le"], v)
+        for n, l, v in samples
+        if n == "http_request_duration_seconds_bucket" and l["route"] == "/api/auth/me"
+    ]
+    counts = [v for _, v in buckets]
+    assert counts == sorted(counts)
+    assert buckets[-1] == ("+Inf", 3)
+
+    # The scrape itself isn't counted, and nothing is left in flight
+    assert not [l for n, l, v in samples if l.get("route") == "/metrics"]
+    assert value(samples, "http_requests_in_flight") == 0
+    assert value(samples, "db_pool_checked_out") >= 0
+    assert value(samples, "db_pool_overflow") >= 0
+    assert "db_pool_size" in types
+
+
+def test_metrics_from_many_threads(test_client, auth_headers):
+    _, samples = scrape(test_client)
+    before = value(samples, "http_requests_total", route="/api/auth/me", status="200")
+    app = test_client.application
+
+    def worker():
+        with app.test_client() as client:
+            for _ in range(5):
+                client.get("/api/auth/me", headers=auth_headers)
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # Exited threads' counts are kept across scrapes
+    for _ in range(2):
+        _, samples = scrape(test_client)
+        after = value(
+            samples, "http_requests_total", route="/api/auth/me", status="200"
+        )
+        assert after == before + 20
+
+
+@pytest.fixture
+def metrics_token(test_client):
+    app = test_client.application
+    app.config["METRICS_TOKEN"] = "scrape-secret"
+    yield "scrape-secret"
+    app.config["METRICS_TOKEN"] = None
+
+
+def test_metrics_token(test_client, metrics_token):
+    assert test_client.get("/metrics").status_code == 401
+    response = test_client.get(
+        "/metrics", headers={"Authorization": f"Bearer {metrics_token}"}
+    )
+    assert response.status_code == 200
+
+
+def test_metrics_label_escaping():
+    assert _labels(route='a"b\\c\nd') == 'route="a\\"b\\\\c\\nd"'
+    labels = _labels(route='a"b')
+    _, samples = parse_metrics(f"# TYPE x counter\nx{{{labels}}} 1\n")
+    assert samples == [("x", {"route": 'a\\"b'}, 1.0)]
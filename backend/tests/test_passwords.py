@@ -0,0 +1,77 @@
+# backend/tests/test_passwords.py
+import pytest
+from werkzeug.security import generate_password_hash
+from app import db
+from app.models import User
+from app.services.passwords import PasswordHasher, normalize_method
+
+FAST = "pbkdf2:sha256:1000"
+
+
+@pytest.fixture
+def hasher(test_client):
+    """Swap in a cheap, pooled hasher for the duration of a test."""
+    extensions = test_client.application.extensions
+    original = extensions["password_hasher"]
+    hasher = extensions["password_hasher"] = PasswordHasher(
+        method=FAST, workers=1, max_pending=1, timeout=1
+    )
+    yield hasher
+    hasher.shutdown()
+    extensions["password_hasher"] = original
+
+
+def test_hashing_on_process_pool(hasher):
+    password_hash = hasher.hash("secret")
+    assert password_hash.startswith(FAST + "$")
+    assert hasher.verify(password_hash, "secret")
+    assert not hasher.verify(password_hash, "wrong")
+    assert not hasher.needs_rehash(password_hash)
+    assert hasher.needs_rehash(generate_password_hash("secret", "scrypt"))
+    assert normalize_method("scrypt") == "scrypt:32768:8:1"
+
+
+def test_pool_start_up_does_not_count_against_the_timeout():
+    # The timeout only bounds the wait for a slot, so a cold pool (which
+    # takes far longer than this to spawn) still answers
+    hasher = PasswordHasher(method=FAST, workers=1, max_pending=1, timeout=0.01)
+    try:
+        assert hasher.verify(hasher.hash("secret"), "secret")
+    finally:
+        hasher.shutdown()
+
+
+def test_login_rehashes_old_hashes(test_client, hasher):
+    user = User(
+        username="rehash_baker",
+        email="rehash@example.com",
+        password_hash=generate_password_hash("secret", "pbkdf2:sha256:500"),
+    )
+    db.session.add(user)
+    db.session.commit()
+
+    response = test_client.post(
+        "/api/auth/login", json={"username": "rehash_baker", "password": "secret"}
+    )
+    assert response.status_code == 200
+    db.session.refresh(user)
+    assert user.password_hash.startswith(FAST + "$")
+
+    response = test_client.post(
+        "/api/auth/login", json={"username": "rehash_baker", "password": "wrong"}
+    )
+    assert response.status_code == 401
+
+
+def test_login_when_hashers_are_busy(test_client, hasher, manager_user):
+    # Every slot is taken, so the login gives up after waiting for one
+    hasher._slots.acquire()
+    try:
+        response = test_client.post(
+            "/api/auth/login",
+            json={"username": manager_user.username, "password": "password"},
+        )
+    finally:
+        hasher._slots.release()
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
@@ -0,0 +1,125 @@
+# backend/tests/test_replicas.py
+import time
+from contextlib import contextmanager
+import pytest
+from flask_jwt_extended import create_access_token
+from sqlalchemy import event
+from app import create_app, db
+from app.models import User
+from app.replicas import STICKY_HEADER, init_replicas
+
+
+@pytest.fixture(scope="module")
+def replica_app(test_client):
+    app = create_app("testing")
+    # The test database stands in for the replica, through its own engine
+    app.config.update(
+        DB_REPLICA_URIS=[app.config["SQLALCHEMY_DATABASE_URI"]],
+        REPLICA_STICKY_SECONDS=2,
+    )
+    router = init_replicas(app)
+    yield app
+    router.dispose()
+
+
+@pytest.fixture(scope="module")
+def tokens(replica_app, manager_user):
+    baker = User(username="replica_baker", email="replica_baker@example.com")
+    db.session.add(baker)
+    db.session.commit()
+    with replica_app.app_context():
+        return {
+            role: {
+                "Authorization": "Bearer "
+                + create_access_token(
+                    identity=user_id, additional_claims={"role": role}
+                )
+            }
+            for role, user_id in [("manager", manager_user.id), ("baker", baker.id)]
+        }
+
+
+@pytest.fixture
+def routed(replica_app):
+    """Count the statements each engine runs inside a ``with`` block."""
+
+    @contextmanager
+    def counter():
+        counts = {"primary": 0, "replica": 0}
+        with replica_app.app_context():
+            engines = {
+                "primary": db.engine,
+                "replica": replica_app.extensions["db_replicas"].engines[0],
+            }
+
+        def listener(name):
+            def count(*args):
+                counts[name] += 1
+
+            return count
+
+        listeners = {name: listener(name) for name in engines}
+        for name, engine in engines.items():
+            event.listen(engine, "before_cursor_execute", listeners[name])
+        try:
+            yield counts
+        finally:
+            for name, engine in engines.items():
+                event.remove(engine, "before_cursor_execute", listeners[name])
+
+    return counter
+
+
+def test_reads_go_to_replica_until_user_writes(
+    replica_app, tokens, routed, manager_user
+):
+    client = replica_app.test_client()
+    user_url = f"/api/users/{manager_user.id}"
+
+    with routed() as counts:
+        assert client.get(user_url, headers=tokens["manager"]).status_code == 200
+    assert counts["primary"] == 0 and counts["replica"] > 0
+
+    with routed() as counts:
+        response = client.post(
+            "/api/shifts",
+            json={"date": "2041-03-01", "startTime": "06:00", "endTime": "14:00"},
+            headers=tokens["manager"],
+        )
+    assert response.status_code == 201
+    assert counts["replica"] == 0
+    until = float(response.headers[STICKY_HEADER])
+    assert time.time() < until <= time.time() + 2
+
+    # The writer reads their own write from the primary...
+    with routed() as counts:
+        response = client.get(user_url, headers=tokens["manager"])
+    assert response.status_code == 200
+    assert counts["replica"] == 0 and counts["primary"] > 0
+
+    # ...others stay on the replica, except for refilling the shared listing
+    # cache the write just emptied
+    with routed() as counts:
+        client.get(user_url, headers=tokens["baker"])
+    assert counts["primary"] == 0
+    with routed() as counts:
+        response = client.get(
+            "/api/shifts?start=2041-03-01&end=2041-03-07", headers=tokens["baker"]
+        )
+    assert len(response.json["shifts"]) == 1
+    assert counts["replica"] == 0 and counts["primary"] > 0
+
+
+def test_sticky_header_from_another_worker(replica_app, tokens, routed, manager_user):
+    client = replica_app.test_client()
+    user_url = f"/api/users/{manager_user.id}"
+    headers = {**tokens["baker"], STICKY_HEADER: str(time.time() + 1)}
+    with routed() as counts:
+        client.get(user_url, headers=headers)
+    assert counts["replica"] == 0 and counts["primary"] > 0
+
+    # A window longer than the configured one is ignored
+    headers[STICKY_HEADER] = str(time.time() + 3600)
+    with routed() as counts:
+        client.get(user_url, headers=headers)
+    assert counts["primary"] == 0 and counts["replica"] > 0
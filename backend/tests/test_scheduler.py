@@ -0,0 +1,360 @@
+# backend/tests/test_scheduler.py
+import random
+import time
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from flask_jwt_extended import create_access_token
+from app.database import db
+from app.models import Availability, Shift, ShiftStaff, User
+from app.services.conflicts import BusyCalendar
+from app.services.scheduler import OpenShift, RosterSolver, rank_open_slots
+from app.utils import helpers
+from app.utils.helpers import shift_bounds
+
+
+def add_baker(username, windows):
+    baker = User(username=username, email=f"{username}@example.com", role="baker")
+    db.session.add(baker)
+    for window in windows:
+        db.session.add(Availability(user=baker, **window))
+    return baker
+
+
+def add_shift(manager, day, start_time, end_time, required_staff):
+    shift = Shift(
+        date=day,
+        start_time=start_time,
+        end_time=end_time,
+        required_staff=required_staff,
+        employee_id=manager.id,
+    )
+    db.session.add(shift)
+    return shift
+
+
+def test_busy_calendar_handles_overnight_shifts():
+    busy = BusyCalendar()
+    busy.add(1, *shift_bounds(date(2030, 1, 3), "22:00:00", "06:00:00"))
+
+    assert not busy.is_free(1, *shift_bounds(date(2030, 1, 4), "05:00:00", "13:00:00"))
+    assert busy.is_free(1, *shift_bounds(date(2030, 1, 4), "06:00:00", "14:00:00"))
+    assert busy.is_free(2, *shift_bounds(date(2030, 1, 4), "05:00:00", "13:00:00"))
+
+
+def test_solve_respects_availability_and_overlaps(
+    test_client, manager_user, auth_headers
+):
+    thursday = date(2030, 1, 3)
+    all_day = {"day_of_week": 3, "start_time": "00:00:00", "end_time": "23:59:00"}
+    mornings = {"day_of_week": 3, "start_time": "04:00:00", "end_time": "13:00:00"}
+
+    add_baker("solver_any", [all_day])
+    add_baker("solver_morning", [mornings])
+    add_baker(
+        "solver_seasonal",
+        [dict(all_day, start_date=date(2030, 2, 1), end_date=date(2030, 2, 28))],
+    )
+    add_baker("solver_friday", [dict(all_day, day_of_week=4)])
+
+    morning = add_shift(manager_user, thursday, "05:00:00", "13:00:00", 2)
+    overlapping = add_shift(manager_user, thursday, "09:00:00", "17:00:00", 1)
+    afternoon = add_shift(manager_user, thursday, "13:00:00", "21:00:00", 1)
+    db.session.commit()
+
+    response = test_client.post(
+        "/api/shifts/solve",
+        json={"start": "2030-01-03", "end": "2030-01-03"},
+        headers=auth_headers,
+    )
+    assert response.status_code == 200
+
+    staffed = defaultdict(set)
+    for assignment in ShiftStaff.query.all():
+        staffed[assignment.shift_id].add(assignment.staff.username)
+
+    # Only the two bakers available on this Thursday can be placed, and
+    # neither may work the 09:00 shift alongside the morning one
+    assert staffed[morning.id] == {"solver_any", "solver_morning"}
+    assert staffed[overlapping.id] == set()
+    assert staffed[afternoon.id] == {"solver_any"}
+    assert {"shift_id": overlapping.id, "missing": 1} in response.json["unfilled"]
+
+
+def test_solve_requires_manager(test_client):
+    baker = add_baker("solver_not_manager", [])
+    db.session.commit()
+
+    token = create_access_token(identity=baker.id, additional_claims={"role": "baker"})
+    response = test_client.post(
+        "/api/shifts/solve",
+        json={"start": "2030-01-03", "end": "2030-01-03"},
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    assert response.status_code == 403
+
+
+def test_solver_scales_to_a_month_of_shifts():
+    rng = random.Random(42)
+    bakers = list(range(1, 301))
+    times = [
+        ("05:00:00", "13:00:00"),
+        ("13:00:00", "21:00:00"),
+        ("21:00:00", "05:00:00"),
+    ]
+
+    shifts, eligible = [], {}
+    shift_id = 0
+    for offset in range(30):
+        day = date(2030, 1, 1) + timedelta(days=offset)
+        for site in range(35):
+            for start_time, end_time in times:
+                shift_id += 1
+                start, end = shift_bounds(day, start_time, end_time)
+                shifts.append(OpenShift(shift_id, start, end, 2))
+                eligible[shift_id] = sorted(rng.sample(bakers, 60))
+
+    started = time.perf_counter()
+    solver = RosterSolver(shifts, eligible, BusyCalendar(), defaultdict(float))
+    assignments = solver.solve()
+    elapsed = time.perf_counter() - started
+
+    assert len(shifts) > 3000
+    assert elapsed < 10
+
+    # No baker is double-booked and every seat is within eligibility
+    bounds = {shift.id: (shift.start, shift.end) for shift in shifts}
+    check = BusyCalendar()
+    for shift_id, staff_id in sorted(assignments, key=lambda a: bounds[a[0]]):
+        assert staff_id in eligible[shift_id]
+        assert check.is_free(staff_id, *bounds[shift_id])
+        check.add(staff_id, *bounds[shift_id])
+
+
+def snapshot():
+    return {(a.shift_id, a.staff_id): a.status for a in ShiftStaff.query.all()}
+
+
+def test_cancellation_repairs_only_the_affected_shift(
+    test_client, manager_user, auth_headers
+):
+    friday = date(2030, 1, 4)
+    all_day = {"day_of_week": 4, "start_time": "00:00:00", "end_time": "23:59:00"}
+    for i in range(4):
+        add_baker(f"repair_{i}", [all_day])
+    first = add_shift(manager_user, friday, "05:00:00", "13:00:00", 1)
+    add_shift(manager_user, friday, "13:00:00", "21:00:00", 1)
+    db.session.commit()
+
+    test_client.post(
+        "/api/shifts/solve",
+        json={"start": "2030-01-04", "end": "2030-01-04"},
+        headers=auth_headers,
+    )
+    before = snapshot()
+    sick = ShiftStaff.query.filter_by(shift_id=first.id).one()
+
+    response = test_client.post(
+        f"/api/shifts/{first.id}/staff",
+        json={"username": sick.staff.username, "status": "cancelled", "repair": True},
+        headers=auth_headers,
+    )
+    assert response.status_code == 200
+
+    added = response.json["repair"]["assignments"]
+    assert len(added) == 1
+    assert added[0]["shift_id"] == first.id
+    assert added[0]["staff_id"] != sick.staff_id
+
+    # Every other assignment is exactly as it was
+    after = snapshot()
+    changed = {key for key in after if before.get(key) != after[key]}
+    assert changed == {(first.id, sick.staff_id), (first.id, added[0]["staff_id"])}
+
+
+def test_availability_change_cancels_uncovered_assignments(
+    test_client, manager_user, auth_headers
+):
+    saturday = date(2030, 1, 5)
+    all_day = {"day_of_week": 5, "start_time": "00:00:00", "end_time": "23:59:00"}
+    leaving = add_baker("availability_leaving", [all_day])
+    add_baker("availability_cover", [all_day])
+    shift = add_shift(manager_user, saturday, "05:00:00", "13:00:00", 1)
+    db.session.add(ShiftStaff(shift=shift, staff=leaving, status="offered"))
+    db.session.commit()
+
+    Availability.query.filter_by(user_id=leaving.id).delete()
+    db.session.commit()
+
+    response = test_client.post(
+        "/api/shifts/solve",
+        json={"staffId": leaving.id, "start": "2030-01-05", "end": "2030-01-05"},
+        headers=auth_headers,
+    )
+    assert response.status_code == 200
+    assert response.json["cancelled"] == [
+        {"shift_id": shift.id, "staff_id": leaving.id}
+    ]
+    assert [a["shift_id"] for a in response.json["assignments"]] == [shift.id]
+
+    statuses = {a.staff.username: a.status for a in shift.staff_assignments}
+    assert statuses == {
+        "availability_leaving": "cancelled",
+        "availability_cover": "offered",
+    }
+
+
+def test_availability_writes_repair_upcoming_shifts(
+    test_client, manager_user, auth_headers
+):
+    day = date.today() + timedelta(days=3)
+    window = {
+        "day_of_week": day.weekday(),
+        "start_time": "00:00:00",
+        "end_time": "23:59:00",
+    }
+    leaving = add_baker("auto_repair_leaving", [window])
+    add_baker("auto_repair_cover", [window])
+    shift = add_shift(manager_user, day, "05:00:00", "13:00:00", 1)
+    db.session.add(ShiftStaff(shift=shift, staff=leaving, status="offered"))
+    db.session.commit()
+
+    availability_id = Availability.query.filter_by(user_id=leaving.id).one().id
+    response = test_client.delete(
+        f"/api/availability/{availability_id}", headers=auth_headers
+    )
+    assert response.status_code == 200
+    repair = response.json["repair"]
+    assert repair["cancelled"] == [{"shift_id": shift.id, "staff_id": leaving.id}]
+    assert [a["shift_id"] for a in repair["assignments"]] == [shift.id]
+
+
+def test_bakers_own_availability_edit_only_offers_them_new_shifts(
+    test_client, manager_user, monkeypatch, caplog
+):
+    day = date.today() + timedelta(days=4)
+    baker = add_baker(
+        "own_repair_baker",
+        [{"day_of_week": day.weekday(), "start_time": "04:00", "end_time": "14:00"}],
+    )
+    other = add_baker(
+        "own_repair_other",
+        [{"day_of_week": day.weekday(), "start_time": "00:00", "end_time": "23:59"}],
+    )
+    covered = add_shift(manager_user, day, "05:00:00", "13:00:00", 1)
+    evening = add_shift(manager_user, day, "15:00:00", "21:00:00", 2)
+    db.session.commit()
+    token = create_access_token(identity=baker.id, additional_claims={"role": "baker"})
+    headers = {"Authorization": f"Bearer {token}"}
+    availability_id = Availability.query.filter_by(user_id=baker.id).one().id
+
+    response = test_client.put(
+        f"/api/availability/{availability_id}?refill=true",
+        json={"endTime": "23:00"},
+        headers=headers,
+    )
+    assert response.status_code == 403
+
+    # Only the evening shift is newly covered, and only this baker is offered
+    response = test_client.put(
+        f"/api/availability/{availability_id}",
+        json={"endTime": "23:00"},
+        headers=headers,
+    )
+    assert response.status_code == 200
+    assert response.json["repair"]["assignments"] == [
+        {"shift_id": evening.id, "staff_id": baker.id, "status": "offered"}
+    ]
+    assert not ShiftStaff.query.filter_by(shift_id=covered.id).count()
+    assert not ShiftStaff.query.filter_by(staff_id=other.id).count()
+
+    # The edit is committed even when the repair fails
+    def broken_repair(*args, **kwargs):
+        raise RuntimeError("solver down")
+
+    monkeypatch.setattr(
+        "app.routes.availability.repair_for_availability", broken_repair
+    )
+    response = test_client.put(
+        f"/api/availability/{availability_id}",
+        json={"endTime": "22:00"},
+        headers=headers,
+    )
+    assert response.status_code == 200
+    assert response.json["end_time"] == "22:00:00"
+    assert response.json["repair"] == {"message": "Roster repair failed"}
+    assert "Roster repair after availability change failed" in caplog.text
+
+
+def test_open_slots_ranked_with_free_candidates(
+    test_client, manager_user, auth_headers, count_queries, monkeypatch
+):
+    sunday = date(2043, 3, 1)
+    all_day = {"day_of_week": 6, "start_time": "00:00:00", "end_time": "23:59:00"}
+    worked, fresh, busy, on_shift = (
+        add_baker(f"open_{name}", [all_day])
+        for name in ["worked", "fresh", "busy", "on_shift"]
+    )
+    add_baker("open_monday", [dict(all_day, day_of_week=0)])
+
+    near = add_shift(manager_user, sunday, "05:00:00", "13:00:00", 2)
+    later = add_shift(
+        manager_user, sunday + timedelta(days=7), "05:00:00", "13:00:00", 1
+    )
+    overlapping = add_shift(manager_user, sunday, "09:00:00", "17:00:00", 1)
+    evening = add_shift(manager_user, sunday, "21:00:00", "23:00:00", 1)
+    for shift, baker, status in [
+        (near, on_shift, "pending"),
+        (overlapping, busy, "confirmed"),
+        (evening, worked, "confirmed"),
+    ]:
+        db.session.add(ShiftStaff(shift=shift, staff=baker, status=status))
+    db.session.commit()
+
+    with count_queries() as statements:
+        response = test_client.get(
+            "/api/shifts/open-slots?start=2043-03-01&end=2043-03-08&candidates=2",
+            headers=auth_headers,
+        )
+    assert response.status_code == 200
+    assert len(statements) <= 5
+
+    # Fully staffed shifts drop out; the sooner gap ranks first. The pending
+    # baker is already on the shift and the busy one works at the same time
+    slots = response.json["open_slots"]
+    assert [slot["shift_id"] for slot in slots] == [near.id, later.id]
+    assert slots[0]["open_slots"] == 2
+    assert [c["username"] for c in slots[0]["candidates"]] == [
+        "open_fresh",
+        "open_worked",
+    ]
+    assert [c["username"] for c in slots[1]["candidates"]] == [
+        "open_fresh",
+        "open_worked",
+    ]
+    assert slots[1]["candidates"][1]["hours_worked"] == 2.0
+
+    period = "/api/shifts/open-slots?start=2043-03-01&end=2043-03-08"
+    response = test_client.get(f"{period}&candidates=0", headers=auth_headers)
+    assert response.status_code == 400
+    token = create_access_token(identity=fresh.id, additional_claims={"role": "baker"})
+    response = test_client.get(period, headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == 403
+
+    # "Now" is the bakery's wall clock, not UTC: at 06:00 local (02:00 UTC)
+    # the 05:00 shift has started
+    class BakeryClock(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return datetime(2043, 3, 1, 6, 0)
+
+        @classmethod
+        def utcnow(cls):
+            return datetime(2043, 3, 1, 2, 0)
+
+    monkeypatch.setattr(helpers, "datetime", BakeryClock)
+    slots = rank_open_slots(sunday, sunday + timedelta(days=7))["open_slots"]
+    assert [slot["shift_id"] for slot in slots] == [later.id]
+    slots = rank_open_slots(
+        sunday, sunday + timedelta(days=7), now=datetime(2043, 3, 1, 4, 0)
+    )["open_slots"]
+    assert [slot["shift_id"] for slot in slots] == [near.id, later.id]
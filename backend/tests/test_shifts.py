@@ -0,0 +1,151 @@
+# backend/tests/test_shifts.py
+from datetime import date, datetime, time, timedelta
+from app.database import db
+from app.models import Shift, ShiftStaff, User
+from app.signals import notify_roster_changed
+
+
+def create_roster(manager, start, days, bakers_per_shift):
+    """Create two shifts per day, each with a mix of assignment statuses."""
+    bakers = [
+        User(
+            username=f"baker_{start.isoformat()}_{i}",
+            email=f"baker_{start.isoformat()}_{i}@example.com",
+            role="baker",
+        )
+        for i in range(bakers_per_shift)
+    ]
+    db.session.add_all(bakers)
+
+    for offset in range(days):
+        for start_time, end_time in [
+            ("05:00:00", "13:00:00"),
+            ("13:00:00", "21:00:00"),
+        ]:
+            shift = Shift(
+                date=start + timedelta(days=offset),
+                start_time=start_time,
+                end_time=end_time,
+                required_staff=2,
+                employee_id=manager.id,
+            )
+            db.session.add(shift)
+            for i, baker in enumerate(bakers):
+                status = "confirmed" if i % 2 == 0 else "pending"
+                db.session.add(ShiftStaff(shift=shift, staff=baker, status=status))
+
+    db.session.commit()
+    notify_roster_changed(start, start + timedelta(days=days - 1))
+
+
+def test_get_shifts_confirmed_count(test_client, manager_user, auth_headers):
+    create_roster(manager_user, date(2030, 1, 1), days=1, bakers_per_shift=3)
+
+    response = test_client.get(
+        "/api/shifts?start=2030-01-01&end=2030-01-01", headers=auth_headers
+    )
+    assert response.status_code == 200
+
+    shifts = response.json["shifts"]
+    assert len(shifts) == 2
+    for shift in shifts:
+        assert shift["title"] == "Shift (2/2)"
+        assert len(shift["staff"]) == 3
+        assert shift["start"] < shift["end"]
+
+
+def test_get_shifts_query_count_is_bounded(
+    test_client, manager_user, auth_headers, count_queries
+):
+    url = "/api/shifts?start=2031-01-01&end=2031-12-31"
+
+    create_roster(manager_user, date(2031, 1, 1), days=2, bakers_per_shift=2)
+    db.session.expire_all()
+    with count_queries() as small:
+        response = test_client.get(url, headers=auth_headers)
+    assert len(response.json["shifts"]) == 4
+
+    create_roster(manager_user, date(2031, 2, 1), days=30, bakers_per_shift=6)
+    db.session.expire_all()
+    with count_queries() as large:
+        response = test_client.get(url, headers=auth_headers)
+    assert len(response.json["shifts"]) == 64
+
+    assert len(large) == len(small)
+    assert len(large) <= 3
+
+
+def test_assign_staff_updates_existing_assignment(
+    test_client, manager_user, auth_headers
+):
+    create_roster(manager_user, date(2032, 1, 1), days=1, bakers_per_shift=1)
+    shift = Shift.query.filter_by(date=date(2032, 1, 1)).first()
+    baker = shift.staff_assignments[0].staff
+
+    for status in ["offered", "confirmed"]:
+        response = test_client.post(
+            f"/api/shifts/{shift.id}/staff",
+            json={"username": baker.username, "status": status},
+            headers=auth_headers,
+        )
+        assert response.status_code == 200
+
+    assignments = ShiftStaff.query.filter_by(shift_id=shift.id).all()
+    assert [a.status for a in assignments] == ["confirmed"]
+
+
+def test_overnight_shift_timestamps_in_python_and_sql(
+    test_client, manager_user, auth_headers
+):
+    night = Shift(
+        date=date(2033, 1, 1),
+        start_time=time(22, 0),
+        end_time=time(6, 0),
+        employee_id=manager_user.id,
+    )
+    db.session.add(night)
+    db.session.commit()
+
+    assert night.ends_at == datetime(2033, 1, 2, 6, 0)
+    overlapping = Shift.query.filter(
+        Shift.starts_at < datetime(2033, 1, 2, 8, 0),
+        Shift.ends_at > datetime(2033, 1, 2, 5, 0),
+    ).all()
+    assert overlapping == [night]
+
+    response = test_client.get(
+        "/api/shifts?start=2033-01-01&end=2033-01-01", headers=auth_headers
+    )
+    assert response.json["shifts"][0]["end"] == "2033-01-02T06:00:00"
+
+
+def test_get_shifts_conditional_get(
+    test_client, manager_user, auth_headers, count_queries
+):
+    url = "/api/shifts?start=2034-01-01&end=2034-01-07"
+    create_roster(manager_user, date(2034, 1, 1), days=2, bakers_per_shift=1)
+
+    first = test_client.get(url, headers=auth_headers)
+    etag = first.headers["ETag"]
+    assert not etag.startswith("W/")
+
+    with count_queries() as statements:
+        response = test_client.get(url, headers={**auth_headers, "If-None-Match": etag})
+    assert response.status_code == 304
+    assert statements == []
+
+    # A write elsewhere leaves the cached range alone
+    create_roster(manager_user, date(2034, 3, 1), days=1, bakers_per_shift=1)
+    response = test_client.get(url, headers={**auth_headers, "If-None-Match": etag})
+    assert response.status_code == 304
+
+    shift = Shift.query.filter_by(date=date(2034, 1, 1)).first()
+    response = test_client.put(
+        f"/api/shifts/{shift.id}", json={"status": "has-shift"}, headers=auth_headers
+    )
+    assert response.status_code == 200
+
+    response = test_client.get(url, headers={**auth_headers, "If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert response.json["shifts"][0]["status"] == "has-shift"
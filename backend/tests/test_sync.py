@@ -0,0 +1,146 @@
+# backend/tests/test_sync.py
+from datetime import datetime, timedelta
+from app.database import db
+from app.models import ShiftStaff, Tombstone, User
+from app.services.sync import prune_tombstones
+
+URL = "/api/shifts?start=2035-01-01&end=2035-01-31"
+
+
+def sync(test_client, auth_headers, cursor):
+    response = test_client.get(f"{URL}&since={cursor}", headers=auth_headers)
+    assert response.status_code == 200
+    return response.json
+
+
+def test_delta_sync(test_client, manager_user, auth_headers):
+    test_client.application.config["SYNC_CURSOR_OVERLAP"] = 0
+    bakers = [
+        User(username=f"sync_baker_{i}", email=f"sync_baker_{i}@example.com")
+        for i in range(2)
+    ]
+    db.session.add_all(bakers)
+    db.session.commit()
+
+    shift_ids = []
+    for day in ["2035-01-01", "2035-01-02"]:
+        response = test_client.post(
+            "/api/shifts",
+            json={
+                "date": day,
+                "startTime": "05:00",
+                "endTime": "13:00",
+                "staff": ["sync_baker_0"],
+            },
+            headers=auth_headers,
+        )
+        shift_ids.append(response.json["id"])
+    kept, removed = shift_ids
+
+    cursor = test_client.get(URL, headers=auth_headers).json["cursor"]
+    assert sync(test_client, auth_headers, cursor)["shifts"] == []
+
+    # An assignment change alone marks its shift as changed
+    test_client.post(
+        f"/api/shifts/{kept}/staff",
+        json={"username": "sync_baker_1", "status": "offered"},
+        headers=auth_headers,
+    )
+    delta = sync(test_client, auth_headers, cursor)
+    assert [shift["id"] for shift in delta["shifts"]] == [kept]
+    assert len(delta["shifts"][0]["staff"]) == 2
+    cursor = delta["cursor"]
+
+    # So does one made through the bulk endpoint's executemany UPDATE
+    test_client.post(
+        "/api/shifts/bulk",
+        json={
+            "assignments": [
+                {"shiftId": kept, "username": "sync_baker_1", "status": "confirmed"}
+            ]
+        },
+        headers=auth_headers,
+    )
+    delta = sync(test_client, auth_headers, cursor)
+    assert [shift["id"] for shift in delta["shifts"]] == [kept]
+    cursor = delta["cursor"]
+
+    assignment_id = ShiftStaff.query.filter_by(shift_id=removed).one().id
+    response = test_client.delete(f"/api/shifts/{removed}", headers=auth_headers)
+    assert response.status_code == 200
+
+    delta = sync(test_client, auth_headers, cursor)
+    assert delta["shifts"] == []
+    assert delta["deleted"] == {"shifts": [removed], "assignments": [assignment_id]}
+
+    # Deletions outside the requested range are not reported
+    response = test_client.get(
+        f"/api/shifts?start=2035-02-01&end=2035-02-28&since={cursor}",
+        headers=auth_headers,
+    )
+    assert response.json["deleted"] == {"shifts": [], "assignments": []}
+
+
+def test_delta_sync_reports_shifts_moved_out_of_range(
+    test_client, manager_user, auth_headers
+):
+    test_client.application.config["SYNC_CURSOR_OVERLAP"] = 0
+    response = test_client.post(
+        "/api/shifts",
+        json={"date": "2035-01-10", "startTime": "05:00", "endTime": "13:00"},
+        headers=auth_headers,
+    )
+    shift_id = response.json["id"]
+    cursor = test_client.get(URL, headers=auth_headers).json["cursor"]
+    february = "/api/shifts?start=2035-02-01&end=2035-02-28"
+    february_cursor = test_client.get(february, headers=auth_headers).json["cursor"]
+
+    # Moving within the range is a change, not a deletion
+    test_client.put(
+        f"/api/shifts/{shift_id}", json={"date": "2035-01-20"}, headers=auth_headers
+    )
+    delta = sync(test_client, auth_headers, cursor)
+    assert [shift["id"] for shift in delta["shifts"]] == [shift_id]
+    assert delta["deleted"]["shifts"] == []
+
+    test_client.put(
+        f"/api/shifts/{shift_id}", json={"date": "2035-02-10"}, headers=auth_headers
+    )
+    delta = sync(test_client, auth_headers, delta["cursor"])
+    assert delta["shifts"] == []
+    assert delta["deleted"]["shifts"] == [shift_id]
+    # The range it moved into sees it as changed
+    response = test_client.get(
+        f"{february}&since={february_cursor}", headers=auth_headers
+    )
+    assert [shift["id"] for shift in response.json["shifts"]] == [shift_id]
+    assert response.json["deleted"]["shifts"] == []
+
+
+def test_delta_sync_rejects_bad_cursors(test_client, auth_headers):
+    response = test_client.get(f"{URL}&since=yesterday", headers=auth_headers)
+    assert response.status_code == 400
+
+    expired = (datetime.utcnow() - timedelta(days=365)).isoformat()
+    response = test_client.get(f"{URL}&since={expired}", headers=auth_headers)
+    assert response.status_code == 410
+
+
+def test_tombstones_are_pruned_after_retention(test_client):
+    db.session.add(
+        Tombstone(
+            entity="shift",
+            entity_id=1,
+            shift_id=1,
+            shift_date=datetime(2020, 1, 1).date(),
+            deleted_at=datetime.utcnow() - timedelta(days=365),
+        )
+    )
+    db.session.commit()
+    assert prune_tombstones() >= 1
+    assert (
+        Tombstone.query.filter(
+            Tombstone.deleted_at < datetime.utcnow() - timedelta(days=30)
+        ).count()
+        == 0
+    )
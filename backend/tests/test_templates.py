@@ -0,0 +1,130 @@
+# backend/tests/test_templates.py
+import time
+from datetime import date, timedelta
+from app.database import db
+from app.models import Shift, ShiftTemplate
+
+
+def test_template_crud_and_expansion(test_client, manager_user, auth_headers):
+    response = test_client.post(
+        "/api/templates",
+        json={
+            "name": "Thursday morning",
+            "dayOfWeek": 3,
+            "startTime": "05:00",
+            "endTime": "13:00",
+            "requiredStaff": 2,
+        },
+        headers=auth_headers,
+    )
+    assert response.status_code == 201
+    template_id = response.json["id"]
+    assert response.json["start_time"] == "05:00:00"
+
+    # January 2030 has five Thursdays
+    response = test_client.post(
+        "/api/templates/expand",
+        json={"start": "2030-01-01", "end": "2030-01-31", "templateIds": [template_id]},
+        headers=auth_headers,
+    )
+    assert response.status_code == 201
+    assert response.json == {"created": 5, "skipped": 0}
+
+    shifts = Shift.query.filter_by(template_id=template_id).order_by(Shift.date).all()
+    assert [s.date.weekday() for s in shifts] == [3] * 5
+    assert shifts[0].date == date(2030, 1, 3)
+    assert all(s.required_staff == 2 and s.status == "draft" for s in shifts)
+
+    # Overlapping re-run only adds the new weeks
+    response = test_client.post(
+        "/api/templates/expand",
+        json={"start": "2030-01-15", "end": "2030-02-14", "templateIds": [template_id]},
+        headers=auth_headers,
+    )
+    assert response.json == {"created": 2, "skipped": 3}
+    assert Shift.query.filter_by(template_id=template_id).count() == 7
+
+    response = test_client.delete(f"/api/templates/{template_id}", headers=auth_headers)
+    assert response.status_code == 200
+    assert Shift.query.filter_by(template_id=None).count() >= 7
+
+
+def test_expanding_a_year_for_many_locations(test_client, manager_user, auth_headers):
+    templates = [
+        ShiftTemplate(
+            name=f"Site {site} {start_time}",
+            day_of_week=day_of_week,
+            start_time=start_time,
+            end_time=end_time,
+            required_staff=2,
+            employee_id=manager_user.id,
+        )
+        for site in range(20)
+        for day_of_week in range(7)
+        for start_time, end_time in [("05:00:00", "13:00:00"), ("13:00:00", "21:00:00")]
+    ]
+    db.session.add_all(templates)
+    db.session.commit()
+    template_ids = [t.id for t in templates]
+
+    started = time.perf_counter()
+    response = test_client.post(
+        "/api/templates/expand",
+        json={"start": "2031-01-01", "end": "2031-12-31", "templateIds": template_ids},
+        headers=auth_headers,
+    )
+    elapsed = time.perf_counter() - started
+
+    assert response.json == {"created": 20 * 2 * 365, "skipped": 0}
+    assert elapsed < 10
+
+
+def test_expansion_skips_deleted_and_moved_shifts(
+    test_client, manager_user, auth_headers
+):
+    response = test_client.post(
+        "/api/templates",
+        json={
+            "name": "Friday night",
+            "dayOfWeek": 4,
+            "startTime": "22:00",
+            "endTime": "06:00",
+        },
+        headers=auth_headers,
+    )
+    template_id = response.json["id"]
+    expand = {"start": "2032-03-01", "end": "2032-03-31", "templateIds": [template_id]}
+    response = test_client.post(
+        "/api/templates/expand", json=expand, headers=auth_headers
+    )
+    assert response.json == {"created": 4, "skipped": 0}
+
+    deleted, moved = Shift.query.filter_by(template_id=template_id).order_by(
+        Shift.date
+    )[:2]
+    deleted_date, moved_date = deleted.date, moved.date
+    test_client.delete(f"/api/shifts/{deleted.id}", headers=auth_headers)
+    test_client.put(
+        f"/api/shifts/{moved.id}", json={"date": "2032-03-13"}, headers=auth_headers
+    )
+
+    # Neither the deleted shift nor the moved one's old day comes back
+    response = test_client.post(
+        "/api/templates/expand", json=expand, headers=auth_headers
+    )
+    assert response.json == {"created": 0, "skipped": 4}
+    dates = {s.date for s in Shift.query.filter_by(template_id=template_id)}
+    assert deleted_date not in dates and moved_date not in dates
+    assert db.session.get(Shift, moved.id).date == date(2032, 3, 13)
+
+    # Moving onto a day the template already has a shift for is fine too
+    third = Shift.query.filter_by(template_id=template_id).order_by(Shift.date)[0]
+    other_day = third.date + timedelta(days=7)
+    response = test_client.put(
+        f"/api/shifts/{third.id}",
+        json={"date": other_day.isoformat()},
+        headers=auth_headers,
+    )
+    assert response.status_code == 200
+    moved_onto = Shift.query.filter_by(date=other_day).all()
+    assert sorted(s.template_id is None for s in moved_onto) == [False, True]
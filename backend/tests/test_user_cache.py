@@ -0,0 +1,48 @@
+# backend/tests/test_user_cache.py
+import time
+from flask_jwt_extended import create_access_token
+from app import db
+from app.models import User
+from app.services.user_cache import CachedUser, UserCache
+
+
+def test_me_served_from_cache(test_client, auth_headers, count_queries):
+    assert test_client.get("/api/auth/me", headers=auth_headers).status_code == 200
+    with count_queries() as statements:
+        response = test_client.get("/api/auth/me", headers=auth_headers)
+    assert response.json["username"] == "test_manager"
+    assert statements == []
+
+
+def test_update_and_delete_invalidate(test_client, auth_headers):
+    user = User(username="cached_baker", email="cached@example.com", role="baker")
+    db.session.add(user)
+    db.session.commit()
+    token = create_access_token(identity=user.id, additional_claims={"role": "baker"})
+    headers = {"Authorization": f"Bearer {token}"}
+
+    assert test_client.get("/api/auth/me", headers=headers).json["role"] == "baker"
+    response = test_client.put(
+        f"/api/users/{user.id}", json={"role": "manager"}, headers=auth_headers
+    )
+    assert response.status_code == 200
+    # The token still says baker; the role check reads the user
+    assert test_client.get("/api/auth/me", headers=headers).json["role"] == "manager"
+    assert test_client.get("/api/users", headers=headers).json["users"]
+
+    response = test_client.delete(f"/api/users/{user.id}", headers=auth_headers)
+    assert response.status_code == 200
+    assert test_client.get("/api/auth/me", headers=headers).status_code == 404
+
+
+def test_cache_expiry_and_eviction():
+    cache = UserCache(ttl=0.05, max_entries=2)
+    for user_id in (1, 2):
+        cache.set(CachedUser(user_id, f"user{user_id}", None, "baker"))
+    cache.get(1)
+    cache.set(CachedUser(3, "user3", None, "baker"))
+    # 2 was least recently used
+    assert cache.get(2) is None
+    assert cache.get(1).username == "user1"
+    time.sleep(0.06)
+    assert cache.get(1) is None
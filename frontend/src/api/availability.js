@@ -0,0 +1,60 @@
+import api from './axios';
+
+export const getAvailabilities = async (userId) => {
+    try {
+        const response = await api.get('/availability', {
+            params: userId ? { userId } : {},
+        });
+        return response.data;
+    } catch (error) {
+        throw error.response?.data?.message || 'Failed to fetch availability';
+    }
+};
+
+export const createAvailability = async (availabilityData) => {
+    try {
+        const response = await api.post('/availability', availabilityData);
+        return response.data;
+    } catch (error) {
+        throw error.response?.data?.message || 'Failed to create availability';
+    }
+};
+
+export const updateAvailability = async (availabilityId, availabilityData) => {
+    try {
+        const response = await api.put(`/availability/${availabilityId}`, availabilityData);
+        return response.data;
+    } catch (error) {
+        throw error.response?.data?.message || 'Failed to update availability';
+    }
+};
+
+export const deleteAvailability = async (availabilityId) => {
+    try {
+        const response = await api.delete(`/availability/${availabilityId}`);
+        return response.data;
+    } catch (error) {
+        throw error.response?.data?.message || 'Failed to delete availability';
+    }
+};
+
+export const getAvailableStaff = async (date, start, end) => {
+    try {
+        const response = await api.get('/availability/available', {
+            params: { date, start, end },
+        });
+        return response.data;
+    } catch (error) {
+        throw error.response?.data?.message || 'Failed to fetch available staff';
+    }
+};
+
+// windows: [{ date, start, end }, ...], e.g. one per shift in the visible week
+export const queryAvailableStaff = async (windows) => {
+    try {
+        const response = await api.post('/availability/available', { windows });
+        return response.data;
+    } catch (error) {
+        throw error.response?.data?.message || 'Failed to fetch available staff';
+    }
+};
@@ -14,6 +14,10 @@ const api = axios.create({
   },
 });
 
+// After a write the API answers with X-Read-Primary-Until; sending it back
+// until then keeps our reads on the primary database, so we see our own
+// changes even when another server worker handles the next request
+let readPrimaryUntil = 0;
 
 // Request interceptor
 // Add a request interceptor for JWT token
@@ -31,6 +35,9 @@ api.interceptors.request.use(
     if (token) {
       request.headers.Authorization = `Bearer ${token}`;
     }
+    if (Date.now() / 1000 < readPrimaryUntil) {
+      request.headers['X-Read-Primary-Until'] = readPrimaryUntil;
+    }
     return request;
   },
   (error) => {
@@ -42,6 +49,10 @@ api.interceptors.request.use(
 api.interceptors.response.use(
   (response) => {
     console.log('Successful response:', response.status);
+    const until = parseFloat(response.headers['x-read-primary-until']);
+    if (until) {
+      readPrimaryUntil = until;
+    }
     return response;
   },
   (error) => {
@@ -0,0 +1,23 @@
+import axios from 'axios';
+
+const API_URL = '/api/calendar';
+
+// A subscription URL for the current user's confirmed shifts. Issuing a new
+// one revokes the previous URL.
+export const createCalendarFeed = async () => {
+    const response = await axios.post(`${API_URL}/token`, null, {
+        headers: {
+            Authorization: `Bearer ${localStorage.getItem('token')}`,
+        },
+    });
+    return response.data.url;
+};
+
+export const revokeCalendarFeed = async () => {
+    const response = await axios.delete(`${API_URL}/token`, {
+        headers: {
+            Authorization: `Bearer ${localStorage.getItem('token')}`,
+        },
+    });
+    return response.data;
+};
@@ -11,11 +11,58 @@ export const createShift = async (shiftData) => {
     return response.data;
 };
 
-export const getShifts = async (start, end) => {
-    const response = await axios.get(`${API_URL}?start=${start}&end=${end}`, {
+// `options`: `{ understaffed: true }` for shifts with open slots only,
+// `{ sort: 'open_slots' }` to list the shortest-staffed first
+export const getShifts = async (start, end, options = {}) => {
+    const params = new URLSearchParams({ start, end, ...options });
+    const response = await axios.get(`${API_URL}?${params}`, {
         headers: {
             Authorization: `Bearer ${localStorage.getItem('token')}`,
         },
     });
     return response.data;
 };
+
+// Pass the cursor from the previous response to get only what changed since
+export const getShiftChanges = async (since, start, end) => {
+    const params = new URLSearchParams({ since, start, end });
+    const response = await axios.get(`${API_URL}?${params}`, {
+        headers: {
+            Authorization: `Bearer ${localStorage.getItem('token')}`,
+        },
+    });
+    return response.data;
+};
+
+// Live roster changes. `onChange` gets each event; `onResync` is called when
+// events may have been missed and the caller should delta-sync its cursor.
+export const subscribeToRoster = (onChange, onResync) => {
+    const token = localStorage.getItem('token');
+    const source = new EventSource(`${API_URL}/events?jwt=${encodeURIComponent(token)}`);
+    source.addEventListener('roster', (message) => onChange(JSON.parse(message.data)));
+    source.addEventListener('resync', () => onResync());
+    return () => source.close();
+};
+
+// Per-day required vs confirmed staff totals for dashboards
+export const getCoverage = async (start, end) => {
+    const params = new URLSearchParams({ start, end });
+    const response = await axios.get(`${API_URL}/coverage?${params}`, {
+        headers: {
+            Authorization: `Bearer ${localStorage.getItem('token')}`,
+        },
+    });
+    return response.data.coverage;
+};
+
+// Understaffed shifts, most urgent first, each with candidate bakers to offer it to
+export const getOpenSlots = async (start, end, candidates) => {
+    const params = new URLSearchParams({ start, end });
+    if (candidates) params.set('candidates', candidates);
+    const response = await axios.get(`${API_URL}/open-slots?${params}`, {
+        headers: {
+            Authorization: `Bearer ${localStorage.getItem('token')}`,
+        },
+    });
+    return response.data.open_slots;
+};
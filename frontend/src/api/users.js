@@ -1,8 +1,9 @@
 import api from './axios';
 
-export const getUsers = async () => {
+// One page of the directory. params: limit, cursor, role, q, fields
+export const getUsers = async (params = {}) => {
     try {
-        const response = await api.get('/users');
+        const response = await api.get('/users', { params });
         console.log('Users API Response:', response.data);
         return response.data;
     } catch (error) {
@@ -17,6 +18,24 @@ export const getUsers = async () => {
     }
 };
 
+// Yields the directory a page at a time, following next_cursor
+export async function* streamUsers(params = {}) {
+    let cursor = null;
+    do {
+        const page = await getUsers(cursor ? { ...params, cursor } : params);
+        yield page.users;
+        cursor = page.next_cursor;
+    } while (cursor);
+}
+
+export const getAllUsers = async (params = {}) => {
+    const users = [];
+    for await (const page of streamUsers(params)) {
+        users.push(...page);
+    }
+    return users;
+};
+
 export const getUser = async (userId) => {
     try {
         const response = await api.get(`/users/${userId}`);
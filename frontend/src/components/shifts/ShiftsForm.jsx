@@ -18,8 +18,11 @@ const ShiftsForm = () => {
     useEffect(() => {
         const fetchStaff = async () => {
             try {
-                const data = await userService.getUsers();
-                setAvailableStaff(data.users);
+                const staff = await userService.getAllUsers({
+                    fields: 'id,username',
+                    limit: 200
+                });
+                setAvailableStaff(staff);
             } catch (err) {
                 setError('Failed to load staff members');
             }
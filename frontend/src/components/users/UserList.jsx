@@ -3,67 +3,90 @@ import { UserCircle } from 'lucide-react';
 import { getUsers } from '../../api/users';
 import * as authService from '../../api/auth';
 
+const PAGE_SIZE = 50;
+
 function UserList() {
     const [users, setUsers] = useState([]);
+    const [nextCursor, setNextCursor] = useState(null);
+    const [roleFilter, setRoleFilter] = useState('');
+    const [search, setSearch] = useState('');
     const [loading, setLoading] = useState(true);
+    const [loadingMore, setLoadingMore] = useState(false);
     const [error, setError] = useState(null);
     const [currentUser, setCurrentUser] = useState(null);
 
+    const canListUsers = (user) => user?.role === 'admin' || user?.role === 'manager';
+
+    const filters = () => ({
+        limit: PAGE_SIZE,
+        ...(roleFilter && { role: roleFilter }),
+        ...(search.trim() && { q: search.trim() })
+    });
+
     useEffect(() => {
-        const fetchData = async () => {
+        const fetchCurrentUser = async () => {
             try {
-                console.log('Starting data fetch...');
-
-                // Get current user from auth service
                 const currentUserData = await authService.getCurrentUser();
-                console.log('Current user data from auth:', currentUserData);
                 setCurrentUser(currentUserData);
-
-                // Only fetch all users if admin/manager
-                if (currentUserData.role === 'admin' || currentUserData.role === 'manager') {
-                    const response = await getUsers();
-                    console.log('Raw API response:', response);
-
-                    // Extract users array from response
-                    const usersData = response.users || []; // Access the users array from the JSON
-                    console.log('Extracted users data:', usersData);
-                    console.log('Users data type:', typeof usersData);
-                    console.log('Is users array?', Array.isArray(usersData));
-
-                    // Set users state
-                    setUsers(usersData);
-                    console.log('Users state set to:', usersData);
-                }
-
                 setError(null);
             } catch (err) {
                 console.error('UserList fetch error:', err);
                 setError('Failed to fetch users. Please check your permissions and try again.');
-                setUsers([]);
             } finally {
                 setLoading(false);
             }
         };
 
-        fetchData();
+        fetchCurrentUser();
     }, []);
 
-    // Debug information about current state
-    console.log('=== Component State ===');
-    console.log('Loading:', loading);
-    console.log('Error:', error);
-    console.log('Current User:', currentUser);
-    console.log('Users Array:', users);
-    console.log('Users Length:', users.length);
-    console.log('Is users an array?', Array.isArray(users));
+    // Start again from the first page whenever the filters change
+    useEffect(() => {
+        if (!canListUsers(currentUser)) {
+            return undefined;
+        }
+        let cancelled = false;
+        const timer = setTimeout(async () => {
+            try {
+                const page = await getUsers(filters());
+                if (!cancelled) {
+                    setUsers(page.users || []);
+                    setNextCursor(page.next_cursor);
+                    setError(null);
+                }
+            } catch (err) {
+                if (!cancelled) {
+                    console.error('UserList fetch error:', err);
+                    setError('Failed to fetch users. Please check your permissions and try again.');
+                    setUsers([]);
+                }
+            }
+        }, search ? 250 : 0);
+        return () => {
+            cancelled = true;
+            clearTimeout(timer);
+        };
+    }, [currentUser, roleFilter, search]);
+
+    const loadMore = async () => {
+        setLoadingMore(true);
+        try {
+            const page = await getUsers({ ...filters(), cursor: nextCursor });
+            setUsers(previous => [...previous, ...(page.users || [])]);
+            setNextCursor(page.next_cursor);
+        } catch (err) {
+            console.error('UserList fetch error:', err);
+            setError('Failed to fetch users. Please check your permissions and try again.');
+        } finally {
+            setLoadingMore(false);
+        }
+    };
 
     if (loading) {
-        console.log('Rendering loading state');
         return <div className="text-center p-4">Loading...</div>;
     }
 
     if (error) {
-        console.log('Rendering error state');
         return (
             <div className="bg-red-50 border border-red-200 text-red-600 p-4 rounded-lg">
                 <h3 className="font-semibold">Error Loading Users</h3>
@@ -72,9 +95,7 @@ function UserList() {
         );
     }
 
-    const isAdminOrManager = currentUser?.role === 'admin' || currentUser?.role === 'manager';
-    console.log('Is admin or manager?', isAdminOrManager);
-    console.log('Current user role:', currentUser?.role);
+    const isAdminOrManager = canListUsers(currentUser);
 
     return (
         <div className="bg-white rounded-lg shadow-sm p-6">
@@ -82,31 +103,58 @@ function UserList() {
                 {isAdminOrManager ? 'All Users' : 'My Profile'}
             </h2>
 
+            {isAdminOrManager && (
+                <div className="flex gap-4 mb-6">
+                    <input
+                        type="search"
+                        className="flex-1 border rounded-md px-3 py-2"
+                        placeholder="Search by username or email"
+                        value={search}
+                        onChange={(e) => setSearch(e.target.value)}
+                    />
+                    <select
+                        className="border rounded-md px-3 py-2"
+                        value={roleFilter}
+                        onChange={(e) => setRoleFilter(e.target.value)}
+                    >
+                        <option value="">All roles</option>
+                        <option value="baker">Bakers</option>
+                        <option value="manager">Managers</option>
+                        <option value="admin">Admins</option>
+                    </select>
+                </div>
+            )}
+
             <div className="space-y-4">
                 {isAdminOrManager ? (
-                    // Show all users for admin/manager
-                    (() => {
-                        console.log('Attempting to render admin view');
-                        console.log('Users available for mapping:', users);
-                        return users.length > 0 ? (
-                            users.map(user => {
-                                console.log('Mapping user:', user);
-                                return (
-                                    <div key={user.id} className="border rounded-lg p-4 flex items-center">
-                                        <UserCircle className="h-10 w-10 text-blue-600" />
-                                        <div className="ml-4">
-                                            <h3 className="font-semibold">{user.name}</h3>
-                                            <p className="text-sm text-gray-600">
-                                                Role: {user.role} | Email: {user.email}
-                                            </p>
-                                        </div>
+                    // Show the directory a page at a time for admin/manager
+                    <>
+                        {users.length > 0 ? (
+                            users.map(user => (
+                                <div key={user.id} className="border rounded-lg p-4 flex items-center">
+                                    <UserCircle className="h-10 w-10 text-blue-600" />
+                                    <div className="ml-4">
+                                        <h3 className="font-semibold">{user.username}</h3>
+                                        <p className="text-sm text-gray-600">
+                                            Role: {user.role} | Email: {user.email}
+                                        </p>
                                     </div>
-                                );
-                            })
+                                </div>
+                            ))
                         ) : (
                             <p className="text-gray-600">No users found.</p>
-                        );
-                    })()
+                        )}
+                        {nextCursor && (
+                            <button
+                                type="button"
+                                className="w-full border border-blue-600 text-blue-600 px-4 py-2 rounded-md hover:bg-blue-50 disabled:opacity-50"
+                                onClick={loadMore}
+                                disabled={loadingMore}
+                            >
+                                {loadingMore ? 'Loading...' : 'Load more'}
+                            </button>
+                        )}
+                    </>
                 ) : (
                     // Show only current user for bakers
                     (() => {